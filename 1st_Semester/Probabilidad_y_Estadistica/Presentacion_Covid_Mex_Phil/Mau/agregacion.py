@@ -0,0 +1,93 @@
+import sys
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
+
+# Los CSV se cargan desde el registro de datos de la presentacion (data_registry.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from data_registry import load_dataset
+
+# -------------------------------
+# Agregacion compartida de los scripts de Mau
+# -------------------------------
+# Todos los paises se procesan juntos: una lectura por dataset y una sola
+# agregacion agrupada por (Entity, periodo), con la granularidad y la ventana de
+# la media movil configurables. Los analisis por pais y los comparativos toman
+# sus series de ese mismo resultado.
+
+# Datasets del registro por metrica, un archivo por pais
+DATASETS_CASOS = ("casos_semanales_mexico", "casos_semanales_filipinas")
+DATASETS_MUERTES = ("exceso_muertes_mexico", "exceso_muertes_filipinas")
+
+COLUMNA_CASOS = 'Weekly cases'
+COLUMNA_MUERTES = 'Cumulative excess deaths (central estimate)'
+COLUMNA_MUERTES_SUPERIOR = 'Cumulative excess deaths (95% CI, upper bound)'
+COLUMNA_MUERTES_INFERIOR = 'Cumulative excess deaths (95% CI, lower bound)'
+COLUMNA_CONFIRMADAS = 'Total confirmed deaths due to COVID-19'
+
+# Series acumuladas de los datasets de muertes, se des-acumulan juntas
+COLUMNAS_MUERTES = (COLUMNA_MUERTES, COLUMNA_MUERTES_SUPERIOR, COLUMNA_MUERTES_INFERIOR, COLUMNA_CONFIRMADAS)
+
+# Nombre de cada pais en los graficos
+PAISES = {'Mexico': 'México', 'Philippines': 'Filipinas'}
+
+
+def cargar(datasets):
+    """Un solo DataFrame con las filas de todos los paises."""
+    df = pd.concat([load_dataset(nombre) for nombre in datasets], ignore_index=True)
+    df['Entity'] = df['Entity'].astype(str)
+    if not pd.api.types.is_datetime64_any_dtype(df['Day']):
+        df['Day'] = pd.to_datetime(df['Day'])
+    return df
+
+
+def agregar_por_periodo(df, columnas, como="sum", granularidad="M", ventana=3, acumulado=False):
+    """
+    Una fila por (Entity, Periodo) con cada columna agregada y su media movil
+    centrada (Media_Movil_<columna>). Con acumulado=True las columnas son totales
+    acumulados: se rellenan hacia adelante, se toma el ultimo valor del periodo y
+    se convierten en incrementos por periodo.
+    """
+    columnas = list(columnas)
+    df = df[['Entity', 'Day'] + columnas].copy()
+    if acumulado:
+        df[columnas] = df.groupby('Entity')[columnas].ffill()
+        como = "last"
+    df['Periodo'] = df['Day'].dt.to_period(granularidad)
+
+    agregado = df.groupby(['Entity', 'Periodo'])[columnas].agg(como)
+    if acumulado:
+        agregado = agregado.groupby(level='Entity').diff().fillna(0)
+
+    if ventana:
+        medias = (agregado.groupby(level='Entity')[columnas]
+                  .rolling(window=ventana, center=True).mean()
+                  .droplevel(0))
+        agregado = agregado.join(medias.add_prefix('Media_Movil_'))
+
+    agregado = agregado.reset_index()
+    agregado['Periodo'] = agregado['Periodo'].dt.to_timestamp()
+    return agregado
+
+
+def serie_pais(agregado, pais):
+    # Filas de un pais (Entity) con el indice reiniciado
+    return agregado[agregado['Entity'] == pais].reset_index(drop=True)
+
+
+def tabla_comparativa(agregado, columna):
+    """Periodo x pais de una columna; meses sin dato de un pais quedan en 0."""
+    return agregado.pivot(index='Periodo', columns='Entity', values=columna).fillna(0)
+
+
+@lru_cache(maxsize=None)
+def casos_mensuales(granularidad="M", ventana=3):
+    return agregar_por_periodo(cargar(DATASETS_CASOS), [COLUMNA_CASOS], como="sum",
+                               granularidad=granularidad, ventana=ventana)
+
+
+@lru_cache(maxsize=None)
+def muertes_mensuales(granularidad="M", ventana=3):
+    # Estimacion central, limites del IC 95% y muertes confirmadas en la misma pasada
+    return agregar_por_periodo(cargar(DATASETS_MUERTES), COLUMNAS_MUERTES,
+                               granularidad=granularidad, ventana=ventana, acumulado=True)
@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import pickle
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import plotly
+from plotly.offline import get_plotlyjs
+
+from agregacion import (COLUMNA_CASOS, COLUMNA_CONFIRMADAS, COLUMNA_MUERTES, COLUMNA_MUERTES_INFERIOR,
+                        COLUMNA_MUERTES_SUPERIOR, PAISES, casos_mensuales, muertes_mensuales, serie_pais,
+                        tabla_comparativa)
+from graficas import (grafico_casos_pais, grafico_comparativo_casos, grafico_comparativo_muertes,
+                      grafico_exceso_muertes_pais)
+
+# -------------------------------
+# Reporte con todas las graficas de Mau
+# -------------------------------
+# Carga y agrega los datasets una sola vez, construye las graficas de cada pais
+# y metrica (y los comparativos) en paralelo y las escribe en un directorio de
+# reporte. Todos los HTML usan una sola copia de plotly.min.js en ese directorio
+# (include_plotlyjs='directory') en vez de llevar ~3.5 MB cada uno. El manifiesto
+# guarda el hash de las entradas de cada figura (datos agregados, argumentos,
+# codigo de graficas.py/agregacion.py y version de plotly): si no cambiaron y el
+# HTML existe, la figura ni se construye ni se escribe.
+#
+#   python generar_reporte.py [--salida reporte] [--workers 4] [--forzar]
+
+SALIDA = Path(__file__).resolve().parent / "reporte"
+MANIFIESTO = "manifest.json"
+PLOTLYJS = "plotly.min.js"
+# Modulos cuyo codigo define las figuras
+CODIGO = [Path(__file__).resolve().parent / nombre for nombre in ("agregacion.py", "graficas.py")]
+
+# Argumentos extra de cada grafica de casos, los mismos que usa su script
+# (casos confirmados/<pais>/analisis.py)
+OPCIONES_CASOS = {'Mexico': {'fuente': True}}
+
+
+def _slug(texto):
+    texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return texto.lower().replace(" ", "_")
+
+
+def figuras(casos, muertes):
+    """(archivo, titulo, funcion, argumentos, opciones) de cada grafica del reporte."""
+    tareas = []
+    for pais, nombre in PAISES.items():
+        slug = _slug(nombre)
+        tareas.append((f"casos_{slug}.html", f"Casos mensuales: {nombre}",
+                       grafico_casos_pais, (serie_pais(casos, pais), pais), OPCIONES_CASOS.get(pais, {})))
+        tareas.append((f"exceso_muertes_{slug}.html", f"Exceso de muertes mensual: {nombre}",
+                       grafico_exceso_muertes_pais, (serie_pais(muertes, pais), pais), {}))
+    tareas.append(("comparativo_casos.html", "Comparativo de casos",
+                   grafico_comparativo_casos,
+                   (tabla_comparativa(casos, COLUMNA_CASOS), tabla_comparativa(casos, f'Media_Movil_{COLUMNA_CASOS}')), {}))
+    tareas.append(("comparativo_muertes.html", "Comparativo de exceso de muertes",
+                   grafico_comparativo_muertes,
+                   (tabla_comparativa(muertes, COLUMNA_MUERTES), tabla_comparativa(muertes, f'Media_Movil_{COLUMNA_MUERTES}'),
+                    tabla_comparativa(muertes, COLUMNA_MUERTES_SUPERIOR), tabla_comparativa(muertes, COLUMNA_MUERTES_INFERIOR),
+                    tabla_comparativa(muertes, COLUMNA_CONFIRMADAS)), {}))
+    return tareas
+
+
+def huella_codigo():
+    sha1 = hashlib.sha1(plotly.__version__.encode("utf-8"))
+    for ruta in CODIGO:
+        sha1.update(ruta.read_bytes())
+    return sha1.hexdigest()
+
+
+def huella_entradas(codigo, funcion, argumentos, opciones):
+    # Se calcula antes de construir la figura: mismas entradas, misma figura
+    entradas = pickle.dumps((funcion.__name__, argumentos, sorted(opciones.items())), protocol=4)
+    return hashlib.sha1(codigo.encode("utf-8") + entradas).hexdigest()
+
+
+def renderizar(directorio, archivo, funcion, argumentos, opciones):
+    # Corre en un proceso del pool: construye la figura y la escribe
+    fig = funcion(*argumentos, **opciones)
+    ruta = os.path.join(directorio, archivo)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    fig.write_html(temporal, include_plotlyjs='directory')
+    os.replace(temporal, ruta)
+    return archivo
+
+
+def cargar_manifiesto(directorio):
+    try:
+        with open(os.path.join(directorio, MANIFIESTO), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def guardar_manifiesto(directorio, manifiesto):
+    ruta = os.path.join(directorio, MANIFIESTO)
+    with open(f"{ruta}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2, sort_keys=True)
+    os.replace(f"{ruta}.tmp", ruta)
+
+
+def escribir_plotlyjs(directorio, version_anterior):
+    # Una sola copia por directorio, escrita antes de que los procesos la busquen
+    ruta = os.path.join(directorio, PLOTLYJS)
+    if version_anterior == plotly.__version__ and os.path.exists(ruta):
+        return
+    with open(f"{ruta}.tmp", "w", encoding="utf-8") as f:
+        f.write(get_plotlyjs())
+    os.replace(f"{ruta}.tmp", ruta)
+
+
+def escribir_indice(directorio, tareas):
+    enlaces = "\n".join(
+        f'    <li><a href="{html.escape(archivo)}">{html.escape(titulo)}</a></li>'
+        for archivo, titulo, _, _, _ in tareas
+    )
+    contenido = f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+  <meta charset="utf-8">
+  <title>COVID-19: México vs. Filipinas</title>
+</head>
+<body>
+  <h1>COVID-19: México vs. Filipinas</h1>
+  <ul>
+{enlaces}
+  </ul>
+  <p><small>Fuente: Our World in Data</small></p>
+</body>
+</html>
+"""
+    with open(os.path.join(directorio, "index.html"), "w", encoding="utf-8") as f:
+        f.write(contenido)
+
+
+def generar_reporte(directorio=SALIDA, workers=None, forzar=False):
+    os.makedirs(directorio, exist_ok=True)
+    manifiesto = cargar_manifiesto(directorio)
+    anteriores = {} if forzar else manifiesto.get('figuras', {})
+
+    # Una lectura y una agregacion para todas las graficas
+    tareas = figuras(casos_mensuales(), muertes_mensuales())
+    escribir_plotlyjs(directorio, None if forzar else manifiesto.get('plotly'))
+
+    # Solo van al pool las figuras cuyas entradas cambiaron (o cuyo HTML falta)
+    codigo = huella_codigo()
+    figuras_nuevas = {}
+    pendientes = []
+    for archivo, titulo, funcion, argumentos, opciones in tareas:
+        huella = huella_entradas(codigo, funcion, argumentos, opciones)
+        figuras_nuevas[archivo] = {'hash': huella, 'titulo': titulo}
+        if huella != anteriores.get(archivo, {}).get('hash') or not os.path.exists(os.path.join(directorio, archivo)):
+            pendientes.append((archivo, funcion, argumentos, opciones))
+
+    escritas = 0
+    if pendientes:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = [pool.submit(renderizar, str(directorio), *tarea) for tarea in pendientes]
+            for futuro in as_completed(futuros):
+                escritas += 1
+                print(f"Escrita: {futuro.result()}")
+
+    escribir_indice(directorio, tareas)
+    guardar_manifiesto(directorio, {'plotly': plotly.__version__, 'figuras': figuras_nuevas})
+    print(f"\n Reporte en {directorio}: {escritas} graficas escritas, {len(tareas) - escritas} sin cambios")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera todas las graficas de Mau en un directorio de reporte")
+    parser.add_argument("--salida", default=str(SALIDA), help="directorio del reporte")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto uno por CPU)")
+    parser.add_argument("--forzar", action="store_true", help="vuelve a escribir todas las graficas")
+    args = parser.parse_args()
+
+    generar_reporte(args.salida, args.workers, args.forzar)
@@ -0,0 +1,238 @@
+import plotly.graph_objects as go
+
+from agregacion import COLUMNA_CASOS, COLUMNA_MUERTES, PAISES
+
+# -------------------------------
+# Graficas de los scripts de Mau
+# -------------------------------
+# Cada funcion recibe las series ya agregadas (ver agregacion.py) y regresa la
+# figura; los scripts solo eligen el pais y el archivo de salida.
+
+FUENTE = dict(
+    text="Fuente: Our World in Data",
+    showarrow=False, xref="paper", yref="paper",
+    x=0.99, y=-0.15, xanchor='right', yanchor='auto',
+    font=dict(size=9, color="gray")
+)
+
+# Colores (r, g, b) de cada pais en los comparativos
+COLORES_CASOS = {'Mexico': (31, 119, 180), 'Philippines': (255, 127, 14)}
+COLORES_MUERTES = {'Mexico': (214, 39, 40), 'Philippines': (31, 119, 180)}
+
+
+def _rgba(color, alpha):
+    return f'rgba({color[0]}, {color[1]}, {color[2]}, {alpha})'
+
+
+def grafico_casos_pais(serie, pais, ventana=3, fuente=False):
+    """Area de casos mensuales de un pais con su tendencia, promedio y pico."""
+    casos = serie[COLUMNA_CASOS]
+    promedio = casos.mean()
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=serie['Periodo'],
+        y=casos,
+        fill='tozeroy',
+        mode='none',
+        name='Casos Mensuales',
+        fillcolor='rgba(31, 119, 180, 0.3)'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=serie['Periodo'],
+        y=serie[f'Media_Movil_{COLUMNA_CASOS}'],
+        mode='lines',
+        name=f'Tendencia (Media Móvil {ventana} Meses)',
+        line=dict(color='#d62728', width=3)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=[serie['Periodo'].min(), serie['Periodo'].max()],
+        y=[promedio, promedio],
+        mode='lines',
+        name=f'Promedio ({promedio:,.0f})',
+        line=dict(color='gray', width=2, dash='dash')
+    ))
+
+    pico_maximo = serie.loc[casos.idxmax()]
+    fig.add_annotation(
+        x=pico_maximo['Periodo'],
+        y=pico_maximo[COLUMNA_CASOS],
+        text=f"Pico Máximo<br>{pico_maximo['Periodo'].strftime('%b %Y')}<br>{pico_maximo[COLUMNA_CASOS]:,.0f} casos",
+        showarrow=True, arrowhead=1, arrowcolor="black",
+        ax=0, ay=-80, bordercolor="#c7c7c7", borderwidth=1,
+        bgcolor="rgba(255, 255, 255, 0.85)"
+    )
+
+    fig.update_layout(
+        title_text=f'<b>Tendencia de Casos de COVID-19 en {PAISES[pais]}</b><br><sup>Casos mensuales reportados y línea de tendencia (2020-2023)</sup>',
+        xaxis_title='Mes',
+        yaxis_title='Casos Nuevos Reportados',
+        xaxis_dtick="M1",
+        template='plotly_white',
+        legend=dict(x=0.01, y=0.99, bgcolor='rgba(255,255,255,0.7)')
+    )
+    if fuente:
+        # Igual que el grafico original de Mexico: la nota de la fuente reemplaza las anotaciones
+        fig.update_layout(annotations=[FUENTE])
+    return fig
+
+
+def grafico_exceso_muertes_pais(serie, pais):
+    """Barras del exceso de muertes mensual de un pais con promedio, mediana y banda de +-1 desviacion."""
+    incremento = serie[COLUMNA_MUERTES]
+    promedio = incremento.mean()
+    mediana = incremento.median()
+    desv_est = incremento.std()
+
+    fig = go.Figure()
+
+    y_upper = [promedio + desv_est] * len(serie)
+    y_lower = [promedio - desv_est] * len(serie)
+    fig.add_trace(go.Scatter(
+        x=serie['Periodo'], y=y_upper, mode='lines', line=dict(width=0),
+        hoverinfo='none', showlegend=False
+    ))
+    fig.add_trace(go.Scatter(
+        x=serie['Periodo'], y=y_lower, mode='lines', line=dict(width=0),
+        fillcolor='rgba(128, 128, 128, 0.2)', fill='tonexty',
+        hoverinfo='none', name='Banda de Desviación Estándar'
+    ))
+
+    colors = ['#1f77b4' if x >= 0 else '#d62728' for x in incremento]
+    fig.add_trace(go.Bar(
+        x=serie['Periodo'], y=incremento,
+        name='Incremento Mensual', marker_color=colors
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=[serie['Periodo'].min(), serie['Periodo'].max()],
+        y=[promedio, promedio],
+        mode='lines',
+        name=f'Promedio ({promedio:,.0f})',
+        line=dict(color="#e377c2", width=2, dash="dash")
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=[serie['Periodo'].min(), serie['Periodo'].max()],
+        y=[mediana, mediana],
+        mode='lines',
+        name=f'Mediana ({mediana:,.0f})',
+        line=dict(color="#ff7f0e", width=2, dash="dot")
+    ))
+
+    pico_maximo = serie.loc[incremento.idxmax()]
+    fig.add_annotation(
+        x=pico_maximo['Periodo'], y=pico_maximo[COLUMNA_MUERTES],
+        text=f"Pico Máximo<br>{pico_maximo['Periodo'].strftime('%b %Y')}<br>{pico_maximo[COLUMNA_MUERTES]:,.0f} muertes",
+        showarrow=True, arrowhead=1, arrowcolor="black",
+        ax=0, ay=-80, bordercolor="#c7c7c7", borderwidth=1, borderpad=4,
+        bgcolor="rgba(255, 255, 255, 0.85)"
+    )
+
+    fig.update_layout(
+        #titulo del grafico
+        title_text=f'<b>Análisis Estadístico del Exceso de Muertes Mensuales en {PAISES[pais]}</b>',
+        xaxis_title='Mes',
+        yaxis_title='Exceso de Muertes Reportadas',
+        xaxis_dtick="M1",
+        template='plotly_white',
+        showlegend=True,
+        legend=dict(x=0.01, y=0.99)
+    )
+    return fig
+
+
+def grafico_comparativo_casos(casos, tendencia):
+    """casos y tendencia: tablas Periodo x pais (agregacion.tabla_comparativa)."""
+    fig = go.Figure()
+
+    for pais in casos.columns:
+        color = COLORES_CASOS[pais]
+        fig.add_trace(go.Scatter(
+            x=casos.index,
+            y=casos[pais],
+            fill='tozeroy',
+            mode='none',
+            name=f'Casos Mensuales ({PAISES[pais]})',
+            fillcolor=_rgba(color, 0.3)
+        ))
+        fig.add_trace(go.Scatter(
+            x=tendencia.index,
+            y=tendencia[pais],
+            mode='lines',
+            name=f'Tendencia ({PAISES[pais]})',
+            line=dict(color=_rgba(color, 1.0), width=3)
+        ))
+
+    fig.update_layout(
+        title_text='<b>Tendencia Comparativa de Casos de COVID-19: México vs. Filipinas</b>',
+        xaxis_title='Mes',
+        yaxis_title='Casos Nuevos Reportados',
+        xaxis_dtick="M1",
+        legend_title_text='Métricas y País',
+        template='plotly_white',
+        hovermode="x unified"
+    )
+    return fig
+
+
+def grafico_comparativo_muertes(muertes, tendencia, superior=None, inferior=None, confirmadas=None):
+    """
+    Barras superpuestas por pais con su tendencia; las de Filipinas empiezan
+    ocultas (clic en la leyenda). Con superior/inferior se dibuja la banda del
+    IC 95% y con confirmadas la linea de muertes confirmadas (oculta al inicio).
+    Todas las tablas son Periodo x pais (agregacion.tabla_comparativa).
+    """
+    fig = go.Figure()
+
+    for pais in muertes.columns:
+        color = COLORES_MUERTES[pais]
+        oculto = 'legendonly' if pais == 'Philippines' else None
+        if superior is not None and inferior is not None:
+            fig.add_trace(go.Scatter(
+                x=superior.index, y=superior[pais], mode='lines', line=dict(width=0),
+                legendgroup=f'ic_{pais}', hoverinfo='skip', showlegend=False, visible=oculto
+            ))
+            fig.add_trace(go.Scatter(
+                x=inferior.index, y=inferior[pais], mode='lines', line=dict(width=0),
+                fill='tonexty', fillcolor=_rgba(color, 0.15),
+                legendgroup=f'ic_{pais}', hoverinfo='skip', name=f'IC 95% ({PAISES[pais]})', visible=oculto
+            ))
+        fig.add_trace(go.Bar(
+            x=muertes.index,
+            y=muertes[pais],
+            name=f'Exceso de Muertes ({PAISES[pais]})',
+            marker_color=_rgba(color, 0.6),
+            visible=oculto
+        ))
+        fig.add_trace(go.Scatter(
+            x=tendencia.index,
+            y=tendencia[pais],
+            mode='lines',
+            name=f'Tendencia ({PAISES[pais]})',
+            line=dict(color=_rgba(color, 1.0), width=3)
+        ))
+        if confirmadas is not None:
+            fig.add_trace(go.Scatter(
+                x=confirmadas.index,
+                y=confirmadas[pais],
+                mode='lines',
+                name=f'Muertes Confirmadas ({PAISES[pais]})',
+                line=dict(color=_rgba(color, 1.0), width=2, dash='dot'),
+                visible='legendonly'
+            ))
+
+    fig.update_layout(
+        title_text='<b>Comparativo de Exceso de Muertes Mensuales: México vs. Filipinas</b>',
+        xaxis_title='Mes',
+        yaxis_title='Exceso de Muertes Reportadas',
+        xaxis_dtick="M1",
+        legend_title_text='Métricas y País',
+        template='plotly_white',
+        barmode='overlay',
+        hovermode="x unified"
+    )
+    return fig
@@ -10,10 +10,25 @@ import os
 import io
 import csv
 from datetime import datetime
+from flask import request
 from weekly_cases import *
 
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
 app.title = "Mexico vs Philippines Data Visualization Dashboard"
+# WSGI entry point for serve.py / gunicorn
+server = app.server
+
+# Map geometry (assets/geo, assets/topojson) rarely changes: let browsers cache it
+GEOMETRY_MAX_AGE = 7 * 24 * 3600
+
+
+@app.server.after_request
+def cache_geometry_assets(response):
+  if request.path.startswith(("/assets/geo/", "/assets/topojson/")):
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = GEOMETRY_MAX_AGE
+  return response
 
 
 
@@ -81,12 +96,6 @@ home_layout = html.Div([
 
 
 
-# -------------------------------
-# Map Page
-# -------------------------------
-choropleth_layout = weekly_cases_layout()
-
-
 # -------------------------------
 # App Layout and Routing
 # -------------------------------
@@ -101,7 +110,8 @@ app.layout = html.Div([
               Input('url', 'pathname'))
 def display_page(pathname):
   if pathname == '/weekly-cases':
-    return choropleth_layout
+    # Built on first request and memoized until the CSV changes
+    return weekly_cases_layout()
   # elif pathname == '/line-charts':
   #   return line_charts_layout
   # elif pathname == '/box-plots':
@@ -111,8 +121,56 @@ def display_page(pathname):
 
 
 
+# Country picker and week range: re-render the selection-dependent components
+@app.callback(Output('data-summary-container', 'children'),
+              Output('time-series-graph', 'figure'),
+              Output('cumulative-graph', 'figure'),
+              Input('country-picker', 'value'),
+              Input('week-range', 'value'),
+              prevent_initial_call=True)
+def update_comparison(countries, week_range):
+  return compare_layout(countries, week_range)
+
+
+
+# Zoom on long series: refine the decimated traces for the visible range
+@app.callback(Output('time-series-graph', 'figure', allow_duplicate=True),
+              Input('time-series-graph', 'relayoutData'),
+              State('country-picker', 'value'),
+              State('week-range', 'value'),
+              prevent_initial_call=True)
+def refine_time_series_zoom(relayout_data, countries, week_range):
+  return refine_time_series(relayout_data, countries, week_range)
+
+
+@app.callback(Output('cumulative-graph', 'figure', allow_duplicate=True),
+              Input('cumulative-graph', 'relayoutData'),
+              State('country-picker', 'value'),
+              State('week-range', 'value'),
+              prevent_initial_call=True)
+def refine_cumulative_zoom(relayout_data, countries, week_range):
+  return refine_cumulative(relayout_data, countries, week_range)
+
+
+# Map week slider: patch the choropleth colors instead of rebuilding the figure
+@app.callback(Output('cases-map', 'figure'),
+              Input('map-week', 'value'),
+              prevent_initial_call=True)
+def update_map_week(week):
+  return map_week_patch(week)
+
+
+
+# Warm-up before serve.py forks its workers: the data, the summary cube and the
+# default page are built once and shared copy-on-write by every worker
+def preload():
+  weekly_cases_layout()
+
+
 # -------------------------------
 # Run the app
 # -------------------------------
+# Development only (debugger and reloader, one process): set DASH_DEBUG=0 to
+# turn them off, and use serve.py to serve with multiple workers
 if __name__ == '__main__':
-  app.run(debug=True, port=8050)
\ No newline at end of file
+  app.run(debug=os.environ.get("DASH_DEBUG", "1") == "1", port=8050)
\ No newline at end of file
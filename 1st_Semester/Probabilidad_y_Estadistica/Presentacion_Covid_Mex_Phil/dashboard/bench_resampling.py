@@ -0,0 +1,61 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from resampling import bucket_start, resample_counts
+
+# -------------------------------
+# Benchmark: per-row Period.apply vs vectorized bucketing
+# -------------------------------
+# Synthetic OWID-like daily data (countries x days) run through the weekly
+# aggregation of load_covid_data, the old way and through resampling.py.
+
+
+def synthetic_countries(n_countries, n_days, seed=0):
+  rng = np.random.default_rng(seed)
+  dates = pd.date_range("2020-01-01", periods=n_days, freq="D")
+  return pd.DataFrame({
+    'Country': np.repeat([f"Country {i:03d}" for i in range(n_countries)], n_days),
+    'Date': np.tile(dates, n_countries),
+    'Cases': rng.poisson(200, n_countries * n_days),
+  })
+
+
+def timed(fn):
+  start = time.perf_counter()
+  out = fn()
+  return out, time.perf_counter() - start
+
+
+def period_apply(df):
+  week = df['Date'].dt.to_period('W').apply(lambda r: r.start_time)
+  return df.assign(Week=week).groupby(['Country', 'Week'])['Cases'].sum().reset_index()
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Weekly bucketing: Period.apply vs resampling.py")
+  parser.add_argument("--countries", type=int, default=220)
+  parser.add_argument("--days", type=int, default=1400)
+  args = parser.parse_args()
+
+  df = synthetic_countries(args.countries, args.days)
+  print(f"{args.countries} countries x {args.days} days = {len(df):,} rows")
+
+  old, old_s = timed(lambda: period_apply(df))
+  new, new_s = timed(lambda: resample_counts(df, freq="week"))
+  assert old.equals(new), "weekly totals differ"
+  print(f"{'weekly sum (Period.apply)':<28} {old_s:>8.3f} s")
+  print(f"{'weekly sum (vectorized)':<28} {new_s:>8.3f} s   {old_s / new_s:.0f}x")
+
+  for label, fn in [
+    ("month start", lambda: bucket_start(df['Date'], "month")),
+    ("epi week start", lambda: bucket_start(df['Date'], "epiweek")),
+  ]:
+    _, seconds = timed(fn)
+    print(f"{label:<28} {seconds:>8.3f} s")
+
+
+if __name__ == "__main__":
+  main()
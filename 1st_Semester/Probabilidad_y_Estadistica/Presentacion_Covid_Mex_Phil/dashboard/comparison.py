@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# N-country comparison engine
+# -------------------------------
+# Works on the long weekly frame from load_covid_data (Country, Week, Cases).
+# The weekly series come from one pivot, so the cost grows with the number of
+# rows, not with countries x rows, and pairwise differences are one vectorized
+# subtraction over the country columns. The per-country statistics of the
+# cards come from SummaryCube and WeeklyRanges.
+
+DEFAULT_COUNTRIES = ['Mexico', 'Philippines']
+
+
+def available_countries(weekly):
+  return sorted(weekly['Country'].dropna().unique())
+
+
+def default_countries(weekly):
+  available = available_countries(weekly)
+  selected = [country for country in DEFAULT_COUNTRIES if country in available]
+  return selected or available[:2]
+
+
+def weekly_matrix(weekly, countries=None):
+  """Week x country matrix of cases (missing weeks are 0)."""
+  if countries is not None:
+    weekly = weekly[weekly['Country'].isin(countries)]
+  matrix = weekly.pivot(index='Week', columns='Country', values='Cases').fillna(0)
+  matrix.columns.name = 'Country'
+  if countries is not None:
+    matrix = matrix.reindex(columns=countries, fill_value=0)
+  return matrix
+
+
+def pairwise_differences(matrix):
+  """Weekly difference for every pair of columns (i < j) as columns "A - B"."""
+  names = list(matrix.columns)
+  first, second = np.triu_indices(len(names), k=1)
+  values = matrix.to_numpy()
+  return pd.DataFrame(
+    values[:, first] - values[:, second],
+    index=matrix.index,
+    columns=[f"{names[i]} - {names[j]}" for i, j in zip(first, second)]
+  )
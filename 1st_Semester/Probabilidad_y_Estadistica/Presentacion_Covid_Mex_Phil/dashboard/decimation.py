@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# -------------------------------
+# Decimation for long time series
+# -------------------------------
+# Above MAX_POINTS points a trace is reduced on the server before it is sent:
+#   "minmax": the min and the max of every bucket, so every visible peak and
+#             trough survives (default)
+#   "lttb":   Largest-Triangle-Three-Buckets, keeps the visual shape with fewer
+#             points but may smooth isolated spikes
+# With an x range (the current zoom) only the visible slice is decimated, so a
+# relayout callback can refine the detail as the user zooms in. Figures with
+# more than WEBGL_THRESHOLD points in total are drawn with Scattergl.
+
+MAX_POINTS = 2000        # points per trace after decimation
+WEBGL_THRESHOLD = 5000   # total points in a figure before switching to WebGL
+
+
+def minmax_indices(y, n_out):
+  """Indices of the min and max of each of n_out // 2 equal buckets (plus both ends)."""
+  y = np.asarray(y, dtype=np.float64)
+  n = len(y)
+  if n <= n_out:
+    return np.arange(n)
+  size = -(-n // max(n_out // 2, 1))
+  n_buckets = -(-n // size)
+  pad = n_buckets * size - n
+
+  low = np.concatenate([np.where(np.isnan(y), np.inf, y), np.full(pad, np.inf)]).reshape(n_buckets, size)
+  high = np.concatenate([np.where(np.isnan(y), -np.inf, y), np.full(pad, -np.inf)]).reshape(n_buckets, size)
+  base = np.arange(n_buckets) * size
+  idx = np.concatenate([[0, n - 1], base + low.argmin(axis=1), base + high.argmax(axis=1)])
+  return np.unique(np.minimum(idx, n - 1))
+
+
+def lttb_indices(x, y, n_out):
+  """Largest-Triangle-Three-Buckets selection of n_out indices."""
+  x = np.asarray(x, dtype=np.float64)
+  y = np.asarray(y, dtype=np.float64)
+  n = len(y)
+  if n <= n_out or n_out < 3:
+    return np.arange(n)
+
+  edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+  idx = np.empty(n_out, dtype=np.int64)
+  idx[0], idx[-1] = 0, n - 1
+  for b in range(n_out - 2):
+    start, stop = edges[b], max(edges[b + 1], edges[b] + 1)
+    next_stop = edges[b + 2] if b + 2 < len(edges) else n
+    next_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+    next_y = np.nanmean(y[stop:next_stop]) if next_stop > stop else y[-1]
+    ax, ay = x[idx[b]], y[idx[b]]
+    area = np.abs((ax - next_x) * (y[start:stop] - ay) - (ax - x[start:stop]) * (next_y - ay))
+    idx[b + 1] = start + int(np.nanargmax(area)) if np.any(~np.isnan(area)) else start
+  return np.unique(idx)
+
+
+def _as_numeric(x):
+  x = np.asarray(x)
+  if np.issubdtype(x.dtype, np.datetime64):
+    return x.astype("datetime64[ns]").astype(np.int64)
+  return x.astype(np.float64)
+
+
+def _bound(value, x):
+  if np.issubdtype(np.asarray(x).dtype, np.datetime64):
+    return np.datetime64(pd.Timestamp(value))
+  return float(value)
+
+
+def decimate_series(x, y, max_points=MAX_POINTS, x_range=None, method="minmax"):
+  """
+  (x, y) reduced to at most ~max_points. Short series are returned whole; long
+  ones are first restricted to x_range (plus one point each side).
+  """
+  x = np.asarray(x)
+  y = np.asarray(y)
+  if len(x) <= max_points:
+    return x, y
+  start, stop = 0, len(x)
+  if x_range is not None:
+    start = max(int(np.searchsorted(x, _bound(x_range[0], x), side="left")) - 1, 0)
+    stop = min(int(np.searchsorted(x, _bound(x_range[1], x), side="right")) + 1, len(x))
+  x, y = x[start:stop], y[start:stop]
+  if len(x) <= max_points:
+    return x, y
+
+  if method == "minmax":
+    idx = minmax_indices(y, max_points)
+  elif method == "lttb":
+    idx = lttb_indices(_as_numeric(x), y, max_points)
+  else:
+    raise ValueError(f"Unknown decimation method '{method}', expected 'minmax' or 'lttb'")
+  return x[idx], y[idx]
+
+
+def scatter_class(total_points):
+  # SVG Scatter for small figures, WebGL above the threshold
+  return go.Scattergl if total_points > WEBGL_THRESHOLD else go.Scatter
+
+
+def zoom_range(relayout_data):
+  """
+  X range of a dcc.Graph relayoutData: (x0, x1) after a zoom/pan, None after an
+  autorange (full view), or False when the event did not touch the x axis.
+  """
+  if not relayout_data:
+    return False
+  if 'xaxis.range[0]' in relayout_data and 'xaxis.range[1]' in relayout_data:
+    return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+  if 'xaxis.range' in relayout_data:
+    return tuple(relayout_data['xaxis.range'])
+  if relayout_data.get('xaxis.autorange'):
+    return None
+  return False
@@ -0,0 +1,322 @@
+import argparse
+import json
+import logging
+import re
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+# -------------------------------
+# Offline map geometry
+# -------------------------------
+# Builds country shapes once from a world GeoJSON (e.g. Natural Earth admin-0)
+# into dashboard/assets/geo/, which Dash serves as static files:
+#   countries_<lod>.geojson  Douglas-Peucker simplified shapes, feature id = ISO3,
+#                            rounded coordinates, one file per level of detail
+#   iso3.json                country name (lower case) -> ISO3 lookup table
+# The choropleth references the GeoJSON by URL, so the browser downloads it once
+# and caches it instead of receiving it inside every figure.
+#
+# plotly.js also fetches a base-map TopoJSON (world_110m.json) for every geo
+# subplot, GeoJSON choropleths included, from its CDN unless topojsonURL points
+# elsewhere. A low-detail one is generated from the same source into
+# assets/topojson/ (or Plotly's own files are copied with --topojson-dir), so
+# the map renders with no network access.
+#
+# The committed assets come from Natural Earth 110m admin-0 countries (public
+# domain):
+#
+#   python geo_assets.py ne_110m_admin_0_countries.geojson [--topojson-dir DIR]
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+GEO_DIR = ASSETS_DIR / "geo"
+TOPOJSON_DIR = ASSETS_DIR / "topojson"
+ASSETS_URL = "/assets"
+BASE_MAP = "world_110m.json"
+
+# level of detail -> (Douglas-Peucker tolerance in degrees, decimals kept)
+LODS = {
+  'high':   (0.01, 3),
+  'medium': (0.05, 2),
+  'low':    (0.2, 2),
+}
+
+# Objects plotly.js reads from the base map (only the layers that are shown)
+BASE_MAP_LAYERS = ("countries", "land", "coastlines", "ocean", "lakes", "rivers", "subunits")
+
+# Feature properties tried, in order, for the ISO3 code and the names
+ISO3_PROPERTIES = ("ISO_A3", "ADM0_A3", "ISO_A3_EH", "iso_a3", "ISO3", "id")
+NAME_PROPERTIES = ("NAME", "NAME_LONG", "ADMIN", "FORMAL_EN", "NAME_EN", "name")
+
+# Names used by our data sources that differ from the geometry names
+COUNTRY_ALIASES = {
+  "united states": "USA",
+  "russia": "RUS",
+  "south korea": "KOR",
+  "north korea": "PRK",
+  "democratic republic of congo": "COD",
+  "congo": "COG",
+  "cote d'ivoire": "CIV",
+  "czechia": "CZE",
+  "vietnam": "VNM",
+  "laos": "LAO",
+  "iran": "IRN",
+  "syria": "SYR",
+  "bolivia": "BOL",
+  "venezuela": "VEN",
+  "tanzania": "TZA",
+  "moldova": "MDA",
+  "eswatini": "SWZ",
+  "cape verde": "CPV",
+  "timor": "TLS",
+  "brunei": "BRN",
+  "micronesia (country)": "FSM",
+}
+
+_ISO3 = re.compile(r"^[A-Z]{3}$")
+
+logger = logging.getLogger(__name__)
+
+
+# ---- simplification ----
+def douglas_peucker(points, tolerance):
+  """Keep the points of a polyline farther than tolerance from the simplified line."""
+  n = len(points)
+  if n < 3 or tolerance <= 0:
+    return points
+  keep = np.zeros(n, dtype=bool)
+  keep[0] = keep[-1] = True
+  stack = [(0, n - 1)]
+  while stack:
+    start, end = stack.pop()
+    if end <= start + 1:
+      continue
+    inner = points[start + 1:end]
+    a, b = points[start], points[end]
+    direction = b - a
+    norm = np.hypot(direction[0], direction[1])
+    if norm == 0:
+      dist = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+    else:
+      dist = np.abs(direction[0] * (inner[:, 1] - a[1]) - direction[1] * (inner[:, 0] - a[0])) / norm
+    i = int(np.argmax(dist))
+    if dist[i] > tolerance:
+      split = start + 1 + i
+      keep[split] = True
+      stack.append((start, split))
+      stack.append((split, end))
+  return points[keep]
+
+
+def _simplify_ring(ring, tolerance, decimals):
+  points = np.round(douglas_peucker(np.asarray(ring, dtype=np.float64), tolerance), decimals)
+  # Rounding can repeat consecutive points; a valid ring needs 4 positions
+  points = points[np.r_[True, np.any(points[1:] != points[:-1], axis=1)]]
+  if len(points) < 4:
+    return None
+  return points.tolist()
+
+
+def _simplify_polygon(rings, tolerance, decimals):
+  exterior = _simplify_ring(rings[0], tolerance, decimals)
+  if exterior is None:
+    return None
+  holes = [hole for hole in (_simplify_ring(r, tolerance, decimals) for r in rings[1:]) if hole is not None]
+  return [exterior] + holes
+
+
+def simplify_geometry(geometry, tolerance, decimals):
+  if geometry['type'] == "Polygon":
+    polygons = [geometry['coordinates']]
+  elif geometry['type'] == "MultiPolygon":
+    polygons = geometry['coordinates']
+  else:
+    return geometry
+
+  simplified = [p for p in (_simplify_polygon(rings, tolerance, decimals) for rings in polygons) if p is not None]
+  if not simplified:
+    # Too small for this tolerance: keep the largest polygon, only rounded
+    largest = max(polygons, key=lambda rings: len(rings[0]))
+    simplified = [_simplify_polygon(largest, 0, decimals) or largest]
+  if len(simplified) == 1:
+    return {'type': "Polygon", 'coordinates': simplified[0]}
+  return {'type': "MultiPolygon", 'coordinates': simplified}
+
+
+# ---- building the assets ----
+def _first_property(properties, names):
+  for name in names:
+    value = properties.get(name)
+    if value not in (None, "", "-99"):
+      return value
+  return None
+
+
+def read_countries(source):
+  """(ISO3, name, geometry) per country of a world GeoJSON, and the name -> ISO3 lookup."""
+  with open(source, "r", encoding="utf-8") as f:
+    collection = json.load(f)
+
+  countries = []
+  lookup = {name.lower(): code for name, code in COUNTRY_ALIASES.items()}
+  for feature in collection['features']:
+    properties = dict(feature.get('properties') or {}, id=feature.get('id'))
+    code = _first_property(properties, ISO3_PROPERTIES)
+    if code is None or not _ISO3.match(str(code)):
+      continue
+    names = {str(properties[p]) for p in NAME_PROPERTIES if properties.get(p)}
+    for name in names:
+      lookup.setdefault(name.lower(), code)
+    countries.append((code, _first_property(properties, NAME_PROPERTIES) or code, feature['geometry']))
+  return countries, lookup
+
+
+def build_geometry_assets(source, out_dir=GEO_DIR, lods=LODS):
+  """Write countries_<lod>.geojson for every level of detail plus iso3.json."""
+  countries, lookup = read_countries(source)
+
+  out_dir = Path(out_dir)
+  out_dir.mkdir(parents=True, exist_ok=True)
+
+  sizes = {}
+  for lod, (tolerance, decimals) in lods.items():
+    features = [
+      {'type': "Feature", 'id': code, 'properties': {'name': name},
+       'geometry': simplify_geometry(geometry, tolerance, decimals)}
+      for code, name, geometry in countries
+    ]
+    path = out_dir / f"countries_{lod}.geojson"
+    path.write_text(json.dumps({'type': "FeatureCollection", 'features': features}, separators=(",", ":")),
+                    encoding="utf-8")
+    sizes[lod] = path.stat().st_size
+
+  (out_dir / "iso3.json").write_text(json.dumps(lookup, sort_keys=True, indent=0), encoding="utf-8")
+  return sizes
+
+
+def _topology_geometry(geometry, arcs):
+  # Every ring becomes one arc (no shared borders): larger, but needs no topology building
+  def ring(coordinates):
+    arcs.append(coordinates)
+    return [len(arcs) - 1]
+
+  if geometry['type'] == "Polygon":
+    return {'type': "Polygon", 'arcs': [ring(r) for r in geometry['coordinates']]}
+  return {'type': "MultiPolygon", 'arcs': [[ring(r) for r in polygon] for polygon in geometry['coordinates']]}
+
+
+def build_base_map(source, out_dir=TOPOJSON_DIR, lod="medium"):
+  """
+  Write a base-map TopoJSON with the layout plotly.js expects from its CDN
+  files: countries (feature id = ISO3, so locationmode="ISO-3" works too), land
+  and coastlines from the same shapes, and empty ocean/lakes/rivers/subunits.
+  """
+  countries, _ = read_countries(source)
+  tolerance, decimals = LODS[lod]
+
+  arcs = []
+  shapes = []
+  for code, _, geometry in countries:
+    geometry = simplify_geometry(geometry, tolerance, decimals)
+    if geometry['type'] in ("Polygon", "MultiPolygon"):
+      shapes.append((code, _topology_geometry(geometry, arcs)))
+
+  def collection(geometries):
+    return {'type': "GeometryCollection", 'geometries': geometries}
+
+  objects = {layer: collection([]) for layer in BASE_MAP_LAYERS}
+  objects['countries'] = collection([dict(shape, id=code) for code, shape in shapes])
+  objects['land'] = collection([shape for _, shape in shapes])
+  # Coastlines are drawn along the outline of every country, from the same arcs
+  objects['coastlines'] = collection([
+    {'type': "MultiLineString", 'arcs': [ring for polygon in _polygons(shape) for ring in polygon]}
+    for _, shape in shapes
+  ])
+
+  out_dir = Path(out_dir)
+  out_dir.mkdir(parents=True, exist_ok=True)
+  path = out_dir / BASE_MAP
+  path.write_text(json.dumps({'type': "Topology", 'objects': objects, 'arcs': arcs}, separators=(",", ":")),
+                  encoding="utf-8")
+  return path.stat().st_size
+
+
+def _polygons(shape):
+  return [shape['arcs']] if shape['type'] == "Polygon" else shape['arcs']
+
+
+def copy_topojson(topojson_dir, out_dir=TOPOJSON_DIR):
+  # Plotly base-map files (world_110m.json, world_50m.json, ...) for topojsonURL
+  out_dir = Path(out_dir)
+  out_dir.mkdir(parents=True, exist_ok=True)
+  copied = []
+  for path in Path(topojson_dir).glob("*.json"):
+    shutil.copy2(path, out_dir / path.name)
+    copied.append(path.name)
+  return copied
+
+
+# ---- using the assets ----
+@lru_cache(maxsize=1)
+def iso3_table():
+  path = GEO_DIR / "iso3.json"
+  table = {name: code for name, code in COUNTRY_ALIASES.items()}
+  if path.exists():
+    table.update(json.loads(path.read_text(encoding="utf-8")))
+  return table
+
+
+def to_iso3(names, known_codes=None):
+  """ISO3 per country name (None when unknown); known_codes (name -> code) wins."""
+  known_codes = known_codes or {}
+  table = iso3_table()
+  codes = []
+  for name in names:
+    code = known_codes.get(name) or table.get(str(name).lower())
+    codes.append(code if code and _ISO3.match(str(code)) else None)
+  return codes
+
+
+def geometry_url(lod="medium"):
+  # URL of the bundled GeoJSON for this level of detail, or None if it was not built
+  if (GEO_DIR / f"countries_{lod}.geojson").exists():
+    return f"{ASSETS_URL}/geo/countries_{lod}.geojson"
+  return None
+
+
+@lru_cache(maxsize=1)
+def base_map_bundled():
+  # Without it the browser fetches the base map from cdn.plot.ly and the map stays blank offline
+  if (TOPOJSON_DIR / BASE_MAP).exists():
+    return True
+  logger.warning("Map geometry not bundled: %s is missing, the map needs cdn.plot.ly "
+                 "(run geo_assets.py to build it)", TOPOJSON_DIR / BASE_MAP)
+  return False
+
+
+def map_graph_config():
+  # dcc.Graph config: use the local base-map TopoJSON only when it has been bundled
+  if base_map_bundled():
+    return {'topojsonURL': f"{ASSETS_URL}/topojson/"}
+  return {}
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Build offline, simplified country geometry for the map")
+  parser.add_argument("source", help="world countries GeoJSON (e.g. Natural Earth admin-0)")
+  parser.add_argument("--topojson-dir", help="directory with Plotly's world_*.json base-map files to bundle "
+                                             "(default: generate world_110m.json from the source)")
+  args = parser.parse_args()
+
+  for lod, size in build_geometry_assets(args.source).items():
+    print(f"countries_{lod}.geojson: {size / 1024:,.0f} KB")
+  if args.topojson_dir:
+    print("topojson:", ", ".join(copy_topojson(args.topojson_dir)) or "no files found")
+  else:
+    print(f"{BASE_MAP}: {build_base_map(args.source) / 1024:,.0f} KB")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# Week-range queries per country
+# -------------------------------
+# Built once from the long weekly frame (Country, Week, Cases):
+#   - prefix sums of cases and of reported weeks -> range total / mean in O(1)
+#   - a sparse table of maxima                  -> range peak in O(1)
+#   - cumulative curves are differences of prefix rows, no re-cumsum
+# Ranges are half-open week positions [start, stop) over `weeks`.
+
+
+class WeeklyRanges:
+
+  def __init__(self, weeks, countries, cases, reported, codes=None):
+    self.weeks = pd.DatetimeIndex(weeks)
+    self.countries = list(countries)
+    # ISO3 code per country (None when unknown), used to place them on the map
+    self.codes = list(codes) if codes is not None else [None] * len(self.countries)
+    self._country = {country: i for i, country in enumerate(self.countries)}
+
+    n_weeks = len(self.weeks)
+    self._cases = np.zeros((n_weeks + 1, len(self.countries)))
+    np.cumsum(cases, axis=0, out=self._cases[1:])
+    self._reported = np.zeros((n_weeks + 1, len(self.countries)), dtype=np.int64)
+    np.cumsum(reported, axis=0, out=self._reported[1:])
+
+    # _max[k][i] = max of cases[i:i + 2**k]
+    self._max = [np.asarray(cases, dtype=np.float64)]
+    k = 1
+    while (1 << k) <= n_weeks:
+      prev = self._max[-1]
+      half = 1 << (k - 1)
+      self._max.append(np.maximum(prev[:-half], prev[half:]))
+      k += 1
+
+  @property
+  def cases(self):
+    # Dense week x country matrix of weekly cases (row i = week i, C-contiguous)
+    return self._max[0]
+
+  @property
+  def peak_cases(self):
+    return float(self._max[-1].max()) if len(self.weeks) else 0.0
+
+  @classmethod
+  def from_weekly(cls, weekly, codes=None):
+    # codes: optional mapping country -> ISO3
+    matrix = weekly.pivot(index='Week', columns='Country', values='Cases').sort_index()
+    return cls(matrix.index, matrix.columns, matrix.fillna(0).to_numpy(dtype=np.float64),
+               matrix.notna().to_numpy(), [(codes or {}).get(country) for country in matrix.columns])
+
+  def __len__(self):
+    return len(self.weeks)
+
+  def _columns(self, countries):
+    if countries is None:
+      return list(range(len(self.countries)))
+    return [self._country[country] for country in countries]
+
+  def _bounds(self, start, stop):
+    stop = len(self.weeks) if stop is None else min(int(stop), len(self.weeks))
+    start = max(int(start or 0), 0)
+    if start >= stop:
+      raise ValueError(f"Empty week range [{start}, {stop})")
+    return start, stop
+
+  def positions(self, first_week, last_week):
+    """Half-open positions covering the dates first_week..last_week (inclusive)."""
+    start = self.weeks.searchsorted(pd.Timestamp(first_week), side="left")
+    stop = self.weeks.searchsorted(pd.Timestamp(last_week), side="right")
+    return int(start), int(stop)
+
+  def totals(self, start=0, stop=None, countries=None):
+    start, stop = self._bounds(start, stop)
+    cols = self._columns(countries)
+    return self._cases[stop, cols] - self._cases[start, cols]
+
+  def reported(self, start=0, stop=None, countries=None):
+    start, stop = self._bounds(start, stop)
+    cols = self._columns(countries)
+    return self._reported[stop, cols] - self._reported[start, cols]
+
+  def means(self, start=0, stop=None, countries=None):
+    # Average over the weeks each country reported in the range (NaN if none)
+    totals = self.totals(start, stop, countries)
+    weeks = self.reported(start, stop, countries)
+    return np.divide(totals, weeks, out=np.full(len(totals), np.nan), where=weeks > 0)
+
+  def peaks(self, start=0, stop=None, countries=None):
+    # Largest weekly count in the range (NaN if the country reported no week)
+    start, stop = self._bounds(start, stop)
+    cols = self._columns(countries)
+    k = (stop - start).bit_length() - 1
+    level = self._max[k]
+    peaks = np.maximum(level[start, cols], level[stop - (1 << k), cols])
+    return np.where(self._reported[stop, cols] > self._reported[start, cols], peaks, np.nan)
+
+  def stats(self, start=0, stop=None, countries=None):
+    """total / mean / peak / periods per country (same columns as SummaryCube.frame)."""
+    if countries is None:
+      countries = self.countries
+    return pd.DataFrame({
+      'total': self.totals(start, stop, countries),
+      'mean': self.means(start, stop, countries),
+      'peak': self.peaks(start, stop, countries),
+      'periods': self.reported(start, stop, countries),
+    }, index=pd.Index(list(countries), name='Country'))
+
+  def cumulative(self, start=0, stop=None, countries=None):
+    """Cumulative cases from the start of the range, one column per country."""
+    start, stop = self._bounds(start, stop)
+    cols = self._columns(countries)
+    values = self._cases[start + 1:stop + 1, cols] - self._cases[start, cols]
+    return pd.DataFrame(values, index=self.weeks[start:stop],
+                        columns=list(countries) if countries is not None else self.countries)
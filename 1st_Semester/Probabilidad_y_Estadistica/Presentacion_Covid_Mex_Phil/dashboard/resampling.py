@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# Vectorized calendar bucketing
+# -------------------------------
+# Dates are handled as integer day numbers (days since 1970-01-01, a Thursday),
+# so weekly/monthly/epi-week buckets are plain array arithmetic instead of a
+# Python call per row (`dt.to_period('W').apply(lambda r: r.start_time)`).
+# NaT dates stay NaT / missing in every output.
+#
+#   "week"     -> Monday that starts the week (same as to_period('W').start_time)
+#   "epiweek"  -> Sunday that starts the CDC (MMWR) epidemiological week
+#   "month"    -> first day of the month
+
+FREQUENCIES = ("week", "epiweek", "month")
+
+_EPOCH_WEEKDAY = 3   # 1970-01-01 is a Thursday (Monday = 0)
+
+
+def _day_numbers(dates):
+  values = pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[ns]")
+  valid = ~np.isnat(values)
+  days = values.astype("datetime64[D]").astype(np.int64)
+  return days, valid
+
+
+def _to_dates(days, valid, index=None):
+  out = days.astype("datetime64[D]").astype("datetime64[ns]")
+  out[~valid] = np.datetime64("NaT")
+  return pd.Series(out, index=index)
+
+
+def _week_floor(days, first_weekday):
+  # first_weekday: 0 = Monday ... 6 = Sunday
+  return days - (days + _EPOCH_WEEKDAY - first_weekday) % 7
+
+
+def week_start(dates):
+  days, valid = _day_numbers(dates)
+  return _to_dates(_week_floor(days, 0), valid, getattr(dates, "index", None))
+
+
+def epi_week_start(dates):
+  days, valid = _day_numbers(dates)
+  return _to_dates(_week_floor(days, 6), valid, getattr(dates, "index", None))
+
+
+def month_start(dates):
+  values = pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[ns]")
+  out = values.astype("datetime64[M]").astype("datetime64[ns]")
+  return pd.Series(out, index=getattr(dates, "index", None))
+
+
+def bucket_start(dates, freq="week"):
+  if freq == "week":
+    return week_start(dates)
+  if freq == "epiweek":
+    return epi_week_start(dates)
+  if freq == "month":
+    return month_start(dates)
+  raise ValueError(f"Unknown frequency '{freq}', expected one of {FREQUENCIES}")
+
+
+def resample_counts(df, freq="week", date="Date", by="Country", value="Cases", label="Week"):
+  """Sum of `value` per (`by`, bucket) with the bucket start in column `label`."""
+  buckets = bucket_start(df[date], freq)
+  # observed=True: typed copies store the country as a category
+  return (df.groupby([df[by], buckets.rename(label)], observed=True)[value]
+            .sum()
+            .reset_index())
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# Summary statistics cube
+# -------------------------------
+# Materialized once when the data is loaded: a dense float64 array of shape
+# (country, statistic) over the weekly totals. The summary cards read totals,
+# averages and peaks by index in O(1) instead of filtering and reducing the
+# series again.
+
+STATISTICS = ("total", "mean", "peak", "periods")
+
+
+class SummaryCube:
+
+  def __init__(self, countries, values, statistics=STATISTICS):
+    self.countries = list(countries)
+    self.statistics = tuple(statistics)
+    self.values = values
+    self._country = {country: i for i, country in enumerate(self.countries)}
+    self._statistic = {s: i for i, s in enumerate(self.statistics)}
+
+  @classmethod
+  def from_weekly(cls, weekly, by="Country", value="Cases"):
+    """One grouped reduction over the weekly frame (resample_counts output)."""
+    countries = sorted(weekly[by].dropna().unique())
+    stats = (weekly.groupby(by, observed=True)[value]
+             .agg(total='sum', mean='mean', peak='max', periods='count')
+             .reindex(countries))
+    return cls(countries, stats[list(STATISTICS)].to_numpy(dtype=np.float64))
+
+  def __contains__(self, country):
+    return country in self._country
+
+  def get(self, country, statistic):
+    return self.values[self._country[country], self._statistic[statistic]]
+
+  def frame(self, countries=None):
+    """Statistics of the given countries (in that order) as a small DataFrame."""
+    if countries is None:
+      countries = self.countries
+    rows = [self._country[country] for country in countries]
+    return pd.DataFrame(
+      self.values[rows, :],
+      index=pd.Index(list(countries), name='Country'),
+      columns=list(self.statistics)
+    )
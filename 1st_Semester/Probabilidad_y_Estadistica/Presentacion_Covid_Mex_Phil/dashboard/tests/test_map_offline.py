@@ -0,0 +1,77 @@
+import json
+import socket
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import geo_assets
+from geo_assets import ASSETS_DIR, ASSETS_URL, BASE_MAP, TOPOJSON_DIR, map_graph_config
+from range_queries import WeeklyRanges
+from weekly_cases import create_map
+
+
+# The map must render from the bundled assets alone: every URL the figure or the
+# graph config hands to plotly.js is served from /assets and exists on disk.
+
+pytestmark = pytest.mark.skipif(not (TOPOJSON_DIR / BASE_MAP).exists(), reason="map assets not bundled")
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+  def refuse(*args, **kwargs):
+    raise AssertionError("the map tried to open a network connection")
+  monkeypatch.setattr(socket.socket, "connect", refuse)
+  monkeypatch.setattr(socket, "create_connection", refuse)
+
+
+@pytest.fixture
+def ranges():
+  weekly = pd.DataFrame({
+    'Week': pd.to_datetime(["2021-01-04", "2021-01-04", "2021-01-11", "2021-01-11"]),
+    'Country': ["Mexico", "Philippines", "Mexico", "Philippines"],
+    'Cases': [10.0, 5.0, 12.0, 7.0],
+  })
+  return WeeklyRanges.from_weekly(weekly, codes={'Mexico': "MEX", 'Philippines': "PHL"})
+
+
+def asset_file(url):
+  assert url.startswith(f"{ASSETS_URL}/"), f"{url} is not a bundled asset"
+  path = ASSETS_DIR / url[len(ASSETS_URL) + 1:]
+  assert path.exists(), f"{url} is not bundled ({path} missing)"
+  return path
+
+
+def test_create_map_only_uses_bundled_assets(no_network, ranges):
+  fig = create_map(ranges).to_plotly_json()
+  trace = fig['data'][0]
+
+  geojson = trace.get('geojson')
+  if geojson is not None:
+    features = json.loads(asset_file(geojson).read_text(encoding="utf-8"))['features']
+    assert set(trace['locations']) <= {feature['id'] for feature in features}
+  assert not fig['layout'].get('annotations'), "map reports its geometry as not bundled"
+
+
+def test_base_map_is_local_and_covers_the_locations(no_network, ranges):
+  config = map_graph_config()
+  topology = json.loads(asset_file(config['topojsonURL'] + BASE_MAP).read_text(encoding="utf-8"))
+
+  assert set(geo_assets.BASE_MAP_LAYERS) <= set(topology['objects'])
+  countries = {geometry['id'] for geometry in topology['objects']['countries']['geometries']}
+  assert {"MEX", "PHL"} <= countries
+
+
+def test_missing_base_map_is_reported(monkeypatch, tmp_path, ranges, caplog):
+  monkeypatch.setattr(geo_assets, "TOPOJSON_DIR", tmp_path)
+  geo_assets.base_map_bundled.cache_clear()
+  try:
+    assert map_graph_config() == {}
+    fig = create_map(ranges)
+  finally:
+    geo_assets.base_map_bundled.cache_clear()
+
+  assert "not bundled" in caplog.text
+  assert "not bundled" in fig.layout.annotations[0].text
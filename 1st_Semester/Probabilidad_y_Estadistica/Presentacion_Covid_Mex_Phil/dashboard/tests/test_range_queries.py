@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from range_queries import WeeklyRanges
+
+
+# Every range query is checked against pandas reducing the same slice of the
+# week x country matrix (missing weeks are NaN there and skipped).
+
+
+@pytest.fixture
+def weekly():
+  rng = np.random.default_rng(0)
+  weeks = pd.date_range("2020-01-06", periods=37, freq="W-MON")
+  df = pd.DataFrame({
+    'Week': np.tile(weeks, 3),
+    'Country': np.repeat(["Mexico", "Philippines", "Chile"], len(weeks)),
+    'Cases': rng.poisson(1_000, 3 * len(weeks)).astype(float),
+  })
+  # Chile stops reporting for a stretch, the Philippines skip a few weeks
+  missing = ((df['Country'] == "Chile") & df['Week'].between(weeks[10], weeks[20])) | \
+            ((df['Country'] == "Philippines") & df.index.isin([40, 41, 55]))
+  return df[~missing]
+
+
+@pytest.fixture
+def matrix(weekly):
+  return weekly.pivot(index='Week', columns='Country', values='Cases').sort_index()
+
+
+RANGES = [(0, None), (0, 1), (3, 4), (5, 17), (10, 21), (12, 15), (0, 37), (36, 37), (1, 36), (7, 8)]
+
+
+@pytest.mark.parametrize("start, stop", RANGES)
+def test_stats_match_pandas(weekly, matrix, start, stop):
+  ranges = WeeklyRanges.from_weekly(weekly)
+  window = matrix.iloc[start:stop]
+  expected = pd.DataFrame({
+    'total': window.sum(),
+    'mean': window.mean(),
+    'peak': window.max(),
+    'periods': window.count(),
+  })
+  expected.index.name = 'Country'
+
+  pd.testing.assert_frame_equal(ranges.stats(start, stop), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("start, stop", RANGES)
+def test_cumulative_matches_cumsum(weekly, matrix, start, stop):
+  ranges = WeeklyRanges.from_weekly(weekly)
+  countries = ["Chile", "Mexico"]
+  expected = matrix.iloc[start:stop][countries].fillna(0).cumsum()
+  pd.testing.assert_frame_equal(ranges.cumulative(start, stop, countries), expected,
+                                check_names=False, check_freq=False)
+
+
+def test_country_without_reports_in_range(weekly):
+  # Chile reports nothing between weeks 10 and 20: no mean and no peak, zero total
+  ranges = WeeklyRanges.from_weekly(weekly)
+  stats = ranges.stats(10, 21, ["Chile"]).loc["Chile"]
+  assert stats['total'] == 0
+  assert stats['periods'] == 0
+  assert np.isnan(stats['mean'])
+  assert np.isnan(stats['peak'])
+
+
+def test_positions(weekly):
+  ranges = WeeklyRanges.from_weekly(weekly)
+  # Dates between weeks round inwards, inclusive of the last week
+  assert ranges.positions("2020-01-06", "2020-01-20") == (0, 3)
+  assert ranges.positions("2020-01-07", "2020-01-21") == (1, 3)
+
+
+@pytest.mark.parametrize("start, stop", [(5, 5), (9, 3), (37, None), (40, 50)])
+def test_empty_range_is_rejected(weekly, start, stop):
+  ranges = WeeklyRanges.from_weekly(weekly)
+  with pytest.raises(ValueError):
+    ranges.totals(start, stop)
+
+
+def test_no_weeks():
+  ranges = WeeklyRanges.from_weekly(pd.DataFrame({'Week': pd.to_datetime([]), 'Country': [], 'Cases': []}))
+  assert len(ranges) == 0
+  assert ranges.peak_cases == 0.0
+  with pytest.raises(ValueError):
+    ranges.stats()
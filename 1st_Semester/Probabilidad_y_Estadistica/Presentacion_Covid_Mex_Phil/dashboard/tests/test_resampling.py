@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from resampling import FREQUENCIES, bucket_start, resample_counts
+
+
+# Every bucket is checked against pandas' own Period arithmetic:
+# Monday weeks are 'W' (ending Sunday), MMWR weeks 'W-SAT' (starting Sunday).
+
+PERIODS = {'week': "W", 'epiweek': "W-SAT", 'month': "M"}
+
+
+@pytest.fixture
+def dates():
+  # Four years around leap days and year ends, every weekday, plus NaT
+  days = pd.Series(pd.date_range("2019-12-20", "2023-01-10", freq="D"))
+  times = days + pd.to_timedelta(np.arange(len(days)) % 24, unit="h")
+  return pd.concat([times, pd.Series([pd.NaT, pd.NaT])], ignore_index=True)
+
+
+@pytest.mark.parametrize("freq", FREQUENCIES)
+def test_bucket_start_matches_periods(dates, freq):
+  expected = dates.dt.to_period(PERIODS[freq]).dt.start_time
+  pd.testing.assert_series_equal(bucket_start(dates, freq), expected, check_names=False, check_freq=False)
+
+
+def test_bucket_start_keeps_the_index():
+  dates = pd.Series(pd.to_datetime(["2021-03-03", None, "2021-03-10"]), index=[10, 20, 30])
+  buckets = bucket_start(dates, "week")
+  assert list(buckets.index) == [10, 20, 30]
+  assert buckets.isna().tolist() == [False, True, False]
+
+
+def test_unknown_frequency():
+  with pytest.raises(ValueError):
+    bucket_start(pd.Series(pd.to_datetime(["2021-01-01"])), "isoweek")
+
+
+@pytest.fixture
+def daily():
+  rng = np.random.default_rng(0)
+  dates = pd.date_range("2020-01-01", periods=120, freq="D")
+  df = pd.DataFrame({
+    'Country': np.repeat(["Mexico", "Philippines", "Chile"], len(dates)),
+    'Date': np.tile(dates, 3),
+    'Cases': rng.poisson(50, 3 * len(dates)).astype(float),
+  })
+  df.loc[df.index[::11], 'Cases'] = np.nan
+  df.loc[df.index[5::17], 'Date'] = pd.NaT
+  return df
+
+
+@pytest.mark.parametrize("freq", FREQUENCIES)
+def test_resample_counts_matches_groupby(daily, freq):
+  expected = (daily.groupby(['Country', daily['Date'].dt.to_period(PERIODS[freq]).dt.start_time.rename("Week")])
+              ['Cases'].sum()
+              .reset_index())
+  pd.testing.assert_frame_equal(resample_counts(daily, freq=freq), expected)
+
+
+def test_resample_counts_categorical_countries(daily):
+  # Typed copies store the country as a category: unused categories produce no rows
+  typed = daily.assign(Country=pd.Categorical(daily['Country'], categories=["Chile", "Mexico", "Peru", "Philippines"]))
+  result = resample_counts(typed)
+  assert "Peru" not in set(result['Country'])
+  pd.testing.assert_frame_equal(result.astype({'Country': str}), resample_counts(daily))
+
+
+def test_resample_counts_empty():
+  empty = pd.DataFrame({'Country': pd.Series(dtype=str), 'Date': pd.Series(dtype="datetime64[ns]"),
+                        'Cases': pd.Series(dtype=float)})
+  result = resample_counts(empty)
+  assert result.empty
+  assert list(result.columns) == ["Country", "Week", "Cases"]
@@ -1,104 +1,127 @@
+import hashlib
+import os
+import sys
+import threading
+from pathlib import Path
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import html, dcc
+from dash import html, dcc, Patch, no_update
+from resampling import resample_counts
+from comparison import available_countries, default_countries, weekly_matrix, pairwise_differences
+from summary_cube import SummaryCube
+from range_queries import WeeklyRanges
+from geo_assets import base_map_bundled, geometry_url, map_graph_config, to_iso3
+from decimation import MAX_POINTS, decimate_series, scatter_class, zoom_range
 
+# The CSVs live next to the dashboard folder and are resolved by data_registry.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from data_registry import dataset_path, load_dataset
 
-def load_covid_data():
-  df = pd.read_csv(r"C:\Users\Axeel\Documents\GitHub\Master_MCS\1st_Semester\Probabilidad_y_Estadistica\Presentacion_Covid_Mex_Phil\casos_semanales__mexico_filipinas_2020-2023.csv")
-  df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce')
+
+COVID_CSV = str(dataset_path("casos_semanales"))
+
+
+def load_covid_data(path=COVID_CSV):
+  df = load_dataset(path)
+  # The registry already returns datetimes for registered files and typed copies
+  if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce')
 
   # Group weekly (per monday) and sum the cases by day
-  df['Week'] = df['Date'].dt.to_period('W').apply(lambda r: r.start_time)
-  weekly = df.groupby(['Country', 'Week'])['Cases'].sum().reset_index()
+  weekly = resample_counts(df, freq="week", date="Date", by="Country", value="Cases", label="Week")
 
-  # Pivot for easier comparison i mean the difference of cases
-  pivot = weekly.pivot(index='Week', columns='Country', values='Cases').fillna(0)
-  pivot['Difference'] = pivot['Mexico'] - pivot['Philippines']
+  # Pivot for easier comparison (week x country); differences come from comparison.py
+  pivot = weekly_matrix(weekly)
 
-  return weekly, pivot
+  # Country x statistic cube of the weekly totals for the summary cards
+  cube = SummaryCube.from_weekly(weekly, by="Country", value="Cases")
 
+  # Name -> ISO3 for the map (the dataset's own Code column first, then the lookup table)
+  names = list(weekly['Country'].unique())
+  dataset_codes = {}
+  if 'Code' in df.columns:
+    dataset_codes = df.dropna(subset=['Code']).drop_duplicates('Country').set_index('Country')['Code'].to_dict()
+  codes = dict(zip(names, to_iso3(names, dataset_codes)))
 
-def data_summary(week_df):
-  mex_color      = '#168c16'
-  mex_color_back = '#f0fff0'
+  # Per-country prefix sums for date-range totals, means, peaks and cumulative curves
+  ranges = WeeklyRanges.from_weekly(weekly, codes=codes)
 
-  phi_color      = '#3498db'
-  phi_color_back = '#f0f8ff'
+  return weekly, pivot, cube, ranges
 
-  mexico_data      = week_df[week_df['Country'] == 'Mexico']
-  philippines_data = week_df[week_df['Country'] == 'Philippines']
 
-  # Total cases, just sum of all the cases
-  mexico_total      = mexico_data['Cases'].sum()
-  philippines_total = philippines_data['Cases'].sum()
+# Card colors (text, background) per country; others cycle through SUMMARY_PALETTE
+COUNTRY_COLORS = {
+  'Mexico':      ('#168c16', '#f0fff0'),
+  'Philippines': ('#3498db', '#f0f8ff'),
+}
+SUMMARY_PALETTE = [
+  ('#c0392b', '#fdf2f1'),
+  ('#8e44ad', '#f7f0fa'),
+  ('#d35400', '#fdf3ec'),
+  ('#16a085', '#eefaf7'),
+  ('#2c3e50', '#f2f4f6'),
+]
 
-  # Mean cases, promedio por semana gg
-  mexico_avg      = mexico_data['Cases'].mean()
-  philippines_avg = philippines_data['Cases'].mean()
+# Line colors per chart for the two original countries; others use LINE_PALETTE
+TIME_SERIES_COLORS = {'Mexico': 'green', 'Philippines': 'blue'}
+CUMULATIVE_COLORS  = {'Mexico': '#2E8B57', 'Philippines': '#1E90FF'}
+LINE_PALETTE = px.colors.qualitative.Plotly
 
-  # Maximum case
-  mexico_max      = mexico_data['Cases'].max()
-  philippines_max = philippines_data['Cases'].max()
 
+def country_color(country, position, colors, palette):
+  return colors.get(country, palette[position % len(palette)])
 
-  layout_data_summary = html.Div([
 
+def _hex_to_rgba(color, alpha):
+  color = color.lstrip('#')
+  r, g, b = (int(color[i:i + 2], 16) for i in (0, 2, 4))
+  return f'rgba({r}, {g}, {b}, {alpha})'
+
+
+def _summary_card(country, stats, color, color_back, width):
+  return html.Div([
+    html.H4(country, style={'color': color, 'textAlign': 'center'}),
     html.Div([
+      html.Div([
+        html.P("Total Cases", style={'fontWeight': 'bold', 'color': color, 'margin': '0'}),
+        html.P(f"{stats['total']:,.0f}", style={'fontSize': '24px', 'color': color, 'margin': '0'})
+      ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': color_back, 'borderRadius': '8px',
+                'margin': '5px'}),
 
-      # Mexico Column
       html.Div([
-        html.H4("Mexico", style={'color': mex_color, 'textAlign': 'center'}),
-        html.Div([
-          html.Div([
-            html.P("Total Cases", style={'fontWeight': 'bold', 'color': mex_color, 'margin': '0'}),
-            html.P(f"{mexico_total:,.0f}", style={'fontSize': '24px', 'color': mex_color, 'margin': '0'})
-          ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': mex_color_back, 'borderRadius': '8px',
-                    'margin': '5px'}),
-
-          html.Div([
-            html.P("Average Weekly", style={'fontWeight': 'bold', 'color': mex_color, 'margin': '0'}),
-            html.P(f"{mexico_avg:,.0f}", style={'fontSize': '20px', 'color': mex_color, 'margin': '0'})
-          ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': mex_color_back, 'borderRadius': '8px',
-                    'margin': '5px'}),
-
-          html.Div([
-            html.P("Peak Weekly", style={'fontWeight': 'bold', 'color': mex_color, 'margin': '0'}),
-            html.P(f"{mexico_max:,.0f}", style={'fontSize': '20px', 'color': mex_color, 'margin': '0'})
-          ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': mex_color_back, 'borderRadius': '8px',
-                    'margin': '5px'})
-        ], style={'display': 'flex', 'justifyContent': 'space-around'})
-      ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '15px'}),
-      # ----------------------------------------------------------------------------
-
-
-      # Philippines Column
+        html.P("Average Weekly", style={'fontWeight': 'bold', 'color': color, 'margin': '0'}),
+        html.P(f"{stats['mean']:,.0f}", style={'fontSize': '20px', 'color': color, 'margin': '0'})
+      ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': color_back, 'borderRadius': '8px',
+                'margin': '5px'}),
+
       html.Div([
-        html.H4("Philippines", style={'color': phi_color, 'textAlign': 'center'}),
-        html.Div([
-          html.Div([
-            html.P("Total Cases", style={'fontWeight': 'bold', 'color': phi_color, 'margin': '0'}),
-            html.P(f"{philippines_total:,.0f}", style={'fontSize': '24px', 'color': phi_color, 'margin': '0'})
-          ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': phi_color_back, 'borderRadius': '8px',
-                    'margin': '5px'}),
-
-          html.Div([
-            html.P("Average Weekly", style={'fontWeight': 'bold', 'color': phi_color, 'margin': '0'}),
-            html.P(f"{philippines_avg:,.0f}", style={'fontSize': '20px', 'color': phi_color, 'margin': '0'})
-          ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': phi_color_back, 'borderRadius': '8px',
-                    'margin': '5px'}),
-
-          html.Div([
-            html.P("Peak Weekly", style={'fontWeight': 'bold', 'color': phi_color, 'margin': '0'}),
-            html.P(f"{philippines_max:,.0f}", style={'fontSize': '20px', 'color': phi_color, 'margin': '0'})
-          ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': phi_color_back, 'borderRadius': '8px',
-                    'margin': '5px'})
-        ], style={'display': 'flex', 'justifyContent': 'space-around'})
-      ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '15px'})
-      # ----------------------------------------------------------------------------
+        html.P("Peak Weekly", style={'fontWeight': 'bold', 'color': color, 'margin': '0'}),
+        html.P(f"{stats['peak']:,.0f}", style={'fontSize': '20px', 'color': color, 'margin': '0'})
+      ], style={'textAlign': 'center', 'padding': '10px', 'backgroundColor': color_back, 'borderRadius': '8px',
+                'margin': '5px'})
+    ], style={'display': 'flex', 'justifyContent': 'space-around'})
+  ], style={'width': width, 'display': 'inline-block', 'verticalAlign': 'top', 'padding': '15px'})
 
-    ], style={'textAlign': 'center'})
+
+def data_summary(summary, countries=None):
+  # Totals, averages and peaks read from the precomputed SummaryCube
+  return summary_cards(summary.frame(countries))
+
+
+def summary_cards(stats):
+  # stats: one row per country with total / mean / peak columns (SummaryCube.frame)
+  countries = list(stats.index)
+  width = '48%' if len(countries) <= 2 else '31%'
+
+  cards = []
+  for i, country in enumerate(countries):
+    color, color_back = country_color(country, i, COUNTRY_COLORS, SUMMARY_PALETTE)
+    cards.append(_summary_card(country, stats.loc[country], color, color_back, width))
+
+  layout_data_summary = html.Div([
+    html.Div(cards, style={'textAlign': 'center'})
   ], style={
     'backgroundColor': 'white',
     'padding': '20px',
@@ -109,74 +132,109 @@ def data_summary(week_df):
   return layout_data_summary
 
 
-def create_map(week_df):
-  latest_week = week_df['Week'].max()
-  latest_data = week_df[week_df['Week'] == latest_week]
+# Level of detail of the bundled map geometry: "high", "medium" or "low"
+MAP_LOD = "medium"
 
-  fig_map = px.choropleth(
-    latest_data,
-    locations="Country",
-    locationmode="country names",
-    color="Cases",
-    color_continuous_scale="Viridis",
-    title=f"Weekly COVID-19 Cases - Mexico & Philippines"
-  )
+
+def map_title(week):
+  return f"Weekly COVID-19 Cases - week of {pd.Timestamp(week):%Y-%m-%d}"
+
+
+def create_map(ranges, week=None, lod=MAP_LOD):
+  # One row of the dense week x country matrix; the week slider only patches z (map_week_patch)
+  week = len(ranges) - 1 if week is None else week
+
+  geometry = geometry_url(lod)
+  if geometry is not None:
+    # Bundled simplified shapes, referenced by URL so the browser caches them (see geo_assets.py)
+    location_args = dict(geojson=geometry, featureidkey="id", locations=ranges.codes)
+  elif all(ranges.codes):
+    location_args = dict(locationmode="ISO-3", locations=ranges.codes)
+  else:
+    location_args = dict(locationmode="country names", locations=ranges.countries)
+
+  fig_map = go.Figure(go.Choropleth(
+    **location_args,
+    text=ranges.countries,
+    z=ranges.cases[week],
+    zmin=0,
+    zmax=ranges.peak_cases,        # fixed scale so weeks are comparable while scrubbing
+    colorscale="Viridis",
+    colorbar=dict(title="Cases"),
+    hovertemplate="<b>%{text}</b><br>Weekly Cases: %{z:,}<extra></extra>"
+  ))
   fig_map.update_geos(fitbounds="locations", visible=False)
-  fig_map.update_layout(margin=dict(l=0, r=0, t=40, b=0))
+  fig_map.update_layout(title=map_title(ranges.weeks[week]), margin=dict(l=0, r=0, t=40, b=0))
+  if not base_map_bundled():
+    # Offline the base map cannot be fetched and plotly.js leaves the map blank: say why
+    fig_map.add_annotation(text="Map geometry not bundled (run geo_assets.py); loading it from cdn.plot.ly",
+                           showarrow=False, xref="paper", yref="paper", x=0.5, y=0.02,
+                           font=dict(size=11, color="gray"))
 
   return fig_map
 
 
-def create_time_series_chart(week_diff_df):
-  fig_time_series = go.Figure()
+def map_week_patch(week, path=COVID_CSV):
+  # Restyle patch for the map: new z row and title, nothing else is sent
+  ranges = covid_data(path)[3]
+  week = min(max(int(week), 0), len(ranges) - 1)
+  patched = Patch()
+  patched['data'][0]['z'] = ranges.cases[week].tolist()
+  patched['layout']['title']['text'] = map_title(ranges.weeks[week])
+  return patched
 
-  fig_time_series.add_trace(go.Scatter(
-    x=week_diff_df.index,
-    y=week_diff_df['Mexico'],
-    line=dict(color='green', width=2),
-    marker=dict(color='green', size=6),
-    name="Mexico",
-    mode="lines+markers",
-    hovertemplate=(
-        '<b>Country: Mexico</b><br>' +
-        '<br>' +
-        'Week: %{x|%Y-%m-%d}<br>' +
-        'Weekly Cases: %{y:,}<br>' +
-        '<extra></extra>'
-    )
-  ))
 
-  fig_time_series.add_trace(go.Scatter(
-    x=week_diff_df.index,
-    y=week_diff_df['Philippines'],
-    line=dict(color='blue', width=2),
-    marker=dict(color='blue', size=6),
-    name="Philippines",
-    mode="lines+markers",
-    hovertemplate=(
-        '<b>Country: Philippines</b><br>' +
-        '<br>' +
-        'Week: %{x|%Y-%m-%d}<br>' +
-        'Weekly Cases: %{y:,}<br>' +
-        '<extra></extra>'
-    )
-  ))
+def create_time_series_chart(week_matrix_df, countries=None, x_range=None):
+  # One trace per country; with exactly two countries, their weekly difference as bars.
+  # Long series are decimated (min-max, peaks kept) to the visible x_range and drawn with WebGL.
+  if countries is None:
+    countries = list(week_matrix_df.columns)
+  week_matrix_df = week_matrix_df[countries]
 
-  # Difference bar (Mexico - Philippines)
-  fig_time_series.add_trace(go.Bar(
-    x=week_diff_df.index,
-    y=week_diff_df['Difference'],
-    name="Difference (MEX - PHL)",
-    opacity=0.4,
-    marker_color="gray",
-    hovertemplate=(
-        'Difference (MEX - PHL)<br>' +
-        '<br>' +
-        'Week: %{x|%Y-%m-%d}<br>' +
-        'Weekly Cases: %{y:,}<br>' +
-        '<extra></extra>'
-    )
-  ))
+  n_traces = len(countries) + (1 if len(countries) == 2 else 0)
+  Scatter = scatter_class(len(week_matrix_df) * n_traces)
+  mode = "lines+markers" if Scatter is go.Scatter else "lines"
+
+  fig_time_series = go.Figure()
+
+  for i, country in enumerate(countries):
+    color = country_color(country, i, TIME_SERIES_COLORS, LINE_PALETTE)
+    x, y = decimate_series(week_matrix_df.index, week_matrix_df[country].to_numpy(), x_range=x_range)
+    fig_time_series.add_trace(Scatter(
+      x=x,
+      y=y,
+      line=dict(color=color, width=2),
+      marker=dict(color=color, size=6),
+      name=country,
+      mode=mode,
+      hovertemplate=(
+          f'<b>Country: {country}</b><br>' +
+          '<br>' +
+          'Week: %{x|%Y-%m-%d}<br>' +
+          'Weekly Cases: %{y:,}<br>' +
+          '<extra></extra>'
+      )
+    ))
+
+  # Difference bar (first - second)
+  if len(countries) == 2:
+    difference = pairwise_differences(week_matrix_df)
+    label = f"Difference ({difference.columns[0]})"
+    x, y = decimate_series(difference.index, difference.iloc[:, 0].to_numpy(), x_range=x_range)
+    fig_time_series.add_trace(go.Bar(
+      x=x,
+      y=y,
+      name=label,
+      opacity=0.4,
+      marker_color="gray",
+      hovertemplate=(
+          f'{label}<br>' +
+          '<br>' +
+          'Week: %{x|%Y-%m-%d}<br>' +
+          'Weekly Cases: %{y:,}<br>' +
+          '<extra></extra>'
+      )
+    ))
 
   # TODO: To mark exactly dates maybe either xmas or vacations
   # fig_time_series.add_vline(
@@ -189,13 +247,15 @@ def create_time_series_chart(week_diff_df):
 
 
   fig_time_series.update_layout(
-    title="Weekly COVID-19 Cases Comparison: Mexico vs Philippines",
+    title=f"Weekly COVID-19 Cases Comparison: {' vs '.join(countries)}",
     xaxis_title="Week",
     yaxis_title="Weekly Cases",
     template="plotly_white",
     legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
     margin=dict(l=40, r=40, t=80, b=40)
   )
+  if x_range is not None:
+    fig_time_series.update_xaxes(range=list(x_range))
 
   return fig_time_series
 
@@ -224,45 +284,34 @@ def bibliography():
   return layout_bibliography
 
 
-def create_cumulative_chart(week_df):
-  fig = go.Figure()
+def create_cumulative_chart(ranges, countries=None, start=0, stop=None, x_range=None):
+  # Cumulative cases of every selected country over weeks [start, stop), from the prefix sums
+  if countries is None:
+    countries = ranges.countries
+  cumulative = ranges.cumulative(start, stop, countries)
+  Scatter = scatter_class(cumulative.size)
 
-  mexico_cumulative = week_df[week_df['Country'] == 'Mexico'].set_index('Week')['Cases'].cumsum()
-  philippines_cumulative = week_df[week_df['Country'] == 'Philippines'].set_index('Week')['Cases'].cumsum()
-
-  fig.add_trace(go.Scatter(
-    x=mexico_cumulative.index,
-    y=mexico_cumulative.values,
-    name="Mexico",
-    line=dict(color='#2E8B57', width=4),
-    fill='tozeroy',
-    fillcolor='rgba(46, 139, 87, 0.45)',
-    opacity=1,
-    hovertemplate=(
-        '<b>Country: Mexico</b><br>' +
-        '<br>' +
-        'Week: %{x|%Y-%m-%d}<br>' +
-        'Weekly Cases: %{y:,} M<br>' +
-        '<extra></extra>'
-    )
-  ))
+  fig = go.Figure()
 
-  fig.add_trace(go.Scatter(
-    x=philippines_cumulative.index,
-    y=philippines_cumulative.values,
-    name="Philippines",
-    line=dict(color='#1E90FF', width=4),
-    fill='tozeroy',
-    fillcolor='rgba(30, 144, 255, 0.45)',
-    opacity=1,
-    hovertemplate=(
-        '<b>Country: Philippines</b><br>' +
-        '<br>' +
-        'Week: %{x|%Y-%m-%d}<br>' +
-        'Weekly Cases: %{y:,} M<br>' +
-        '<extra></extra>'
-    )
-  ))
+  for i, country in enumerate(countries):
+    color = country_color(country, i, CUMULATIVE_COLORS, LINE_PALETTE)
+    x, y = decimate_series(cumulative.index, cumulative[country].to_numpy(), x_range=x_range)
+    fig.add_trace(Scatter(
+      x=x,
+      y=y,
+      name=country,
+      line=dict(color=color, width=4),
+      fill='tozeroy',
+      fillcolor=_hex_to_rgba(color, 0.45),
+      opacity=1,
+      hovertemplate=(
+          f'<b>Country: {country}</b><br>' +
+          '<br>' +
+          'Week: %{x|%Y-%m-%d}<br>' +
+          'Weekly Cases: %{y:,} M<br>' +
+          '<extra></extra>'
+      )
+    ))
 
 
   fig.update_layout(
@@ -271,28 +320,213 @@ def create_cumulative_chart(week_df):
     yaxis_title="Cumulative Cases",
     template="plotly_white"
   )
+  if x_range is not None:
+    fig.update_xaxes(range=list(x_range))
 
   return fig
 
 
 
 
-def weekly_cases_layout():
-  week_cases_df, week_difference_cases_df = load_covid_data()
+# -------------------------------
+# Lazy, memoized page construction
+# -------------------------------
+# Nothing is loaded until the page is requested. The CSV is re-read only when
+# its size/mtime change and its SHA-1 differs from the loaded copy, and every
+# component is memoized on a fingerprint of the exact frame it is built from,
+# so a data refresh rebuilds only the components whose input changed.
+
+_cache_lock = threading.RLock()
+_sources = {}      # path -> {'signature', 'sha1', 'data'}
+_components = {}   # component name -> (input fingerprint, built component)
+_layouts = {}      # path -> (component fingerprints, layout)
 
-  data_summ_layout    = data_summary(week_cases_df)                           # Data summary
-  fig_map             = create_map(week_cases_df)                             # Map cases
-  fig_time_series     = create_time_series_chart(week_difference_cases_df)    # Time series chart
-  fig_cumulative      = create_cumulative_chart(week_cases_df)              # Accumulative chart
+
+def source_signature(path):
+  st = os.stat(path)
+  return st.st_size, st.st_mtime_ns
+
+
+def file_sha1(path, block_size=1024 * 1024):
+  sha1 = hashlib.sha1()
+  with open(path, "rb") as f:
+    for block in iter(lambda: f.read(block_size), b""):
+      sha1.update(block)
+  return sha1.hexdigest()
+
+
+def frame_fingerprint(frame):
+  hashed = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+  return hashlib.sha1(hashed.tobytes() + repr(list(frame.columns)).encode("utf-8")).hexdigest()
+
+
+def covid_data(path=COVID_CSV):
+  """(weekly, pivot, cube, ranges) from load_covid_data, reloaded only when the CSV content changes."""
+  with _cache_lock:
+    signature = source_signature(path)
+    state = _sources.get(path)
+    if state is not None and state['signature'] == signature:
+      return state['data']
+
+    sha1 = file_sha1(path)
+    if state is None or state['sha1'] != sha1:
+      state = {'sha1': sha1, 'data': load_covid_data(path)}
+    state['signature'] = signature
+    _sources[path] = state
+    return state['data']
+
+
+def memo_component(name, build, key_frame):
+  # Returns (fingerprint, component), calling build() only when key_frame changed
+  fingerprint = frame_fingerprint(key_frame)
+  with _cache_lock:
+    cached = _components.get(name)
+    if cached is None or cached[0] != fingerprint:
+      _components[name] = (fingerprint, build())
+    return _components[name]
+
+
+def invalidate_covid_cache(path=None):
+  # Invalidation hook: forget the loaded data (one path or all) and the built components
+  with _cache_lock:
+    if path is None:
+      _sources.clear()
+      _layouts.clear()
+    else:
+      _sources.pop(path, None)
+      _layouts.pop(path, None)
+    _components.clear()
+
+
+def weekly_cases_layout(path=COVID_CSV):
+  week_cases_df, week_matrix_df, summary, ranges = covid_data(path)
+
+  # Initial selection; the country picker and week range re-render these components (see app.py)
+  countries = default_countries(week_cases_df)
+  summary_df = summary.frame(countries)
+  selected_matrix = week_matrix_df[countries]
+
+  summary_key, data_summ_layout = memo_component('data_summary', lambda: summary_cards(summary_df), summary_df)   # Data summary
+  map_key, fig_map              = memo_component('map', lambda: create_map(ranges), week_matrix_df)              # Map cases
+  series_key, fig_time_series   = memo_component('time_series', lambda: create_time_series_chart(selected_matrix),
+                                                 selected_matrix)                                                # Time series chart
+  cumulative_key, fig_cumulative = memo_component('cumulative', lambda: create_cumulative_chart(ranges, countries),
+                                                  selected_matrix)                                               # Accumulative chart
+
+  component_keys = (summary_key, map_key, series_key, cumulative_key)
+  with _cache_lock:
+    cached = _layouts.get(path)
+    if cached is not None and cached[0] == component_keys:
+      return cached[1]
+
+  layout = _build_weekly_cases_layout(available_countries(week_cases_df), countries, ranges.weeks,
+                                      data_summ_layout, fig_map, fig_time_series, fig_cumulative)
+  with _cache_lock:
+    _layouts[path] = (component_keys, layout)
+  return layout
+
+
+def compare_layout(countries, week_range=None, path=COVID_CSV):
+  """
+  Components that depend on the country selection and the week range slider
+  ([first, last] week positions, inclusive): (summary, time series, cumulative).
+  Range statistics and cumulative curves come from the prefix sums, O(1) per country.
+  """
+  week_cases_df, week_matrix_df, summary, ranges = covid_data(path)
+  countries, start, stop = _selection(week_cases_df, ranges, countries, week_range)
+
+  if (start, stop) == (0, len(ranges)):
+    summary_layout = data_summary(summary, countries)
+  else:
+    summary_layout = summary_cards(ranges.stats(start, stop, countries))
+
+  fig_time_series = create_time_series_chart(week_matrix_df, countries,
+                                             x_range=(ranges.weeks[start], ranges.weeks[stop - 1]))
+
+  return summary_layout, fig_time_series, create_cumulative_chart(ranges, countries, start, stop)
+
+
+def _selection(week_cases_df, ranges, countries, week_range):
+  # Valid countries (default selection if none) and half-open week positions of the slider range
+  countries = [country for country in (countries or []) if country in ranges.countries]
+  if not countries:
+    countries = default_countries(week_cases_df)
+  start, stop = 0, len(ranges)
+  if week_range:
+    start, stop = max(int(week_range[0]), 0), min(int(week_range[1]) + 1, len(ranges))
+  return countries, start, stop
+
+
+def refine_time_series(relayout_data, countries, week_range, path=COVID_CSV):
+  # Zoom/pan on the time series: re-decimate the visible range only (no-op for short series)
+  x_range = zoom_range(relayout_data)
+  week_cases_df, week_matrix_df, summary, ranges = covid_data(path)
+  if x_range is False or len(ranges) <= MAX_POINTS:
+    return no_update
+  countries, start, stop = _selection(week_cases_df, ranges, countries, week_range)
+  if x_range is None:
+    x_range = (ranges.weeks[start], ranges.weeks[stop - 1])
+  return create_time_series_chart(week_matrix_df, countries, x_range=x_range)
+
+
+def refine_cumulative(relayout_data, countries, week_range, path=COVID_CSV):
+  # Same as refine_time_series for the cumulative chart
+  x_range = zoom_range(relayout_data)
+  week_cases_df, week_matrix_df, summary, ranges = covid_data(path)
+  if x_range is False or len(ranges) <= MAX_POINTS:
+    return no_update
+  countries, start, stop = _selection(week_cases_df, ranges, countries, week_range)
+  return create_cumulative_chart(ranges, countries, start, stop, x_range=x_range)
+
+
+def year_marks(weeks):
+  # Slider marks over week positions, one per year
+  years = weeks.year
+  return {int(i): str(years[i]) for i in np.flatnonzero(np.r_[True, years[1:] != years[:-1]])}
+
+
+def week_range_slider(weeks):
+  return dcc.RangeSlider(
+    id='week-range',
+    min=0,
+    max=len(weeks) - 1,
+    step=1,
+    value=[0, len(weeks) - 1],
+    marks=year_marks(weeks),
+    allowCross=False,
+    tooltip={'placement': 'bottom'}
+  )
+
+
+def _build_weekly_cases_layout(all_countries, countries, weeks, data_summ_layout, fig_map, fig_time_series, fig_cumulative):
   bibliography_layout = bibliography()                                        # Bibliography
 
   background_color_card = '#f8f9fa'
 
   layout = html.Div([
+    # Country picker Section
+    html.Div([
+      html.H3("🌎 Countries", style={'textAlign': 'center', 'color': '#34495e', 'marginBottom': '20px'}),
+      dcc.Dropdown(
+        id='country-picker',
+        options=[{'label': country, 'value': country} for country in all_countries],
+        value=countries,
+        multi=True,
+        placeholder="Select countries to compare"
+      ),
+      html.P("Week range", style={'fontWeight': 'bold', 'color': '#34495e', 'marginTop': '20px'}),
+      week_range_slider(weeks)
+    ], style={
+      'width': '100%',
+      'padding': '20px',
+      'backgroundColor': background_color_card,
+      'marginBottom': '30px'
+    }),
+
     # Data Summary Section
     html.Div([
       html.H3("📊 Data Summary", style={'textAlign': 'center', 'color': '#34495e', 'marginBottom': '20px'}),
-      data_summ_layout
+      html.Div(data_summ_layout, id='data-summary-container')
     ], style={
       'width': '100%',
       'padding': '20px',
@@ -303,7 +537,16 @@ def weekly_cases_layout():
     # Map Section
     html.Div([
       html.H3("🗺️ Cases Map", style={'textAlign': 'center', 'color': '#34495e', 'marginBottom': '20px'}),
-      dcc.Graph(figure=fig_map)
+      dcc.Graph(id='cases-map', figure=fig_map, config=map_graph_config()),
+      dcc.Slider(
+        id='map-week',
+        min=0,
+        max=len(weeks) - 1,
+        step=1,
+        value=len(weeks) - 1,
+        marks=year_marks(weeks),
+        updatemode='drag'
+      )
     ], style={
       'width': '100%',
       'height': '50vh',
@@ -315,7 +558,7 @@ def weekly_cases_layout():
     # Time Series Section
     html.Div([
       html.H3("📈 Time Series", style={'textAlign': 'center', 'color': '#34495e', 'marginBottom': '20px'}),
-      dcc.Graph(figure=fig_time_series)
+      dcc.Graph(id='time-series-graph', figure=fig_time_series)
     ], style={
       'width': '100%',
       'height': '50vh',
@@ -327,7 +570,7 @@ def weekly_cases_layout():
     # Accumulative Section
     html.Div([
       html.H3("📈 Cumulative cases over time", style={'textAlign': 'center', 'color': '#34495e', 'marginBottom': '20px'}),
-      dcc.Graph(figure=fig_cumulative)
+      dcc.Graph(id='cumulative-graph', figure=fig_cumulative)
     ], style={
       'width': '100%',
       'height': '50vh',
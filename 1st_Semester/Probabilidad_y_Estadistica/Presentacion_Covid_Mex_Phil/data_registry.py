@@ -0,0 +1,192 @@
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+try:
+  import pyarrow
+except ImportError:
+  pyarrow = None
+
+
+# -------------------------------
+# Dataset registry
+# -------------------------------
+# One place that knows where every dataset of the presentation lives. Named
+# datasets resolve to a single canonical CSV next to this file (no per-folder
+# copies, no absolute paths). Each one is parsed once into a columnar copy in
+# .dataset_cache/ (Parquet when pyarrow is available, pickle otherwise) that all
+# processes reuse, and kept in an in-process LRU. Both are invalidated when the
+# CSV's size or mtime change.
+#
+# When xlsx_to_csv.py wrote a typed copy next to a CSV (<name>.parquet or
+# <name>.pkl, with dates, categories and float32 counts already applied) and it
+# is not older than the CSV, that copy is read instead: no date parsing and no
+# dtype inference.
+#
+#   from data_registry import load_dataset
+#   df = load_dataset("casos_semanales_mexico")
+#
+# Each call returns a shallow copy: adding or replacing columns is safe, but
+# values must not be modified in place (they are shared with the cache).
+
+ROOT = Path(__file__).resolve().parent
+CACHE_DIR = ROOT / ".dataset_cache"
+MAX_ENTRIES = 8
+TYPED_SUFFIXES = (".parquet", ".pkl")
+
+# name -> (file relative to ROOT, date columns)
+DATASETS = {
+  'casos_semanales':           ("casos_semanales__mexico_filipinas_2020-2023.csv", ["Date"]),
+  'casos_semanales_mexico':    ("casos_semanales_mexico_2020-2023.csv", ["Day"]),
+  'casos_semanales_filipinas': ("casos_semanales_filipinas_2020-2023.csv", ["Day"]),
+  'exceso_muertes_mexico':     ("datos_mexico_2020-2023.csv", ["Day"]),
+  'exceso_muertes_filipinas':  ("datos_filipinas_2020-2023.csv", ["Day"]),
+}
+
+_lock = threading.RLock()
+_frames = OrderedDict()   # key -> (signature, frame)
+
+
+def dataset_path(name):
+  """Absolute path of a registered dataset, or of a CSV path given directly."""
+  if name in DATASETS:
+    return ROOT / DATASETS[name][0]
+  return Path(name).resolve()
+
+
+def _date_columns(path):
+  # Registered files get their date columns parsed whether loaded by name or by path
+  for filename, dates in DATASETS.values():
+    if path == ROOT / filename:
+      return dates
+  return []
+
+
+def source_signature(path):
+  st = os.stat(path)
+  return [st.st_size, st.st_mtime_ns]
+
+
+def typed_copy(path):
+  """Typed copy written by xlsx_to_csv.py next to the CSV, or None if missing or stale."""
+  for suffix in TYPED_SUFFIXES:
+    candidate = path.with_suffix(suffix)
+    if suffix == ".parquet" and pyarrow is None:
+      continue
+    if candidate.exists() and (not path.exists() or os.stat(candidate).st_mtime_ns >= os.stat(path).st_mtime_ns):
+      return candidate
+  return None
+
+
+def _read_typed(path):
+  if path.suffix == ".parquet":
+    return pd.read_parquet(path)
+  return pd.read_pickle(path)
+
+
+def _cache_key(path):
+  # Registered files keep their own name; other CSVs are keyed by their full path
+  relative = os.path.relpath(path, ROOT)
+  return relative.replace(os.sep, "__").replace("..", "_up").replace(":", "")
+
+
+def _cache_paths(key):
+  return CACHE_DIR / f"{key}.parquet", CACHE_DIR / f"{key}.pkl", CACHE_DIR / f"{key}.json"
+
+
+def _read_columnar(key, signature):
+  parquet_path, pickle_path, meta_path = _cache_paths(key)
+  try:
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+  except (FileNotFoundError, ValueError):
+    return None
+  if meta.get('signature') != signature:
+    return None
+  if meta.get('format') == "parquet" and pyarrow is not None and parquet_path.exists():
+    return pd.read_parquet(parquet_path)
+  if meta.get('format') == "pickle" and pickle_path.exists():
+    with open(pickle_path, "rb") as f:
+      return pickle.load(f)
+  return None
+
+
+def _write_atomic(path, write):
+  # Write then rename, through a temp file unique per call: threads and worker
+  # processes loading the same uncached dataset write the same target
+  with tempfile.NamedTemporaryFile(dir=CACHE_DIR, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+    tmp_path = f.name
+    try:
+      write(f)
+    except BaseException:
+      f.close()
+      os.remove(tmp_path)
+      raise
+  try:
+    os.replace(tmp_path, path)
+  except OSError:
+    # Lost the race to an equivalent copy
+    if os.path.exists(tmp_path):
+      os.remove(tmp_path)
+
+
+def _write_columnar(key, signature, df):
+  CACHE_DIR.mkdir(parents=True, exist_ok=True)
+  parquet_path, pickle_path, meta_path = _cache_paths(key)
+  fmt = "pickle"
+  if pyarrow is not None:
+    try:
+      _write_atomic(parquet_path, lambda f: df.to_parquet(f, index=False))
+      fmt = "parquet"
+    except (ValueError, TypeError, pyarrow.ArrowException):
+      pass
+  if fmt == "pickle":
+    _write_atomic(pickle_path, lambda f: pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL))
+  # Metadata last: readers only trust a copy whose signature matches the CSV
+  meta = json.dumps({'signature': signature, 'format': fmt}).encode("utf-8")
+  _write_atomic(meta_path, lambda f: f.write(meta))
+
+
+def load_dataset(name):
+  """DataFrame of a registered dataset (or CSV path), parsed at most once per change."""
+  path = dataset_path(name)
+  typed = typed_copy(path)
+  signature = source_signature(typed or path)
+  key = _cache_key(path)
+
+  with _lock:
+    cached = _frames.get(key)
+    if cached is not None and cached[0] == signature:
+      _frames.move_to_end(key)
+      return cached[1].copy(deep=False)
+
+    df = _read_typed(typed) if typed is not None else _read_columnar(key, signature)
+    if df is None:
+      dates = _date_columns(path)
+      df = pd.read_csv(path, parse_dates=dates or False)
+      _write_columnar(key, signature, df)
+
+    _frames[key] = (signature, df)
+    _frames.move_to_end(key)
+    while len(_frames) > MAX_ENTRIES:
+      _frames.popitem(last=False)
+    return df.copy(deep=False)
+
+
+def preload(names=None):
+  # Warm the cache (e.g. before forking server workers)
+  for name in (names or DATASETS):
+    load_dataset(name)
+
+
+def clear_cache(memory_only=False):
+  with _lock:
+    _frames.clear()
+  if not memory_only and CACHE_DIR.exists():
+    for path in CACHE_DIR.iterdir():
+      path.unlink()
@@ -1,45 +1,436 @@
-import pandas as pd
-import os
+import argparse
 import glob
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+try:
+  from python_calamine import CalamineWorkbook
+except ImportError:
+  CalamineWorkbook = None
+
+try:
+  import pyarrow
+  import pyarrow.parquet as pq
+except ImportError:
+  pyarrow = None
+
+
+# -------------------------------
+# XLSX -> CSV (and typed) converter
+# -------------------------------
+# Workbooks are converted in parallel (one process per workbook). Rows are
+# streamed from a read-only reader (calamine when installed, openpyxl otherwise)
+# and spooled to a temporary file in chunks, so a sheet is never fully
+# materialized. pd.read_excel infers one dtype per column over the whole sheet
+# (a single blank or decimal turns every value of an integer column into a
+# float), so the chunks are written to CSV in a second pass, cast to the
+# whole-column dtypes collected in the first one; the CSV is then the same as
+# read_excel(...).to_csv(index=False). Every sheet is
+# exported: the first one as <workbook>.csv, the others as
+# <workbook>__<sheet>.csv. A manifest in the output folder records the SHA-1 of
+# every converted workbook; unchanged workbooks whose outputs still exist are
+# skipped on the next run.
+#
+# With typed=True the declared SCHEMA is applied at conversion time and a typed
+# copy is written next to each CSV (<name>.parquet with pyarrow, <name>.pkl
+# otherwise). data_registry.load_dataset reads that copy instead of the CSV, so
+# loaders get datetime, categorical and float32 columns without parsing. Column
+# types are fixed on the first chunk and Parquet is written one row group per
+# chunk; only the pickle fallback holds the whole sheet.
+
+MANIFEST_NAME = "xlsx_manifest.json"
+CHUNK_ROWS = 50_000
+
+# Columns by role; any other column with only numeric values is stored as counts
+SCHEMA = {
+  'dates': ("Day", "Date"),
+  'categories': ("Entity", "Code", "Country"),
+  'counts': "float32",
+}
+
+
+def file_sha1(path, block_size=1024 * 1024):
+  sha1 = hashlib.sha1()
+  with open(path, "rb") as f:
+    for block in iter(lambda: f.read(block_size), b""):
+      sha1.update(block)
+  return sha1.hexdigest()
+
+
+# ---- streaming readers ----
+def _calamine_sheets(xlsx_file):
+  workbook = CalamineWorkbook.from_path(xlsx_file)
+  for name in workbook.sheet_names:
+    # calamine reports empty cells as "" and every number as a float; integral
+    # ones become ints, as pandas' calamine reader does
+    rows = workbook.get_sheet_by_name(name).iter_rows()
+    yield name, ([_calamine_value(value) for value in row] for row in rows)
+
+
+def _calamine_value(value):
+  if value == "":
+    return None
+  if isinstance(value, float) and value.is_integer():
+    return int(value)
+  return value
+
+
+def _openpyxl_sheets(xlsx_file):
+  from openpyxl import load_workbook
+  workbook = load_workbook(xlsx_file, read_only=True, data_only=True)
+  try:
+    for sheet in workbook.worksheets:
+      yield sheet.title, (list(row) for row in sheet.iter_rows(values_only=True))
+  finally:
+    workbook.close()
+
+
+def iter_sheets(xlsx_file):
+  """(sheet name, rows) per sheet, rows as lists of Python values; consume each before the next."""
+  if CalamineWorkbook is not None:
+    return _calamine_sheets(xlsx_file)
+  return _openpyxl_sheets(xlsx_file)
+
+
+def iter_chunks(rows, chunk_rows=CHUNK_ROWS):
+  for columns, chunk in iter_row_chunks(rows, chunk_rows):
+    yield pd.DataFrame(chunk, columns=columns)
+
+
+def iter_row_chunks(rows, chunk_rows=CHUNK_ROWS):
+  # (columns, rows) per chunk. First row is the header (as pd.read_excel); blank rows are skipped
+  header = next(rows, None)
+  if header is None:
+    return
+  columns = [f"Unnamed: {i}" if name is None else str(name) for i, name in enumerate(header)]
+
+  chunk = []
+  emitted = False
+  for row in rows:
+    if all(value is None for value in row):
+      continue
+    chunk.append(row[:len(columns)] + [None] * (len(columns) - len(row)))
+    if len(chunk) == chunk_rows:
+      yield columns, chunk
+      chunk = []
+      emitted = True
+  # A sheet with only a header still produces a (header-only) CSV
+  if chunk or not emitted:
+    yield columns, chunk
+
+
+# ---- CSV dtypes ----
+INFERRED_KINDS = {'integer': "i", 'floating': "f", 'mixed-integer-float': "f", 'boolean': "b",
+                  'datetime': "M", 'datetime64': "M"}
+
+
+class ColumnKinds:
+  """
+  Whole-sheet dtype of every column, collected chunk by chunk with the same
+  outcome as read_excel's inference: ints or booleans with any blank, and ints
+  mixed with floats, become floats; datetimes stay datetimes; anything else
+  mixed is object.
+  """
+
+  def __init__(self, n_columns):
+    self.seen = [set() for _ in range(n_columns)]
+    self.blank = [False] * n_columns
+    self.dates_only = [True] * n_columns
+    self.whole_seconds = [True] * n_columns
+
+  def update(self, chunk):
+    for i, (_, values) in enumerate(chunk.items()):
+      present = values.dropna()
+      self.blank[i] = self.blank[i] or len(present) < len(values)
+      if not len(present):
+        continue
+      kind = values.dtype.kind
+      if kind == "O":
+        # Blanks keep booleans (and mixed chunks) as object; look at the values
+        kind = INFERRED_KINDS.get(pd.api.types.infer_dtype(present, skipna=True), "O")
+      self.seen[i].add(kind)
+      if kind == "M":
+        self.dates_only[i] = self.dates_only[i] and bool((present == present.dt.normalize()).all())
+        self.whole_seconds[i] = self.whole_seconds[i] and bool((present == present.dt.floor("s")).all())
+
+  def kind(self, i):
+    seen = self.seen[i]
+    if seen in ({"i"}, {"b"}):
+      # Like read_excel, a blank turns ints and booleans into floats
+      return "f" if self.blank[i] else next(iter(seen))
+    if seen and seen <= {"i", "f"}:
+      return "f"
+    if seen == {"M"}:
+      return "M"
+    return "O"
+
+  def cast(self, chunk):
+    # chunk built with dtype=object from the spooled rows
+    columns = {}
+    for i, (_, values) in enumerate(chunk.items()):
+      kind = self.kind(i)
+      if kind == "i":
+        values = values.astype("int64")
+      elif kind == "f":
+        values = values.astype("float64")
+      elif kind == "b":
+        values = values.astype(bool)
+      elif kind == "M":
+        values = pd.to_datetime(values)
+        # to_csv drops the time of a chunk that is all midnights; decide for the whole column
+        if self.dates_only[i]:
+          values = values.dt.strftime("%Y-%m-%d")
+        elif self.whole_seconds[i]:
+          values = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+      columns[i] = values
+    df = pd.DataFrame(columns)
+    df.columns = chunk.columns
+    return df
 
 
-def convert_xlsx_to_csv_folder(folder_path, output_folder=None):
+def spool_chunks(rows, spool):
+  """Pickle the raw rows of every chunk into spool; returns the columns and ColumnKinds (None if no header)."""
+  columns = kinds = None
+  for columns, chunk in iter_row_chunks(rows):
+    if kinds is None:
+      kinds = ColumnKinds(len(columns))
+    kinds.update(pd.DataFrame(chunk, columns=columns))
+    pickle.dump(chunk, spool, protocol=pickle.HIGHEST_PROTOCOL)
+  spool.seek(0)
+  return columns, kinds
+
+
+def unspool_chunks(spool, columns, kinds):
+  while True:
+    try:
+      chunk = pickle.load(spool)
+    except EOFError:
+      return
+    yield kinds.cast(pd.DataFrame(chunk, columns=columns, dtype=object))
+
+
+# ---- schema ----
+def sheet_dtypes(chunk, schema=SCHEMA):
+  """
+  dtype per column of a sheet, decided on its first chunk so every chunk gets
+  the same ones: dates, categories, counts for columns whose values are all
+  numeric, text otherwise. Later values that do not fit become NaN/NaT (the
+  CSV keeps them as read).
+  """
+  dtypes = {}
+  for column in chunk.columns:
+    if column in schema['dates']:
+      dtypes[column] = "datetime64[ns]"
+    elif column in schema['categories']:
+      dtypes[column] = "category"
+    else:
+      numeric = pd.to_numeric(chunk[column], errors="coerce")
+      dtypes[column] = schema['counts'] if numeric.notna().sum() == chunk[column].notna().sum() else "object"
+  return dtypes
+
+
+def apply_schema(df, dtypes):
+  """Dates parsed, counts cast, text as str; categories are set by finish_schema or the Arrow schema."""
+  for column, dtype in dtypes.items():
+    if dtype == "datetime64[ns]":
+      df[column] = pd.to_datetime(df[column], errors="coerce")
+    elif dtype in ("category", "object"):
+      df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+    else:
+      df[column] = pd.to_numeric(df[column], errors="coerce").astype(dtype)
+  return df
+
+
+def finish_schema(df, dtypes):
+  for column, dtype in dtypes.items():
+    if dtype == "category":
+      df[column] = df[column].astype("category")
+  return df
+
+
+def arrow_schema(dtypes):
+  # Fixed Parquet schema for every row group of a sheet
+  types = {
+    "datetime64[ns]": pyarrow.timestamp("ns"),
+    "category": pyarrow.dictionary(pyarrow.int32(), pyarrow.string()),
+    "object": pyarrow.string(),
+  }
+  return pyarrow.schema([(column, types.get(dtype) or pyarrow.from_numpy_dtype(dtype))
+                         for column, dtype in dtypes.items()])
+
+
+def typed_path(output_folder, name):
+  # Parquet when pyarrow is available; pickle keeps the same dtypes otherwise
+  return os.path.join(output_folder, f"{name}.parquet" if pyarrow is not None else f"{name}.pkl")
+
+
+def sheet_output_name(base_name, sheet, index):
+  if index == 0:
+    return base_name
+  return f"{base_name}__{re.sub(r'[^0-9A-Za-z_-]+', '_', sheet).strip('_')}"
+
+
+# ---- conversion ----
+def convert_sheet(rows, output_folder, name, typed=False, schema=SCHEMA):
+  # Returns the files written for one sheet (none if it is empty)
+  csv_file = os.path.join(output_folder, f"{name}.csv")
+  tmp_file = f"{csv_file}.{os.getpid()}.tmp"
+  typed_file = typed_path(output_folder, name)
+  tmp_typed = f"{typed_file}.{os.getpid()}.tmp"
+
+  wrote_header = False
+  dtypes = None
+  writer = None
+  parts = []
+  spool = tempfile.TemporaryFile()
+  try:
+    columns, kinds = spool_chunks(rows, spool)
+    if kinds is None:
+      return []
+    for chunk in unspool_chunks(spool, columns, kinds):
+      chunk.to_csv(tmp_file, index=False, mode="a" if wrote_header else "w", header=not wrote_header)
+      wrote_header = True
+      if not typed:
+        continue
+      dtypes = dtypes or sheet_dtypes(chunk, schema)
+      chunk = apply_schema(chunk, dtypes)
+      if pyarrow is None:
+        parts.append(chunk)
+        continue
+      table = pyarrow.Table.from_pandas(chunk, schema=arrow_schema(dtypes), preserve_index=False)
+      if writer is None:
+        writer = pq.ParquetWriter(tmp_typed, table.schema)
+      writer.write_table(table)
+    if not wrote_header:
+      return []
+    os.replace(tmp_file, csv_file)
+
+    outputs = [os.path.basename(csv_file)]
+    if typed:
+      # Finished after the CSV: the registry only trusts a typed copy not older than its CSV
+      if writer is not None:
+        writer.close()
+        writer = None
+      else:
+        df = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        finish_schema(df, dtypes).to_pickle(tmp_typed)
+      os.replace(tmp_typed, typed_file)
+      outputs.append(os.path.basename(typed_file))
+    return outputs
+  finally:
+    spool.close()
+    if writer is not None:
+      writer.close()
+    for path in (tmp_file, tmp_typed):
+      if os.path.exists(path):
+        os.remove(path)
+
+
+def convert_workbook(xlsx_file, output_folder, typed=False, schema=SCHEMA):
+  """Convert every sheet of one workbook; returns the names of the files written."""
+  base_name = os.path.splitext(os.path.basename(xlsx_file))[0]
+  outputs = []
+  for index, (sheet, rows) in enumerate(iter_sheets(xlsx_file)):
+    outputs += convert_sheet(rows, output_folder, sheet_output_name(base_name, sheet, index), typed, schema)
+  if not outputs:
+    raise ValueError("every sheet is empty")
+  return outputs
+
+
+def load_manifest(output_folder):
+  try:
+    with open(os.path.join(output_folder, MANIFEST_NAME), "r", encoding="utf-8") as f:
+      return json.load(f)
+  except (FileNotFoundError, ValueError):
+    return {}
+
+
+def save_manifest(output_folder, manifest):
+  path = os.path.join(output_folder, MANIFEST_NAME)
+  with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+    json.dump(manifest, f, indent=2, sort_keys=True)
+  os.replace(f"{path}.tmp", path)
+
+
+def _up_to_date(entry, sha1, output_folder, typed):
+  if entry is None or entry.get('sha1') != sha1:
+    return False
+  outputs = entry.get('outputs', [])
+  if typed and all(name.endswith(".csv") for name in outputs):
+    return False
+  return all(os.path.exists(os.path.join(output_folder, name)) for name in outputs)
+
+
+def convert_xlsx_to_csv_folder(folder_path, output_folder=None, typed=False, workers=None, force=False):
   if output_folder is None:
     output_folder = folder_path
 
   os.makedirs(output_folder, exist_ok=True)
 
-  xlsx_files = glob.glob(os.path.join(folder_path, "*.xlsx"))
+  xlsx_files = sorted(glob.glob(os.path.join(folder_path, "*.xlsx")))
 
   if not xlsx_files:
     print(f"No XLSX files found in '{folder_path}'")
     return
 
-  print(f"Found {len(xlsx_files)} XLSX file(s) to convert...")
+  manifest = load_manifest(output_folder)
+  pending = {}
+  for xlsx_file in xlsx_files:
+    sha1 = file_sha1(xlsx_file)
+    name = os.path.basename(xlsx_file)
+    if force or not _up_to_date(manifest.get(name), sha1, output_folder, typed):
+      pending[xlsx_file] = sha1
+
+  skipped_count = len(xlsx_files) - len(pending)
+  print(f"Found {len(xlsx_files)} XLSX file(s): {len(pending)} to convert, {skipped_count} unchanged")
 
   success_count = 0
   error_count = 0
 
-  for xlsx_file in xlsx_files:
-    try:
-      base_name = os.path.splitext(os.path.basename(xlsx_file))[0]
-      csv_file = os.path.join(output_folder, f"{base_name}.csv")
-      df = pd.read_excel(xlsx_file)
-
-      df.to_csv(csv_file, index=False)
-
-      print(f"Converted: {os.path.basename(xlsx_file)} -> {os.path.basename(csv_file)}")
-      success_count += 1
+  def record(xlsx_file, outputs):
+    manifest[os.path.basename(xlsx_file)] = {'sha1': pending[xlsx_file], 'outputs': outputs}
+    print(f"Converted: {os.path.basename(xlsx_file)} -> {', '.join(outputs)}")
 
-    except Exception as e:
-      print(f"Failed to convert {os.path.basename(xlsx_file)}: {e}")
-      error_count += 1
+  workers = min(workers or os.cpu_count() or 1, len(pending))
+  if workers <= 1:
+    for xlsx_file in pending:
+      try:
+        record(xlsx_file, convert_workbook(xlsx_file, output_folder, typed))
+        success_count += 1
+      except Exception as e:
+        print(f"Failed to convert {os.path.basename(xlsx_file)}: {e}")
+        error_count += 1
+  else:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      futures = {pool.submit(convert_workbook, xlsx_file, output_folder, typed): xlsx_file
+                 for xlsx_file in pending}
+      for future in as_completed(futures):
+        xlsx_file = futures[future]
+        try:
+          record(xlsx_file, future.result())
+          success_count += 1
+        except Exception as e:
+          print(f"Failed to convert {os.path.basename(xlsx_file)}: {e}")
+          error_count += 1
 
-  print(f"\nConversion completed: {success_count} successful, {error_count} failed")
+  save_manifest(output_folder, manifest)
+  print(f"\nConversion completed: {success_count} successful, {error_count} failed, {skipped_count} skipped")
 
 
 if __name__ == "__main__":
-  folder_path = r"./"
-  output_folder = r"./"
+  parser = argparse.ArgumentParser(description="Convert every sheet of every XLSX in a folder to CSV")
+  parser.add_argument("folder_path", nargs="?", default=r"./")
+  parser.add_argument("output_folder", nargs="?", default=r"./")
+  parser.add_argument("--typed", action="store_true", help="also write a typed copy (Parquet or pickle) with SCHEMA applied")
+  parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+  parser.add_argument("--force", action="store_true", help="convert even unchanged workbooks")
+  args = parser.parse_args()
 
-  convert_xlsx_to_csv_folder(folder_path, output_folder)
\ No newline at end of file
+  convert_xlsx_to_csv_folder(args.folder_path, args.output_folder, args.typed, args.workers, args.force)
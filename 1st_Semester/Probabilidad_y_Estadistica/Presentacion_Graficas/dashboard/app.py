@@ -5,7 +5,6 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import base64
 import os
 import io
 import csv
@@ -14,45 +13,84 @@ from bar_charts import create_bar_charts
 from line_charts import create_line_charts
 from boxplot_charts import create_box_plots_figure
 from bar_with_lines_chart import  create_bar_with_lines_chart
+from lidar_store import open_store
+from upload_store import UPLOAD_MISSING, datasets, store_upload, get_upload, query_page
+from figure_cache import FigureCache
+from frames import FRAME_WIDTHS, bucket_rows
+from functools import lru_cache, partial
 from pathlib import Path
+from urllib.parse import parse_qs, urlencode
+from flask import abort, send_from_directory
 
 # CLASS_ACTIVITY = "/class-activityy"
 CLASS_ACTIVITY = "/class"
 
+# Frame bucket used for the "timestamp" column: "1s", "100ms" or "scan"
+FRAME_WIDTH = "1s"
+
+# Resolved from this file, so the app runs from any working directory
+BASE_DIR = Path(__file__).resolve().parent
+DATA_PATH = str(BASE_DIR / "algo_one_rec.csv")
+FIGURE_CACHE_DIR = str(BASE_DIR / ".figure_cache")
+
+# Rows per page of the uploaded CSV table and default rolling window of its chart
+UPLOAD_PAGE_SIZE = 10
+UPLOAD_WINDOW = 3
+
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
 app.title = "LiDAR Data Visualization Dashboard"
+# WSGI entry point for serve.py / gunicorn
+server = app.server
 
-
-def encode_image(image_path):
-  with open(image_path, "rb") as image_file:
-    encoded = base64.b64encode(image_file.read()).decode()
-  return f"data:image/png;base64,{encoded}"
+figure_cache = FigureCache(FIGURE_CACHE_DIR)
 
 
 # -------------------------------
 # Load data
 # -------------------------------
-def load_data(path):
-  list_data = [
-    'ecal_timestamp', 'object_id', 'confidence', 'nb_point',
-    'algo_center_x', 'algo_center_y', 'algo_center_z'
-  ]
-  df = pd.read_csv(path)[list_data].copy()
-
-  df['datetime'] = pd.to_datetime(df['ecal_timestamp'], unit='us', utc=True)
-
-  df['time_in_seconds'] = (df['datetime'].dt.hour * 3600 +
-                           df['datetime'].dt.minute * 60 +
-                           df['datetime'].dt.second +
-                           df['datetime'].dt.microsecond / 1_000_000)
-
-  df['timestamp'] = df['time_in_seconds'].astype(int)
+def _wall_clock_to_us(value, origin):
+  # "HH:MM:SS[.ffffff]" is read on the recording's (UTC) day, anything else as a full date
+  if value is None:
+    return None
+  if isinstance(value, str) and "-" not in value:
+    return origin + pd.Timedelta(value).value // 1_000
+  ts = pd.Timestamp(value)
+  if ts.tzinfo is None:
+    ts = ts.tz_localize("UTC")
+  return ts.value // 1_000
+
+
+def _us_to_wall_clock(us, origin):
+  # Inverse of _wall_clock_to_us for links: "HH:MM:SS[.ffffff]" on the recording's day
+  seconds, micros = divmod(int(us - origin), 1_000_000)
+  minutes, seconds = divmod(seconds, 60)
+  hours, minutes = divmod(minutes, 60)
+  text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+  return f"{text}.{micros:06d}" if micros else text
+
+
+def load_data(path, first_frame=None, n_frames=60, frame_width=FRAME_WIDTH,
+              start_time=None, end_time=None, object_id=None):
+  """
+  Load one window of the recording: n_frames frames from first_frame (default:
+  the start of the recording), or the wall-clock range [start_time, end_time)
+  when either bound is given, optionally restricted to a single object.
+  Lookups go through the store's frame/object index.
+  """
+  store = open_store(path)
+
+  if start_time is not None or end_time is not None:
+    row_start, row_stop = store.time_rows(_wall_clock_to_us(start_time, store.origin),
+                                          _wall_clock_to_us(end_time, store.origin))
+  else:
+    row_start, row_stop = store.frame_rows(first_frame, n_frames, frame_width)
 
-  df = df.drop(['time_in_seconds', 'datetime', 'ecal_timestamp'], axis=1)
-  df = df.drop_duplicates(subset=['timestamp', 'object_id'], keep='first')
+  if object_id is not None:
+    df = store.to_frame(rows=store.object_rows(object_id, row_start, row_stop))
+  else:
+    df = store.to_frame(row_start, row_stop)
 
-  first_60_unique_timestamps = df['timestamp'].unique()[:60]
-  df = df[df['timestamp'].isin(first_60_unique_timestamps)]
+  df = bucket_rows(df, frame_width, store.origin, scans=store.scan_timestamps)
 
   # filtered_df = df.query('object_id == 3')
   # filtered_df.to_csv(r'C:\Users\Axeel\iCloudDrive\Master_MCS\1st_Semester\Probabilidad_y_Estadistica\Presentacion_1\src\team_profe.csv')
@@ -64,7 +102,96 @@ def load_data(path):
   return df
 
 
-df = load_data(r"./algo_one_rec.csv")
+# -------------------------------
+# Window selection from the URL
+# -------------------------------
+# /line-charts?frame=120&frames=60&width=1s
+# /box-plots?start=12:00:00&end=12:05:00&object=3
+WINDOW_PARAMS = {
+  'frame': ('first_frame', int, None),
+  'frames': ('n_frames', int, 60),
+  'width': ('frame_width', str, FRAME_WIDTH),
+  'start': ('start_time', str, None),
+  'end': ('end_time', str, None),
+  'object': ('object_id', int, None),
+}
+
+
+def parse_window(search):
+  # Returns a hashable, sorted tuple of load_data keyword arguments
+  query = parse_qs((search or "").lstrip("?"))
+  window = {}
+  for param, (kwarg, cast, default) in WINDOW_PARAMS.items():
+    value = query.get(param, [None])[0]
+    try:
+      window[kwarg] = default if value in (None, "") else cast(value)
+    except ValueError:
+      window[kwarg] = default
+  window['n_frames'] = max(window['n_frames'], 1)
+  if window['frame_width'] not in FRAME_WIDTHS:
+    window['frame_width'] = FRAME_WIDTH
+  return tuple(sorted(window.items()))
+
+
+@lru_cache(maxsize=16)
+def window_data(fingerprint, window):
+  # Keyed on the recording's fingerprint too, so a re-ingested CSV never serves stale windows
+  return load_data(DATA_PATH, **dict(window))
+
+
+# Convert (or reuse) the columnar store before serving the first request
+open_store(DATA_PATH)
+
+
+def window_controls(pathname, window):
+  window = dict(window)
+  store = open_store(DATA_PATH)
+
+  def href(**params):
+    if window['object_id'] is not None:
+      params['object'] = window['object_id']
+    return f"{pathname}?{urlencode(params)}"
+
+  if window['start_time'] is not None or window['end_time'] is not None:
+    caption = f"Time {window['start_time'] or 'start'} → {window['end_time'] or 'end'}"
+    # Shift the time range by its own length; an open bound is the recording's first/last scan
+    ts = store.scan_timestamps
+    first, stop = (int(ts[0]), int(ts[-1]) + 1) if len(ts) else (0, 0)
+    start_us = _wall_clock_to_us(window['start_time'], store.origin)
+    end_us = _wall_clock_to_us(window['end_time'], store.origin)
+    start_us = first if start_us is None else start_us
+    end_us = stop if end_us is None else end_us
+    length = max(end_us - start_us, 1)
+
+    def time_href(start_us):
+      start_us = max(start_us, first)
+      return href(start=_us_to_wall_clock(start_us, store.origin),
+                  end=_us_to_wall_clock(start_us + length, store.origin), width=window['frame_width'])
+
+    previous, at_start = time_href(start_us - length), start_us <= first
+    following, at_end = time_href(end_us), end_us >= stop
+  else:
+    start = store.first_frame(window['frame_width'])
+    if window['first_frame'] is None:
+      window['first_frame'] = start
+    last = window['first_frame'] + window['n_frames'] - 1
+    caption = f"Frames {window['first_frame']}–{last} ({window['frame_width']})"
+
+    def frame_href(first_frame):
+      return href(frame=first_frame, frames=window['n_frames'], width=window['frame_width'])
+
+    # Never before the recording's first frame; disabled on the first window
+    previous, at_start = frame_href(max(window['first_frame'] - window['n_frames'], start)), window['first_frame'] <= start
+    following, at_end = frame_href(window['first_frame'] + window['n_frames']), False
+  if window['object_id'] is not None:
+    caption += f" · Object {window['object_id']}"
+
+  return html.Div([
+    dbc.Button("← Previous", href=previous, color="light", size="sm", disabled=at_start),
+    html.Span(caption, className="mx-3 text-muted"),
+    dbc.Button("Next →", href=following, color="light", size="sm", disabled=at_end),
+  ], className="text-center mb-3")
+
 
 # -------------------------------
 # Navigation Layout
@@ -135,56 +262,157 @@ home_layout = html.Div([
   ], style={'display': 'flex', 'justifyContent': 'center', 'flexWrap': 'wrap'}),
 ], className="container")
 
+# -------------------------------
+# Cached chart figures
+# -------------------------------
+# Bump when a chart builder changes so cached figures are rebuilt
+CHART_VERSION = 4
+
+# Objects per figure: only the current page is sent to the browser and the
+# pagination callback swaps pages server-side, so the payload stays bounded
+PAGE_SIZES = {
+  'bar_charts': 10,
+  'line_charts': 10,
+  'box_plots': 30,
+}
+
+
+# Box plots ship server-computed quartiles/fences and only the outlier points
+box_plots_figure = partial(create_box_plots_figure, precomputed=True, points="outliers")
+
+
+def cached_figure(chart, window, builder, page=0):
+  # Served from the figure cache; the window is only loaded when the figure has to be built
+  page_size = PAGE_SIZES[chart]
+  fingerprint = open_store(DATA_PATH).fingerprint
+
+  def build():
+    df = window_data(fingerprint, window)
+    if df.empty:
+      return None
+    fig = builder(df, page=page, page_size=page_size)
+    # The object count travels with the cached figure, so paging never reloads the window
+    fig.update_layout(meta={'n_objects': int(df['object_id'].nunique())})
+    return fig
+
+  params = dict(window, page=page, page_size=page_size, chart_version=CHART_VERSION)
+  return figure_cache.get_or_build(fingerprint, chart, params, build)
+
+
+def page_count(chart, figure):
+  n_objects = figure['layout'].get('meta', {}).get('n_objects', 0)
+  return max(-(-n_objects // PAGE_SIZES[chart]), 1)
+
+
+def page_controls(chart, figure):
+  return dbc.Pagination(
+    id=f"{chart.replace('_', '-')}-pages",
+    max_value=page_count(chart, figure),
+    active_page=1,
+    first_last=True,
+    previous_next=True,
+    fully_expanded=False,
+    className="justify-content-center mt-2"
+  )
+
+
+def _empty_window_alert():
+  return dbc.Alert("No data in this window, try another frame range or object.", color="warning")
+
+
 # -------------------------------
 # Bar Charts Page
 # -------------------------------
-bar_charts_layout = html.Div([
-  html.H1("Bar Charts Analysis", className="text-center my-4"),
-  html.P("Interactive bar charts showing aggregated data by object ID ranges",
-         className="text-center text-muted mb-4"),
-  dcc.Graph(
-    id='bar-charts-graph',
-    figure=create_bar_charts(df),
-    config={'displayModeBar': True}
-  ),
-  dbc.Button("← Back to Home", href="/", color="secondary", className="mt-3"),
-], className="container")
+def bar_charts_layout(window):
+  figure = cached_figure('bar_charts', window, create_bar_charts)
+  return html.Div([
+    html.H1("Bar Charts Analysis", className="text-center my-4"),
+    html.P("Interactive bar charts showing aggregated data by object ID ranges",
+           className="text-center text-muted mb-4"),
+    window_controls("/bar-charts", window),
+    html.Div([
+      dcc.Graph(
+        id='bar-charts-graph',
+        figure=figure,
+        config={'displayModeBar': True}
+      ),
+      page_controls('bar_charts', figure),
+    ]) if figure is not None else _empty_window_alert(),
+    dbc.Button("← Back to Home", href="/", color="secondary", className="mt-3"),
+  ], className="container")
 
 # -------------------------------
 # Line Charts Page
 # -------------------------------
-line_charts_layout = html.Div([
-  html.H1("Line Charts Analysis", className="text-center my-4"),
-  html.P("Time series analysis of confidence and point counts over time",
-         className="text-center text-muted mb-4"),
-  dcc.Graph(
-    id='line-charts-graph',
-    figure=create_line_charts(df),
-    config={'displayModeBar': True}
-  ),
-  dbc.Button("← Back to Home", href="/", color="secondary", className="mt-3"),
-], className="container")
+def line_charts_layout(window):
+  figure = cached_figure('line_charts', window, create_line_charts)
+  return html.Div([
+    html.H1("Line Charts Analysis", className="text-center my-4"),
+    html.P("Time series analysis of confidence and point counts over time",
+           className="text-center text-muted mb-4"),
+    window_controls("/line-charts", window),
+    html.Div([
+      dcc.Graph(
+        id='line-charts-graph',
+        figure=figure,
+        config={'displayModeBar': True}
+      ),
+      page_controls('line_charts', figure),
+    ]) if figure is not None else _empty_window_alert(),
+    dbc.Button("← Back to Home", href="/", color="secondary", className="mt-3"),
+  ], className="container")
 
 # -------------------------------
 # Box Plots Page
 # -------------------------------
-box_plots_layout = html.Div([
-  html.H1("Box Plots Analysis", className="text-center my-4"),
-  html.P("Distribution analysis of various metrics across different objects",
-         className="text-center text-muted mb-4"),
-  dcc.Graph(
-    id='box-plots-graph',
-    figure=create_box_plots_figure(df),
-    config={'displayModeBar': True}
-  ),
-  dbc.Button("← Back to Home", href="/", color="secondary", className="mt-3"),
-], className="container")
+def box_plots_layout(window):
+  figure = cached_figure('box_plots', window, box_plots_figure)
+  return html.Div([
+    html.H1("Box Plots Analysis", className="text-center my-4"),
+    html.P("Distribution analysis of various metrics across different objects",
+           className="text-center text-muted mb-4"),
+    window_controls("/box-plots", window),
+    html.Div([
+      dcc.Graph(
+        id='box-plots-graph',
+        figure=figure,
+        config={'displayModeBar': True}
+      ),
+      page_controls('box_plots', figure),
+    ]) if figure is not None else _empty_window_alert(),
+    dbc.Button("← Back to Home", href="/", color="secondary", className="mt-3"),
+  ], className="container")
+
+
+CHART_PAGES = {
+  '/bar-charts': bar_charts_layout,
+  '/line-charts': line_charts_layout,
+  '/box-plots': box_plots_layout,
+}
+
+
+def chart_page_layout(pathname, window):
+  try:
+    return CHART_PAGES[pathname](window)
+  except ValueError as e:
+    return dbc.Alert(f"Invalid window: {str(e)}", color="danger", className="mt-3")
 
 # -------------------------------
 # Class Activity  (NUEVO: mosaico 2x2 + inputs 3x4 + gráfico bar/line)
 # -------------------------------
-BASE = Path(__file__).parent  # rutas robustas relativas a este archivo
-encoded_images = [encode_image(str(BASE / f"{i}.png")) for i in (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12)]
+# Las imagenes se sirven por URL (cacheables por el navegador) en vez de base64 en el layout
+CLASS_IMAGES = tuple(range(1, 13))
+IMAGE_MAX_AGE = 24 * 3600
+
+
+@app.server.route("/class-images/<int:number>.png")
+def class_image(number):
+  if number not in CLASS_IMAGES:
+    abort(404)
+  return send_from_directory(BASE_DIR, f"{number}.png", max_age=IMAGE_MAX_AGE)
+
+
+image_urls = [f"/class-images/{i}.png" for i in CLASS_IMAGES]
 
 class_activity_layout = html.Div([
   html.H1("👨‍🏫 Class Activity: LiDAR Parameter Estimation", className="text-center my-4"),
@@ -218,12 +446,12 @@ class_activity_layout = html.Div([
             dbc.Tab(
               dbc.Container([
                 dbc.Row([
-                  dbc.Col(html.Img(src=encoded_images[0], style={"width": "100%", "borderRadius": "8px"}), md=6),
-                  dbc.Col(html.Img(src=encoded_images[1], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[0], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[1], style={"width": "100%", "borderRadius": "8px"}), md=6),
                 ], className="mb-3"),
                 dbc.Row([
-                  dbc.Col(html.Img(src=encoded_images[2], style={"width": "100%", "borderRadius": "8px"}), md=6),
-                  dbc.Col(html.Img(src=encoded_images[3], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[2], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[3], style={"width": "100%", "borderRadius": "8px"}), md=6),
                 ]),
                 dbc.Row([
                   dbc.Col([
@@ -246,12 +474,12 @@ class_activity_layout = html.Div([
             dbc.Tab(
               dbc.Container([
                 dbc.Row([
-                  dbc.Col(html.Img(src=encoded_images[4], style={"width": "100%", "borderRadius": "8px"}), md=6),
-                  dbc.Col(html.Img(src=encoded_images[5], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[4], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[5], style={"width": "100%", "borderRadius": "8px"}), md=6),
                 ], className="mb-3"),
                 dbc.Row([
-                  dbc.Col(html.Img(src=encoded_images[6], style={"width": "100%", "borderRadius": "8px"}), md=6),
-                  dbc.Col(html.Img(src=encoded_images[7], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[6], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[7], style={"width": "100%", "borderRadius": "8px"}), md=6),
                 ]),
                 dbc.Row([
                   dbc.Col([
@@ -274,12 +502,12 @@ class_activity_layout = html.Div([
             dbc.Tab(
               dbc.Container([
                 dbc.Row([
-                  dbc.Col(html.Img(src=encoded_images[8], style={"width": "100%", "borderRadius": "8px"}), md=6),
-                  dbc.Col(html.Img(src=encoded_images[9], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[8], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[9], style={"width": "100%", "borderRadius": "8px"}), md=6),
                 ], className="mb-3"),
                 dbc.Row([
-                  dbc.Col(html.Img(src=encoded_images[10], style={"width": "100%", "borderRadius": "8px"}), md=6),
-                  dbc.Col(html.Img(src=encoded_images[11], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[10], style={"width": "100%", "borderRadius": "8px"}), md=6),
+                  dbc.Col(html.Img(src=image_urls[11], style={"width": "100%", "borderRadius": "8px"}), md=6),
                 ]),
                 dbc.Row([
                   dbc.Col([
@@ -433,14 +661,11 @@ app.layout = html.Div([
 
 
 @app.callback(Output('page-content', 'children'),
-              Input('url', 'pathname'))
-def display_page(pathname):
-  if pathname == '/bar-charts':
-    return bar_charts_layout
-  elif pathname == '/line-charts':
-    return line_charts_layout
-  elif pathname == '/box-plots':
-    return box_plots_layout
+              Input('url', 'pathname'),
+              Input('url', 'search'))
+def display_page(pathname, search):
+  if pathname in CHART_PAGES:
+    return chart_page_layout(pathname, parse_window(search))
   elif pathname == CLASS_ACTIVITY:
     # return box_plots_layout
     return class_activity_layout
@@ -448,6 +673,37 @@ def display_page(pathname):
     return home_layout
 
 
+# Server-side object paging for the chart pages
+def _register_page_callback(chart, builder):
+  prefix = chart.replace('_', '-')
+
+  @app.callback(
+    Output(f"{prefix}-graph", "figure"),
+    Input(f"{prefix}-pages", "active_page"),
+    State("url", "search"),
+    prevent_initial_call=True
+  )
+  def change_page(active_page, search):
+    window = parse_window(search)
+    first = cached_figure(chart, window, builder)
+    if first is None:
+      return dash.no_update
+    # Stale or hand-edited page numbers land on the last page instead of an empty slice
+    page = min(max(active_page or 1, 1), page_count(chart, first))
+    return first if page == 1 else cached_figure(chart, window, builder, page=page - 1)
+
+
+_register_page_callback('bar_charts', create_bar_charts)
+_register_page_callback('line_charts', create_line_charts)
+_register_page_callback('box_plots', box_plots_figure)
+
+
+# Figure cache metrics (hits/misses and build time per entry)
+@app.server.route("/cache-stats")
+def cache_stats():
+  return dict(figure_cache.stats(), uploads=datasets.stats())
+
+
 # Download CSV
 @app.callback(
   Output("download-csv", "data"),
@@ -475,7 +731,7 @@ def handle_downloads(btn_clicks):
   if not csv_filename:
     return dict(content="Error: Team not found", filename="error.txt")
 
-  csv_path = os.path.join('./', csv_filename)
+  csv_path = os.path.join(BASE_DIR, csv_filename)
 
   # Check if file exists
   if not os.path.exists(csv_path):
@@ -500,18 +756,23 @@ def load_and_display_csv(contents, filename):
     if contents is None:
       return html.Div("Please upload a CSV file")
 
-    # Decode and read CSV
-    content_type, content_string = contents.split(",")
-    decoded = base64.b64decode(content_string)
-    df = pd.read_csv(io.StringIO(decoded.decode("utf-8")))
+    # Decode and parse into the server-side store
+    upload_key = store_upload(contents)
+    df = get_upload(upload_key)
 
-    # Create table
+    # Create table (rows are queried one page at a time by update_upload_table)
     table = dash_table.DataTable(
-      data=df.to_dict("records"),
+      id="csv-table",
+      data=[],
       columns=[{"name": col, "id": col} for col in df.columns],
-      page_size=10,
-      sort_action="native",
-      filter_action="native",
+      page_current=0,
+      page_size=UPLOAD_PAGE_SIZE,
+      page_action="custom",
+      sort_action="custom",
+      sort_mode="multi",
+      sort_by=[],
+      filter_action="custom",
+      filter_query="",
       style_table={"overflowX": "auto"},
       style_cell={
         "textAlign": "left",
@@ -532,14 +793,22 @@ def load_and_display_csv(contents, filename):
       ]
     )
 
-    # Create chart
-    fig = create_bar_with_lines_chart(df)
-    chart = dcc.Graph(figure=fig, style={"marginTop": "20px"})
+    # Create chart (re-plotted from the stored frame by update_upload_chart)
+    fig = create_bar_with_lines_chart(df, window=UPLOAD_WINDOW)
+    chart = dcc.Graph(id="upload-chart", figure=fig, style={"marginTop": "20px"})
+    window_slider = html.Div([
+      html.Label("Rolling window (timestamps)"),
+      dcc.Slider(id="upload-window", min=1, max=20, step=1, value=UPLOAD_WINDOW,
+                 marks={w: str(w) for w in (1, 5, 10, 15, 20)})
+    ], style={"marginTop": "20px"})
 
     # Return both table and chart
     return html.Div([
       html.H5(f"📂 Loaded file: {filename} ({df.shape[0]} rows, {df.shape[1]} columns)"),
+      dcc.Store(id="upload-key", data=upload_key),
+      html.Div(id="upload-status"),
       table,
+      window_slider,
       chart
     ])
 
@@ -551,6 +820,49 @@ def load_and_display_csv(contents, filename):
     )
 
 
+# Serve one page of the uploaded CSV
+@app.callback(
+    Output("csv-table", "data"),
+    Output("csv-table", "page_count"),
+    Output("upload-status", "children"),
+    Input("csv-table", "page_current"),
+    Input("csv-table", "page_size"),
+    Input("csv-table", "sort_by"),
+    Input("csv-table", "filter_query"),
+    State("upload-key", "data")
+)
+def update_upload_table(page_current, page_size, sort_by, filter_query, upload_key):
+  if upload_key is None:
+    return [], 1, None
+  try:
+    records, page_count = query_page(upload_key, page_current or 0, page_size or UPLOAD_PAGE_SIZE, sort_by,
+                                     filter_query)
+  except KeyError:
+    # Neither in this worker's memory nor in .upload_cache (e.g. the cache was cleared)
+    return [], 1, dbc.Alert(UPLOAD_MISSING, color="warning", className="mt-3")
+  return records, page_count, None
+
+
+# Re-plot the uploaded CSV from the stored frame
+@app.callback(
+    Output("upload-chart", "figure"),
+    Input("upload-window", "value"),
+    State("upload-key", "data"),
+    prevent_initial_call=True
+)
+def update_upload_chart(window, upload_key):
+  if upload_key is None:
+    return dash.no_update
+  try:
+    df = get_upload(upload_key)
+  except KeyError:
+    fig = go.Figure()
+    fig.add_annotation(text=UPLOAD_MISSING, showarrow=False, xref="paper", yref="paper", x=0.5, y=0.5)
+    fig.update_layout(xaxis_visible=False, yaxis_visible=False)
+    return fig
+  return create_bar_with_lines_chart(df, window=window or UPLOAD_WINDOW)
+
+
 # =========================
 # @app.callback(
 #   Output("csv-table-container", "children"),
@@ -682,8 +994,17 @@ def build_activity_chart(_n, chart_type,
   return fig
 
 
+# Warm-up before serve.py forks its workers: the columnar store is already open
+# (import time) and the default-window figures go to the shared disk cache
+def preload():
+  window = parse_window("")
+  for layout in CHART_PAGES.values():
+    layout(window)
+
+
 # -------------------------------
 # Run the app
 # -------------------------------
+# Single-process development server; use serve.py for multiple workers
 if __name__ == '__main__':
   app.run(debug=False, port=8050)
\ No newline at end of file
@@ -5,8 +5,14 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import numpy as np
 
-def create_bar_charts(df):
+def create_bar_charts(df, page=None, page_size=10):
+  """
+  page=None: every object is in the figure and a dropdown switches between ranges
+  of page_size objects. page=k: only the traces of the k-th range are built, so
+  the figure size is bounded whatever the number of objects (paged from the server).
+  """
   agg_df = df.groupby('object_id').agg({
     'confidence': 'mean',
     'nb_point': 'sum',
@@ -19,26 +25,39 @@ def create_bar_charts(df):
     vertical_spacing=0.15
   )
 
-  objects_ids = sorted(agg_df["object_id"].unique())
+  first = 0
+  if page is not None:
+    first = page * page_size
+    agg_df = agg_df.iloc[first:first + page_size]
+    if agg_df.empty:
+      raise ValueError(f"No objects on page {page}")
+
+  objects_ids = agg_df["object_id"].tolist()
 
   colors = px.colors.qualitative.Plotly
   color_map = {}
   for i, obj in enumerate(objects_ids):
-    color_map[obj] = colors[i % len(colors)]
+    color_map[obj] = colors[(first + i) % len(colors)]
 
   object_ranges = []
-  for i in range(0, len(objects_ids), 10):
-    object_ranges.append(objects_ids[i:i + 10])
+  for i in range(0, len(objects_ids), page_size):
+    object_ranges.append(objects_ids[i:i + page_size])
+
+  # agg_df already has one row per object, sorted by object_id
+  customdata_all = agg_df[["object_id", "nb_point", "algo_center_x", "confidence"]].to_numpy()
+  object_id = agg_df["object_id"].to_numpy()
+  confidence = agg_df["confidence"].to_numpy()
+  nb_point = agg_df["nb_point"].to_numpy()
 
-  for obj in objects_ids:
-    sub = agg_df[agg_df["object_id"] == obj]
+  for i, obj in enumerate(objects_ids):
+    rows = slice(i, i + 1)
 
     fig.add_trace(go.Bar(
-      x=sub["object_id"],
-      y=sub["confidence"],
+      x=object_id[rows],
+      y=confidence[rows],
       name=f"Object {obj}",
       marker_color=color_map[obj],
-      customdata=sub[["object_id", "nb_point", "algo_center_x", "confidence"]],
+      customdata=customdata_all[rows],
       hovertemplate=(
         "Object: %{x}<br>"
         "Nb Points: %{customdata[1]}<br>"
@@ -49,11 +68,11 @@ def create_bar_charts(df):
     ), row=1, col=1)
 
     fig.add_trace(go.Bar(
-      x=sub["object_id"],
-      y=sub["nb_point"],
+      x=object_id[rows],
+      y=nb_point[rows],
       name=f"Object {obj}",
       marker_color=color_map[obj],
-      customdata=sub[["object_id", "nb_point", "algo_center_x", "confidence"]],
+      customdata=customdata_all[rows],
       hovertemplate=(
         "Object: %{x}<br>"
         "Nb Points: %{y}<br>"
@@ -63,12 +82,11 @@ def create_bar_charts(df):
       visible=False
     ), row=2, col=1)
 
+  # Two traces per object, in object order; ranges hold page_size objects each
+  trace_range = np.arange(len(fig.data)) // 2 // page_size
   buttons = []
   for i, obj_range in enumerate(object_ranges):
-    visibility = []
-    for trace in fig.data:
-      obj_num = int(trace.name.split(" ")[1])
-      visibility.append(obj_num in obj_range)
+    visibility = (trace_range == i).tolist()
 
     buttons.append(dict(
       label=f"Objects {obj_range[0]}-{obj_range[-1]}",
@@ -77,17 +95,14 @@ def create_bar_charts(df):
             {"title": {"text": f"Objects {obj_range[0]}-{obj_range[-1]} - Confidence and Points"}}]
     ))
 
-  initial_visibility = []
-  for trace in fig.data:
-    obj_num = int(trace.name.split(" ")[1])
-    initial_visibility.append(obj_num in object_ranges[0])
+  initial_visibility = (trace_range == 0).tolist()
 
   fig.update_layout(
     updatemenus=[dict(
       active=0,
       buttons=buttons,
       x=1.1, y=1.15
-    )],
+    )] if page is None else [],
     title=f"Objects {object_ranges[0][0]}-{object_ranges[0][-1]} - Confidence and Points",
     height=800,
     showlegend=False
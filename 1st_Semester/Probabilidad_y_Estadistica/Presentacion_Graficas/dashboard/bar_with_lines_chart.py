@@ -1,7 +1,10 @@
 import pandas as pd
 import plotly.graph_objects as go
 
-def create_bar_with_lines_chart(df: pd.DataFrame, window: int = 3) -> go.Figure:
+from frames import FRAME_1S, bucket_rows
+from rolling_stats import rolling_stats
+
+def create_bar_with_lines_chart(df: pd.DataFrame, window: int = 3, frame_width=FRAME_1S) -> go.Figure:
     """
     Opción 1:
       - Barras: valor por timestamp (si hay >1 objeto en un timestamp, usa el promedio).
@@ -9,28 +12,24 @@ def create_bar_with_lines_chart(df: pd.DataFrame, window: int = 3) -> go.Figure:
       - Banda: ±1 desviación estándar móvil (ventana = window).
       - Dropdown: nb_point / confidence.
     Requiere columnas: ['timestamp','object_id','nb_point','confidence'].
+    Un CSV crudo (con 'ecal_timestamp' en lugar de 'timestamp') se agrupa en
+    frames de frame_width igual que en load_data.
     """
+    df = bucket_rows(df, frame_width)
 
     required = {"timestamp", "object_id", "nb_point", "confidence"}
     missing = required - set(df.columns)
     if missing:
         raise ValueError(f"Faltan columnas en df: {missing}")
 
-    # Asegurar orden temporal
-    dfp = df.copy()
-    dfp = dfp.sort_values(["timestamp", "object_id"])
+    # Promedio por timestamp + media/desviación móviles de ambas métricas en una pasada
+    # (arreglos NumPy; ver rolling_stats.RollingStats para añadir frames en vivo)
+    stats = rolling_stats(df, ["nb_point", "confidence"], window=window)
+    x = stats.timestamps
 
     def prep(metric: str):
-        # Promedio por timestamp (por si llegan duplicados u >1 objeto; para 1 objeto, es el propio valor)
-        s = (pd.to_numeric(dfp[metric], errors="coerce")
-               .groupby(dfp["timestamp"])
-               .mean()
-               .sort_index())
-        rmean = s.rolling(window=window, min_periods=1).mean()
-        rstd  = s.rolling(window=window, min_periods=1).std(ddof=1).fillna(0.0)
-        upper = rmean + rstd
-        lower = rmean - rstd
-        return s.index.tolist(), s.tolist(), rmean.tolist(), upper.tolist(), lower.tolist()
+        lower, upper = stats.band(metric)
+        return x, stats.values(metric), stats.mean(metric), upper, lower
 
     # Precalcular para ambas métricas
     x_nb, y_nb, mean_nb, up_nb, lo_nb = prep("nb_point")
@@ -0,0 +1,70 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from grouping import group_by_object
+
+# -------------------------------
+# Benchmark: per-object boolean masks vs one sort-by-object pass
+# -------------------------------
+# Measures the cost of splitting the frame into per-object slices, the part the
+# chart builders used to do with `df[df["object_id"] == obj]` once per object.
+# The mask loop is O(objects x rows), so for large sizes it is timed on a sample
+# of objects and extrapolated (marked "est.").
+
+COLUMNS = ["timestamp", "object_id", "nb_point", "algo_center_x", "confidence"]
+
+
+def synthetic_frame(n_objects, rows_per_object, seed=0):
+  rng = np.random.default_rng(seed)
+  n = n_objects * rows_per_object
+  return pd.DataFrame({
+    'timestamp': np.repeat(np.arange(rows_per_object), n_objects),
+    'object_id': np.tile(rng.permutation(n_objects), rows_per_object),
+    'nb_point': rng.integers(1, 500, n),
+    'algo_center_x': rng.random(n) * 100,
+    'confidence': rng.random(n),
+  })
+
+
+def time_mask_loop(df, sample):
+  objects_ids = sorted(df["object_id"].unique())
+  sampled = objects_ids[:sample]
+  start = time.perf_counter()
+  for obj in sampled:
+    sub = df[df["object_id"] == obj]
+    sub["timestamp"].to_numpy(), sub["confidence"].to_numpy(), sub["nb_point"].to_numpy()
+  elapsed = time.perf_counter() - start
+  return elapsed * len(objects_ids) / len(sampled), len(sampled) < len(objects_ids)
+
+
+def time_grouped(df):
+  start = time.perf_counter()
+  ids, offsets, cols = group_by_object(df, COLUMNS)
+  for i in range(len(ids)):
+    rows = slice(offsets[i], offsets[i + 1])
+    cols["timestamp"][rows], cols["confidence"][rows], cols["nb_point"][rows]
+  return time.perf_counter() - start
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Per-object mask loop vs grouped slicing")
+  parser.add_argument("--objects", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+  parser.add_argument("--rows-per-object", type=int, default=20)
+  parser.add_argument("--sample", type=int, default=500,
+                      help="objects timed for the mask loop before extrapolating")
+  args = parser.parse_args()
+
+  print(f"{'objects':>10} {'rows':>10} {'mask loop (s)':>16} {'grouped (s)':>12} {'speedup':>9}")
+  for n_objects in args.objects:
+    df = synthetic_frame(n_objects, args.rows_per_object)
+    old, estimated = time_mask_loop(df, args.sample)
+    new = time_grouped(df)
+    old_label = f"{old:.3f}" + (" est." if estimated else "")
+    print(f"{n_objects:>10,} {len(df):>10,} {old_label:>16} {new:>12.3f} {old / new:>8.0f}x")
+
+
+if __name__ == "__main__":
+  main()
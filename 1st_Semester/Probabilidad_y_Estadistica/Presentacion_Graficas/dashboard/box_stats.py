@@ -0,0 +1,101 @@
+import numpy as np
+
+# -------------------------------
+# Box-plot statistics per object
+# -------------------------------
+# Quartiles, Tukey fences and outliers for every group at once, computed on
+# rows already grouped by object (ids/offsets from grouping.group_by_object).
+# The results map directly onto Plotly's precomputed box inputs
+# (q1/median/q3/lowerfence/upperfence/mean).
+
+
+def _quantile(sorted_values, starts, counts, q):
+  # Linear interpolation between order statistics, like np.quantile's default
+  pos = q * (counts - 1)
+  lo = np.floor(pos).astype(np.int64)
+  hi = np.minimum(lo + 1, counts - 1)
+  frac = pos - lo
+  return sorted_values[starts + lo] * (1.0 - frac) + sorted_values[starts + hi] * frac
+
+
+def grouped_box_stats(values, offsets, whisker=1.5):
+  """
+  Box statistics of values[offsets[i]:offsets[i + 1]] for every group i.
+  Non-finite values (NaN, ±inf) are dropped first; a group left without values
+  gets NaN statistics.
+  Returns (stats, sorted_values, sorted_offsets, is_outlier): stats holds one
+  array per Plotly box input, sorted_values is every group's finite values
+  sorted ascending, delimited by sorted_offsets, and is_outlier flags the points
+  beyond the fences.
+  """
+  values = np.asarray(values, dtype=np.float64)
+  n_groups = len(offsets) - 1
+  group = np.repeat(np.arange(n_groups), np.diff(offsets))
+  finite = np.isfinite(values)
+  if not finite.all():
+    values, group = values[finite], group[finite]
+  counts = np.bincount(group, minlength=n_groups)
+  sorted_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+  order = np.lexsort((values, group))
+  sorted_values = values[order]
+
+  # Statistics over the non-empty groups only, NaN for the others
+  nonempty = np.flatnonzero(counts)
+  starts, sizes = sorted_offsets[nonempty], counts[nonempty]
+
+  def per_group(result):
+    full = np.full(n_groups, np.nan)
+    full[nonempty] = result
+    return full
+
+  q1 = per_group(_quantile(sorted_values, starts, sizes, 0.25))
+  median = per_group(_quantile(sorted_values, starts, sizes, 0.5))
+  q3 = per_group(_quantile(sorted_values, starts, sizes, 0.75))
+  iqr = q3 - q1
+
+  low_limit = (q1 - whisker * iqr)[group]
+  high_limit = (q3 + whisker * iqr)[group]
+  is_outlier = (sorted_values < low_limit) | (sorted_values > high_limit)
+
+  # Whiskers end at the most extreme points still inside the fences
+  if len(nonempty):
+    lowerfence = per_group(np.minimum.reduceat(np.where(is_outlier, np.inf, sorted_values), starts))
+    upperfence = per_group(np.maximum.reduceat(np.where(is_outlier, -np.inf, sorted_values), starts))
+    mean = per_group(np.add.reduceat(sorted_values, starts) / sizes)
+  else:
+    lowerfence = upperfence = mean = per_group([])
+
+  stats = {
+    'q1': q1,
+    'median': median,
+    'q3': q3,
+    'lowerfence': lowerfence,
+    'upperfence': upperfence,
+    'mean': mean,
+  }
+  return stats, sorted_values, sorted_offsets, is_outlier
+
+
+def box_points(sorted_values, offsets, is_outlier, points="outliers", sample_size=50, seed=0):
+  """
+  Sample points to draw next to each box, as one list per group:
+  - "outliers": only the points beyond the fences
+  - "sample": outliers plus a random sample of at most sample_size other points
+  """
+  counts = np.diff(offsets)
+  group = np.repeat(np.arange(len(counts)), counts)
+  keep = is_outlier.copy()
+
+  if points == "sample":
+    # Random rank of each point inside its group; keep the first sample_size
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(sorted_values)), group))
+    rank = np.empty(len(sorted_values), dtype=np.int64)
+    rank[order] = np.arange(len(sorted_values)) - offsets[:-1][group[order]]
+    keep |= rank < sample_size
+  elif points != "outliers":
+    raise ValueError(f"Unknown points mode '{points}', expected 'outliers' or 'sample'")
+
+  kept_counts = np.bincount(group[keep], minlength=len(counts))
+  return [chunk.tolist() for chunk in np.split(sorted_values[keep], np.cumsum(kept_counts)[:-1])]
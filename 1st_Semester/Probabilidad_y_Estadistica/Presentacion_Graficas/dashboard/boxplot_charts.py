@@ -5,29 +5,23 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import numpy as np
+from grouping import group_by_object
+from box_stats import grouped_box_stats, box_points
 
 
-# Box Plots Page
-# -------------------------------
-def create_box_plots_figure(df):
-    # Division por grupos de 30
-    object_ids_all = sorted(df["object_id"].unique())
-    object_id_groups = [object_ids_all[i:i + 30] for i in range(0, len(object_ids_all), 30)]
-    if not object_id_groups:
-        raise ValueError("No hay object_id disponibles para graficar.")
-
+def _raw_box_traces(object_ids_all, offsets, cols):
+    # Una caja por objeto con todos sus puntos; Plotly calcula los cuartiles
     traces = []
     y_nb_all = []
     y_conf_all = []
 
-    for obj in object_ids_all:
-        sub = df[df["object_id"] == obj]
-        if sub.empty:
-            continue
+    for i, obj in enumerate(object_ids_all):
+        rows = slice(offsets[i], offsets[i + 1])
 
-        y_nb = sub["nb_point"].tolist()
-        y_cf = sub["confidence"].tolist()
-        x_cat = [obj] * len(sub)
+        y_nb = cols["nb_point"][rows].tolist()
+        y_cf = cols["confidence"][rows].tolist()
+        x_cat = [obj] * len(y_nb)
 
         y_nb_all.append(y_nb)
         y_conf_all.append(y_cf)
@@ -42,6 +36,87 @@ def create_box_plots_figure(df):
             visible=False
         ))
 
+    return traces, {"nb_point": {"y": y_nb_all}, "confidence": {"y": y_conf_all}}
+
+
+def _precomputed_box_traces(object_id_groups, offsets, cols, points, sample_size):
+    # Una traza por grupo con las estadísticas ya calculadas (q1/median/q3/fences)
+    # y solo los puntos seleccionados, como arreglo 2D (una lista por caja)
+    # offsets pueden venir recortados a una página: se pasan a posiciones locales
+    local_offsets = offsets - offsets[0]
+    rows = slice(offsets[0], offsets[-1])
+
+    updates = {}
+    for metric in ("nb_point", "confidence"):
+        # Los valores no finitos se descartan: los offsets ordenados pueden cambiar
+        stats, sorted_values, sorted_offsets, is_outlier = grouped_box_stats(cols[metric][rows], local_offsets)
+        pts = box_points(sorted_values, sorted_offsets, is_outlier, points, sample_size)
+
+        update = {key: [] for key in list(stats) + ["y"]}
+        first = 0
+        for group in object_id_groups:
+            last = first + len(group)
+            for key, values in stats.items():
+                update[key].append(values[first:last].tolist())
+            update["y"].append(pts[first:last])
+            first = last
+        updates[metric] = update
+
+    initial = updates["nb_point"]
+    traces = []
+    for g_idx, group in enumerate(object_id_groups):
+        traces.append(go.Box(
+            x=group,
+            y=initial["y"][g_idx],
+            q1=initial["q1"][g_idx],
+            median=initial["median"][g_idx],
+            q3=initial["q3"][g_idx],
+            lowerfence=initial["lowerfence"][g_idx],
+            upperfence=initial["upperfence"][g_idx],
+            mean=initial["mean"][g_idx],
+            name=f"Grupo {g_idx + 1}",
+            boxpoints="all",
+            jitter=0.3,
+            pointpos=-1.8,
+            visible=False
+        ))
+
+    return traces, updates
+
+
+# Box Plots Page
+# -------------------------------
+def create_box_plots_figure(df, page=None, page_size=30, precomputed=False, points="outliers", sample_size=50):
+    """
+    page=None: todos los objetos en la figura y un dropdown por grupos de page_size.
+    page=k: solo se construyen las trazas del grupo k (paginado desde el servidor),
+    así el tamaño de la figura no crece con el número de objetos.
+    precomputed=True: cuartiles, bigotes y outliers se calculan en el servidor y
+    solo se envían los outliers (points="outliers") o una muestra aleatoria de
+    hasta sample_size puntos por objeto (points="sample").
+    """
+    # Un solo ordenamiento por object_id en lugar de una máscara por objeto
+    ids, offsets, cols = group_by_object(df, ["nb_point", "confidence"])
+    first = 0
+    if page is not None:
+        first = page * page_size
+        ids, offsets = ids[first:first + page_size], offsets[first:first + page_size + 1]
+    object_ids_all = ids.tolist()
+
+    # Division por grupos de page_size (30)
+    object_id_groups = [object_ids_all[i:i + page_size] for i in range(0, len(object_ids_all), page_size)]
+    if not object_id_groups:
+        raise ValueError("No hay object_id disponibles para graficar.")
+
+    if precomputed:
+        traces, metric_updates = _precomputed_box_traces(object_id_groups, offsets, cols, points, sample_size)
+        # Una traza por grupo
+        trace_group = np.arange(len(traces))
+    else:
+        traces, metric_updates = _raw_box_traces(object_ids_all, offsets, cols)
+        # Una traza por objeto, en el mismo orden que object_ids_all
+        trace_group = np.arange(len(traces)) // page_size
+
     if not traces:
         raise ValueError("No hay datos válidos para construir los boxplots.")
 
@@ -50,17 +125,7 @@ def create_box_plots_figure(df):
     total_traces = len(fig.data)
 
     def visibility_mask_for_group(g_idx: int):
-        visible_ids = set(object_id_groups[g_idx])
-        mask = []
-        for tr in fig.data:
-            # Get the object ID from the trace name
-            obj_id_str = tr.name.replace("Objeto ", "")
-            try:
-                obj_id = int(obj_id_str)
-                mask.append(obj_id in visible_ids)
-            except ValueError:
-                mask.append(False)
-        return mask
+        return (trace_group == g_idx).tolist()
 
     initial_group = 0
     fig_visibility_init = visibility_mask_for_group(initial_group)
@@ -71,12 +136,12 @@ def create_box_plots_figure(df):
         dict(
             label="nb_point",
             method="restyle",
-            args=[{"y": y_nb_all}, list(range(total_traces))]
+            args=[metric_updates["nb_point"], list(range(total_traces))]
         ),
         dict(
             label="confidence",
             method="restyle",
-            args=[{"y": y_conf_all}, list(range(total_traces))]
+            args=[metric_updates["confidence"], list(range(total_traces))]
         )
     ]
 
@@ -93,22 +158,27 @@ def create_box_plots_figure(df):
             ]
         ))
 
+    updatemenus = [
+        dict( 
+            type="dropdown",
+            x=1.0, y=1.2, xanchor="left", yanchor="top",
+            showactive=True,
+            buttons=metric_buttons
+        )
+    ]
+    # Paginado desde el servidor: el grupo lo elige la app, no un dropdown
+    if page is None:
+        updatemenus.append(dict( 
+            type="dropdown",
+            x=1.0, y=1.05, xanchor="left", yanchor="top",
+            showactive=True,
+            buttons=group_buttons
+        ))
+
+    group_number = first // page_size + 1
     fig.update_layout(
-        updatemenus=[
-            dict( 
-                type="dropdown",
-                x=1.0, y=1.2, xanchor="left", yanchor="top",
-                showactive=True,
-                buttons=metric_buttons
-            ),
-            dict( 
-                type="dropdown",
-                x=1.0, y=1.05, xanchor="left", yanchor="top",
-                showactive=True,
-                buttons=group_buttons
-            )
-        ],
-        title=f"Distribución por Objeto — Grupo 1 ({object_id_groups[0][0]} - {object_id_groups[0][-1]})" if object_id_groups[0] else "Distribución por Objeto",
+        updatemenus=updatemenus,
+        title=f"Distribución por Objeto — Grupo {group_number} ({object_id_groups[0][0]} - {object_id_groups[0][-1]})" if object_id_groups[0] else "Distribución por Objeto",
         xaxis_title="Object ID",
         yaxis_title="Valor (nb_point / confidence)",
         showlegend=False,
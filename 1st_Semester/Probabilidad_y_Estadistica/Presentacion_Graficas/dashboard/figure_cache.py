@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import plotly.io as pio
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+
+# -------------------------------
+# Figure cache
+# -------------------------------
+# Figures are keyed by the dataset fingerprint (content hash of the recording)
+# plus the chart name and its parameters. Entries live in an in-memory LRU and
+# in a JSON file per key on disk, so restarts and other worker processes reuse
+# the serialized figure instead of rebuilding it. Figures are handed back as
+# plain JSON dicts, which dcc.Graph accepts directly.
+
+def _dumps(obj):
+  if orjson is not None:
+    return orjson.dumps(obj)
+  return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data):
+  if orjson is not None:
+    return orjson.loads(data)
+  return json.loads(data)
+
+
+def figure_key(fingerprint, chart, params=None):
+  payload = json.dumps({'source': fingerprint, 'chart': chart, 'params': params or {}},
+                       sort_keys=True, default=str)
+  return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FigureCache:
+
+  def __init__(self, cache_dir, max_entries=64):
+    self.cache_dir = Path(cache_dir)
+    self.cache_dir.mkdir(parents=True, exist_ok=True)
+    self.max_entries = max_entries
+    self._memory = OrderedDict()
+    self._metrics = {}
+    self._lock = threading.Lock()
+
+  def _entry_metrics(self, key, chart):
+    if key not in self._metrics:
+      self._metrics[key] = {'chart': chart, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'build_seconds': None}
+    return self._metrics[key]
+
+  def _remember(self, key, figure):
+    self._memory[key] = figure
+    self._memory.move_to_end(key)
+    while len(self._memory) > self.max_entries:
+      self._memory.popitem(last=False)
+
+  def _disk_path(self, key):
+    return self.cache_dir / f"{key}.json"
+
+  def _read_disk(self, key):
+    try:
+      with open(self._disk_path(key), "rb") as f:
+        return _loads(f.read())
+    except (FileNotFoundError, ValueError):
+      return None
+
+  def _write_disk(self, key, entry):
+    # Write then rename so other processes never read a half-written entry. The
+    # temp file is unique per call: threads of one worker can miss the same key
+    path = self._disk_path(key)
+    with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=f"{path.name}.", suffix=".tmp",
+                                     delete=False) as f:
+      f.write(_dumps(entry))
+      tmp_path = f.name
+    try:
+      os.replace(tmp_path, path)
+    except OSError:
+      # Lost the race (e.g. target held open on Windows): the entry from the
+      # other writer is equivalent, so just drop ours
+      if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+  def get_or_build(self, fingerprint, chart, params, builder):
+    """
+    Return the cached figure (as a JSON dict) for chart/params over the dataset
+    identified by fingerprint, calling builder() on a miss. A builder returning
+    None (nothing to plot) is not cached.
+    """
+    key = figure_key(fingerprint, chart, params)
+
+    with self._lock:
+      metrics = self._entry_metrics(key, chart)
+      if key in self._memory:
+        metrics['memory_hits'] += 1
+        self._memory.move_to_end(key)
+        return self._memory[key]
+
+    entry = self._read_disk(key)
+    if entry is not None:
+      with self._lock:
+        metrics['disk_hits'] += 1
+        metrics['build_seconds'] = entry.get('build_seconds')
+        self._remember(key, entry['figure'])
+      return entry['figure']
+
+    start = time.perf_counter()
+    fig = builder()
+    if fig is None:
+      return None
+    figure = _loads(pio.to_json(fig, validate=False))
+    build_seconds = time.perf_counter() - start
+
+    self._write_disk(key, {'chart': chart, 'params': params, 'build_seconds': build_seconds, 'figure': figure})
+    with self._lock:
+      metrics['misses'] += 1
+      metrics['build_seconds'] = build_seconds
+      self._remember(key, figure)
+    return figure
+
+  def stats(self):
+    with self._lock:
+      entries = {key: dict(m) for key, m in self._metrics.items()}
+      in_memory = len(self._memory)
+    totals = {name: sum(m[name] for m in entries.values()) for name in ('memory_hits', 'disk_hits', 'misses')}
+    return {'entries': entries, 'totals': totals, 'in_memory': in_memory}
+
+  def clear(self):
+    with self._lock:
+      self._memory.clear()
+      self._metrics.clear()
+    for path in self.cache_dir.glob("*.json"):
+      path.unlink()
@@ -0,0 +1,20 @@
+import numpy as np
+
+
+def group_by_object(df, columns, key="object_id"):
+  """
+  One stable sort by `key` instead of one boolean mask per object.
+  Returns (ids, offsets, arrays): the sorted distinct ids, the start of each id's
+  rows (len = ids + 1) and every requested column reordered so that the rows of
+  ids[i] are arrays[col][offsets[i]:offsets[i + 1]], still in their original order.
+  """
+  keys = df[key].to_numpy()
+  order = np.argsort(keys, kind="stable")
+  sorted_keys = keys[order]
+
+  starts = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+  offsets = np.concatenate(([0], starts, [len(keys)])) if len(keys) else np.zeros(1, dtype=np.int64)
+  ids = sorted_keys[offsets[:-1]]
+
+  arrays = {col: df[col].to_numpy()[order] for col in columns}
+  return ids, offsets, arrays
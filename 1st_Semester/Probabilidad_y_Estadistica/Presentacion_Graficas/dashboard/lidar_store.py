@@ -0,0 +1,332 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from frames import FRAME_SCAN, day_origin, parse_frame_width
+
+# -------------------------------
+# Columnar LiDAR store
+# -------------------------------
+# A recording is converted once into one raw binary file per column plus a
+# meta.json manifest. The dashboard then memory-maps only the columns it needs,
+# so opening a store costs the same no matter how large the recording is.
+
+STORE_VERSION = 3
+STORE_SUFFIX = ".lidar"
+CHUNK_ROWS = 1_000_000
+
+# One open store per recording and process; re-ingestion is serialized
+_stores = {}
+_ingest_lock = threading.Lock()
+
+# Index arrays written next to the columns (all int64):
+# - scan_timestamps / scan_offsets: distinct timestamps and the row where each
+#   scan starts (len = scans + 1), so a time window is a binary search + slice
+# - object_ids / object_offsets / object_rows: rows grouped by object id, each
+#   group in time order
+
+# Columns projected from the CSV and the dtype they are stored with
+STORE_COLUMNS = {
+  'ecal_timestamp': 'int64',
+  'object_id': 'int32',
+  'confidence': 'float32',
+  'nb_point': 'int32',
+  'algo_center_x': 'float32',
+  'algo_center_y': 'float32',
+  'algo_center_z': 'float32',
+}
+
+
+def default_store_dir(csv_path):
+  return Path(csv_path).with_suffix(STORE_SUFFIX)
+
+
+def _source_signature(csv_path):
+  stat = os.stat(csv_path)
+  return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+class _HashingReader:
+  # File wrapper that hashes the bytes pandas reads, so the content digest
+  # comes for free with the single ingest pass
+  def __init__(self, fh):
+    self._fh = fh
+    self.digest = hashlib.sha1()
+
+  def read(self, size=-1):
+    data = self._fh.read(size)
+    self.digest.update(data)
+    return data
+
+  def close(self):
+    self._fh.close()
+
+  def __iter__(self):
+    return self
+
+  def __next__(self):
+    line = self._fh.readline()
+    if not line:
+      raise StopIteration
+    self.digest.update(line)
+    return line
+
+
+def _read_meta(store_dir):
+  meta_path = Path(store_dir) / "meta.json"
+  if not meta_path.exists():
+    return None
+  with open(meta_path, "r") as f:
+    return json.load(f)
+
+
+def is_store_current(csv_path, store_dir=None):
+  store_dir = default_store_dir(csv_path) if store_dir is None else Path(store_dir)
+  meta = _read_meta(store_dir)
+  return (meta is not None
+          and meta.get('version') == STORE_VERSION
+          and meta.get('source') == _source_signature(csv_path))
+
+
+def _sort_columns_by_time(tmp_dir, rows):
+  # Only needed for recordings written out of order; one column in memory at a time
+  ts = np.fromfile(tmp_dir / "ecal_timestamp.bin", dtype=STORE_COLUMNS['ecal_timestamp'], count=rows)
+  order = np.argsort(ts, kind='stable')
+  del ts
+  for name, dtype in STORE_COLUMNS.items():
+    col_path = tmp_dir / f"{name}.bin"
+    values = np.fromfile(col_path, dtype=dtype, count=rows)
+    values[order].tofile(col_path)
+
+
+def _write_index(tmp_dir, rows):
+  ts = np.fromfile(tmp_dir / "ecal_timestamp.bin", dtype=np.int64, count=rows)
+  starts = np.flatnonzero(ts[1:] != ts[:-1]) + 1
+  scan_offsets = np.concatenate(([0], starts, [rows])).astype(np.int64) if rows else np.zeros(1, dtype=np.int64)
+  ts[scan_offsets[:-1]].tofile(tmp_dir / "scan_timestamps.bin")
+  scan_offsets.tofile(tmp_dir / "scan_offsets.bin")
+  n_scans = len(scan_offsets) - 1
+  del ts
+
+  object_id = np.fromfile(tmp_dir / "object_id.bin", dtype=STORE_COLUMNS['object_id'], count=rows)
+  object_rows = np.argsort(object_id, kind='stable').astype(np.int64)
+  sorted_ids = object_id[object_rows]
+  starts = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+  object_offsets = np.concatenate(([0], starts, [rows])).astype(np.int64) if rows else np.zeros(1, dtype=np.int64)
+  sorted_ids[object_offsets[:-1]].astype(np.int64).tofile(tmp_dir / "object_ids.bin")
+  object_offsets.tofile(tmp_dir / "object_offsets.bin")
+  object_rows.tofile(tmp_dir / "object_rows.bin")
+  n_objects = len(object_offsets) - 1
+
+  return {'scans': n_scans, 'objects': n_objects}
+
+
+def ingest_recording(csv_path, store_dir=None, chunksize=CHUNK_ROWS, force=False):
+  """
+  Convert a LiDAR recording CSV into a columnar store and return its directory.
+  The CSV is streamed in chunks and only STORE_COLUMNS are parsed; an existing
+  store is reused while the source file is unchanged.
+  """
+  csv_path = Path(csv_path)
+  store_dir = default_store_dir(csv_path) if store_dir is None else Path(store_dir)
+
+  if not force and is_store_current(csv_path, store_dir):
+    return store_dir
+
+  # Unique per call, so concurrent ingests (other workers) never share a tmp dir
+  store_dir.parent.mkdir(parents=True, exist_ok=True)
+  tmp_dir = Path(tempfile.mkdtemp(dir=store_dir.parent, prefix=f"{store_dir.name}.", suffix=".tmp"))
+  try:
+    _write_store(csv_path, tmp_dir, chunksize)
+  except BaseException:
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    raise
+
+  # Move the old store aside before swapping in the new one, then drop it;
+  # open memory maps keep reading the old files until they are closed
+  old_dir = None
+  if store_dir.exists():
+    old_dir = Path(tempfile.mkdtemp(dir=store_dir.parent, prefix=f"{store_dir.name}.", suffix=".old"))
+    try:
+      os.replace(store_dir, old_dir / "store")
+    except FileNotFoundError:
+      pass
+  try:
+    os.replace(tmp_dir, store_dir)
+  except OSError:
+    # Another worker swapped in its copy first
+    if not is_store_current(csv_path, store_dir):
+      raise
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+  if old_dir is not None:
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+  return store_dir
+
+
+def _write_store(csv_path, tmp_dir, chunksize):
+  rows = 0
+  is_sorted = True
+  last_ts = None
+  handles = {name: open(tmp_dir / f"{name}.bin", "wb") for name in STORE_COLUMNS}
+  source = _HashingReader(open(csv_path, "rb"))
+  try:
+    reader = pd.read_csv(source, usecols=list(STORE_COLUMNS), dtype=STORE_COLUMNS, chunksize=chunksize)
+    for chunk in reader:
+      ts = chunk['ecal_timestamp'].to_numpy()
+      if len(ts):
+        if is_sorted and ((last_ts is not None and ts[0] < last_ts) or np.any(ts[1:] < ts[:-1])):
+          is_sorted = False
+        last_ts = ts[-1]
+
+      for name, dtype in STORE_COLUMNS.items():
+        np.ascontiguousarray(chunk[name].to_numpy(dtype=dtype)).tofile(handles[name])
+      rows += len(chunk)
+  finally:
+    source.close()
+    for fh in handles.values():
+      fh.close()
+
+  if not is_sorted:
+    _sort_columns_by_time(tmp_dir, rows)
+
+  index = _write_index(tmp_dir, rows)
+
+  meta = {
+    'version': STORE_VERSION,
+    'rows': rows,
+    'columns': STORE_COLUMNS,
+    'index': index,
+    'source': _source_signature(csv_path),
+    'sha1': source.digest.hexdigest(),
+  }
+  with open(tmp_dir / "meta.json", "w") as f:
+    json.dump(meta, f, indent=2)
+
+
+class LidarStore:
+  """Read-only, memory-mapped view over a store written by ingest_recording."""
+
+  def __init__(self, store_dir):
+    self.path = Path(store_dir)
+    self.meta = _read_meta(self.path)
+    if self.meta is None or self.meta.get('version') != STORE_VERSION:
+      raise ValueError(f"'{self.path}' is not a LiDAR store (run ingest_recording first)")
+    self._arrays = {}
+
+  def __len__(self):
+    return self.meta['rows']
+
+  @property
+  def columns(self):
+    return list(self.meta['columns'])
+
+  @property
+  def fingerprint(self):
+    # Content hash of the source recording, computed while ingesting
+    return self.meta['sha1']
+
+  @property
+  def n_scans(self):
+    return self.meta['index']['scans']
+
+  @property
+  def origin(self):
+    # UTC midnight of the first sample, the zero of fixed-width frame ids
+    ts = self.scan_timestamps
+    return day_origin(ts[0]) if len(ts) else 0
+
+  @property
+  def scan_timestamps(self):
+    return self._array('scan_timestamps', np.int64, self.n_scans)
+
+  def _array(self, name, dtype, length):
+    if name not in self._arrays:
+      dtype = np.dtype(dtype)
+      if length == 0:
+        self._arrays[name] = np.empty(0, dtype=dtype)
+      else:
+        self._arrays[name] = np.memmap(self.path / f"{name}.bin", dtype=dtype, mode='r', shape=(length,))
+    return self._arrays[name]
+
+  def column(self, name):
+    return self._array(name, self.meta['columns'][name], len(self))
+
+  # -------------------------------
+  # Window lookups (binary search on the index, no column scans)
+  # -------------------------------
+  def scan_rows(self, first_scan, stop_scan):
+    offsets = self._array('scan_offsets', np.int64, self.n_scans + 1)
+    first_scan = min(max(int(first_scan), 0), self.n_scans)
+    stop_scan = min(max(int(stop_scan), first_scan), self.n_scans)
+    return int(offsets[first_scan]), int(offsets[stop_scan])
+
+  def time_rows(self, start_us, stop_us):
+    # Rows with start_us <= ecal_timestamp < stop_us
+    ts = self.scan_timestamps
+    first_scan = np.searchsorted(ts, start_us, side='left') if start_us is not None else 0
+    stop_scan = np.searchsorted(ts, stop_us, side='left') if stop_us is not None else self.n_scans
+    return self.scan_rows(first_scan, stop_scan)
+
+  def first_frame(self, frame_width):
+    width = parse_frame_width(frame_width)
+    if width == FRAME_SCAN or self.n_scans == 0:
+      return 0
+    return (int(self.scan_timestamps[0]) - self.origin) // width
+
+  def frame_rows(self, first_frame, n_frames, frame_width):
+    # first_frame=None starts at the beginning of the recording
+    width = parse_frame_width(frame_width)
+    if first_frame is None:
+      first_frame = self.first_frame(width)
+    if width == FRAME_SCAN:
+      return self.scan_rows(first_frame, first_frame + n_frames)
+    start_us = self.origin + first_frame * width
+    return self.time_rows(start_us, start_us + n_frames * width)
+
+  def object_rows(self, object_id, start=0, stop=None):
+    # Row numbers of one object (time ordered), optionally limited to [start, stop)
+    n_objects = self.meta['index']['objects']
+    ids = self._array('object_ids', np.int64, n_objects)
+    i = np.searchsorted(ids, object_id)
+    if i == n_objects or ids[i] != object_id:
+      return np.empty(0, dtype=np.int64)
+    offsets = self._array('object_offsets', np.int64, n_objects + 1)
+    rows = self._array('object_rows', np.int64, len(self))[offsets[i]:offsets[i + 1]]
+    stop = len(self) if stop is None else stop
+    return np.array(rows[np.searchsorted(rows, start):np.searchsorted(rows, stop)])
+
+  def to_frame(self, start=0, stop=None, columns=None, rows=None):
+    # Copies only the requested rows (a slice, or explicit row numbers) out of the memory maps
+    columns = self.columns if columns is None else columns
+    if rows is not None:
+      return pd.DataFrame({name: self.column(name)[rows] for name in columns})
+    return pd.DataFrame({name: np.array(self.column(name)[start:stop]) for name in columns})
+
+
+def open_store(csv_path, store_dir=None):
+  """
+  Return this process's store for a recording. While the CSV's signature matches
+  the one recorded in meta.json the same LidarStore (and its memory maps) is
+  reused, so a call costs one stat; otherwise the recording is re-ingested.
+  """
+  csv_path = Path(csv_path)
+  store_dir = default_store_dir(csv_path) if store_dir is None else Path(store_dir)
+  key = (str(csv_path), str(store_dir))
+  signature = _source_signature(csv_path)
+
+  store = _stores.get(key)
+  if store is not None and store.meta['source'] == signature:
+    return store
+  with _ingest_lock:
+    store = _stores.get(key)
+    if store is None or store.meta['source'] != signature:
+      store = _stores[key] = LidarStore(ingest_recording(csv_path, store_dir))
+  return store
@@ -5,59 +5,80 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import numpy as np
+from grouping import group_by_object
+from frames import FRAME_1S, bucket_rows
 
-def create_line_charts(df):
+def create_line_charts(df, page=None, page_size=10, frame_width=FRAME_1S):
+  """
+  page=None: one pair of traces per object and a dropdown over all of them.
+  page=k: only the objects of the k-th page of page_size objects are built,
+  so the figure (and its dropdown masks) stays bounded; paged from the server.
+  Raw rows (ecal_timestamp) are bucketed into frame_width frames first.
+  """
+  df = bucket_rows(df, frame_width)
   fig = make_subplots(
     rows=2, cols=1,
     subplot_titles=("Confidence", "Number of Points"),
     vertical_spacing=0.15
   )
 
-  objects_ids = sorted(df["object_id"].unique())
+  hover_cols = ["object_id", "nb_point", "algo_center_x", "confidence"]
+  ids, offsets, cols = group_by_object(df, ["timestamp"] + hover_cols)
+  if page is not None:
+    first = page * page_size
+    ids, offsets = ids[first:first + page_size], offsets[first:first + page_size + 1]
+    if len(ids) == 0:
+      raise ValueError(f"No objects on page {page}")
+  objects_ids = ids.tolist()
+  customdata_all = np.column_stack([cols[c] for c in hover_cols])
 
-  for obj in objects_ids:
-    sub = df[df["object_id"] == obj]
+  # Object shown first: 2 (as before), or the first one of the page when paging
+  selected = 2
+  if page is not None and selected not in objects_ids:
+    selected = objects_ids[0]
+
+  for i, obj in enumerate(objects_ids):
+    rows = slice(offsets[i], offsets[i + 1])
+    customdata = customdata_all[rows]
 
     fig.add_trace(go.Scatter(
-      x=sub["timestamp"],
-      y=sub["confidence"],
+      x=cols["timestamp"][rows],
+      y=cols["confidence"][rows],
       name=f"Object {obj}",
       mode="lines+markers",
       marker=dict(color='blue', size=6),
-      customdata=sub[["object_id", "nb_point", "algo_center_x", "confidence"]],
+      customdata=customdata,
       hovertemplate=(
         "Frame: %{x}<br>"
         "Nb points: %{customdata[1]}<br>"
         "Confidence: %{y}<br>"
         "Distance (m): %{customdata[2]:.2f}<extra></extra>"
       ),
-      visible=(obj == 2)
+      visible=(obj == selected)
     ), row=1, col=1)
 
     fig.add_trace(go.Scatter(
-      x=sub["timestamp"],
-      y=sub["nb_point"],
+      x=cols["timestamp"][rows],
+      y=cols["nb_point"][rows],
       name=f"Object {obj}",
       mode="lines+markers",
       marker=dict(color='red', size=6),
-      customdata=sub[["object_id", "nb_point", "algo_center_x", "confidence"]],
+      customdata=customdata,
       hovertemplate=(
         "Frame: %{x}<br>"
         "Nb points: %{y}<br>"
         "Confidence: %{customdata[3]:.2f}<br>"
         "Distance (m): %{customdata[2]:.2f}<extra></extra>"
       ),
-      visible=(obj == 2)
+      visible=(obj == selected)
     ), row=2, col=1)
 
+  # Two traces per object, in object order
+  trace_object = np.arange(len(fig.data)) // 2
   buttons = []
-  for obj in objects_ids:
-    visibility = []
-    for trace in fig.data:
-      if trace.name == f"Object {obj}":
-        visibility.append(True)
-      else:
-        visibility.append(False)
+  for i, obj in enumerate(objects_ids):
+    visibility = (trace_object == i).tolist()
 
     buttons.append(dict(
       label=f"Object {obj}",
@@ -68,11 +89,11 @@ def create_line_charts(df):
 
   fig.update_layout(
     updatemenus=[dict(
-      active=objects_ids.index(2) if 2 in objects_ids else 0,
+      active=objects_ids.index(selected) if selected in objects_ids else 0,
       buttons=buttons,
       x=1.1, y=1.15
     )],
-    title=f"Object 2 - Confidence and Points" if 2 in objects_ids else "Confidence and Points",
+    title=f"Object {selected} - Confidence and Points" if selected in objects_ids else "Confidence and Points",
     height=800
   )
 
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------
+# Rolling mean / std per timestamp
+# -------------------------------
+# Every requested metric is first averaged per timestamp (one groupby for all of
+# them), then a rolling mean and sample std (ddof=1) over the last `window`
+# timestamps is kept, with the same conventions as
+# Series.rolling(window, min_periods=1): NaN samples are skipped and the std of
+# fewer than two samples is reported as 0.
+#
+# History is stored in NumPy arrays that grow by doubling. extend() appends a
+# batch of frames with one vectorized rolling pass seeded by the previous tail,
+# push() appends a single timestamp in O(1) with sliding-window Welford updates,
+# so live playback never recomputes what was already seen.
+
+
+class RollingStats:
+
+  def __init__(self, metrics, window=3):
+    if window < 1:
+      raise ValueError(f"window must be >= 1, got {window}")
+    self.metrics = list(metrics)
+    self.window = window
+    self._index = {metric: i for i, metric in enumerate(self.metrics)}
+    self._n = 0
+    self._timestamps = None
+    self._values = self._mean = self._std = np.empty((0, len(self.metrics)))
+    # Welford state over the current window, one entry per metric
+    self._count = np.zeros(len(self.metrics), dtype=np.int64)
+    self._wmean = np.zeros(len(self.metrics))
+    self._m2 = np.zeros(len(self.metrics))
+
+  def __len__(self):
+    return self._n
+
+  # ---- storage ----
+  def _reserve(self, timestamps, extra):
+    needed = self._n + extra
+    if self._timestamps is None:
+      self._timestamps = np.empty(0, dtype=np.asarray(timestamps).dtype)
+    if needed <= len(self._timestamps):
+      return
+    capacity = max(needed, 2 * len(self._timestamps), 16)
+
+    def grow(arr):
+      out = np.empty((capacity,) + arr.shape[1:], dtype=arr.dtype)
+      out[:self._n] = arr[:self._n]
+      return out
+
+    self._timestamps = grow(self._timestamps)
+    self._values, self._mean, self._std = grow(self._values), grow(self._mean), grow(self._std)
+
+  def _check_order(self, first_timestamp):
+    if self._n and not first_timestamp > self._timestamps[self._n - 1]:
+      raise ValueError(
+        f"Timestamps must be appended in increasing order "
+        f"(got {first_timestamp} after {self._timestamps[self._n - 1]})"
+      )
+
+  # ---- Welford sliding window ----
+  def _add(self, x):
+    valid = ~np.isnan(x)
+    self._count += valid
+    delta = np.where(valid, x - self._wmean, 0.0)
+    self._wmean += np.where(valid, delta / np.maximum(self._count, 1), 0.0)
+    self._m2 += np.where(valid, delta * (x - self._wmean), 0.0)
+
+  def _remove(self, x):
+    valid = ~np.isnan(x)
+    self._count -= valid
+    delta = np.where(valid, x - self._wmean, 0.0)
+    self._wmean -= np.where(valid, delta / np.maximum(self._count, 1), 0.0)
+    self._m2 -= np.where(valid, delta * (x - self._wmean), 0.0)
+    empty = self._count == 0
+    self._wmean[empty] = 0.0
+    self._m2[empty] = 0.0
+
+  def _window_stats(self):
+    mean = np.where(self._count > 0, self._wmean, np.nan)
+    var = np.where(self._count > 1, np.maximum(self._m2, 0.0) / np.maximum(self._count - 1, 1), 0.0)
+    return mean, np.sqrt(var)
+
+  def _reset_state(self):
+    # Rebuild the Welford state from the last `window` stored samples
+    self._count[:] = 0
+    self._wmean[:] = 0.0
+    self._m2[:] = 0.0
+    for x in self._values[max(self._n - self.window, 0):self._n]:
+      self._add(x)
+
+  # ---- appending ----
+  def push(self, timestamp, values):
+    """Append one timestamp (values in the order of self.metrics) in O(1)."""
+    x = np.asarray(values, dtype=np.float64)
+    self._check_order(timestamp)
+    self._reserve([timestamp], 1)
+    if self._n >= self.window:
+      self._remove(self._values[self._n - self.window])
+    self._add(x)
+    mean, std = self._window_stats()
+    i = self._n
+    self._timestamps[i] = timestamp
+    self._values[i], self._mean[i], self._std[i] = x, mean, std
+    self._n += 1
+
+  def extend(self, df, timestamp="timestamp"):
+    """
+    Append the rows of df (all metrics averaged per timestamp in one groupby).
+    Its timestamps must all come after the last one already stored.
+    """
+    per_timestamp = (df[self.metrics]
+                     .apply(pd.to_numeric, errors="coerce")
+                     .groupby(df[timestamp])
+                     .mean()
+                     .sort_index())
+    if per_timestamp.empty:
+      return
+    self._check_order(per_timestamp.index[0])
+
+    # Seed the rolling pass with the previous tail so windows span both batches
+    tail = self._values[max(self._n - self.window + 1, 0):self._n]
+    values = per_timestamp.to_numpy(dtype=np.float64)
+    rolling = pd.DataFrame(np.vstack([tail, values])).rolling(window=self.window, min_periods=1)
+    mean = rolling.mean().to_numpy()[len(tail):]
+    std = rolling.std(ddof=1).fillna(0.0).to_numpy()[len(tail):]
+
+    new = len(values)
+    self._reserve(per_timestamp.index.to_numpy(), new)
+    rows = slice(self._n, self._n + new)
+    self._timestamps[rows] = per_timestamp.index.to_numpy()
+    self._values[rows], self._mean[rows], self._std[rows] = values, mean, std
+    self._n += new
+    self._reset_state()
+
+  # ---- results (views, no copies) ----
+  @property
+  def timestamps(self):
+    return self._timestamps[:self._n] if self._timestamps is not None else np.empty(0)
+
+  def values(self, metric):
+    return self._values[:self._n, self._index[metric]]
+
+  def mean(self, metric):
+    return self._mean[:self._n, self._index[metric]]
+
+  def std(self, metric):
+    return self._std[:self._n, self._index[metric]]
+
+  def band(self, metric, k=1.0):
+    # (lower, upper) = mean -/+ k std
+    mean, std = self.mean(metric), self.std(metric)
+    return mean - k * std, mean + k * std
+
+
+def rolling_stats(df, metrics, window=3, timestamp="timestamp"):
+  stats = RollingStats(metrics, window=window)
+  stats.extend(df, timestamp=timestamp)
+  return stats
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from box_stats import box_points, grouped_box_stats
+
+
+# Every statistic is checked against numpy applied to each group on its own.
+
+def reference(group, whisker=1.5):
+  group = np.asarray(group, dtype=np.float64)
+  group = group[np.isfinite(group)]
+  if not len(group):
+    return dict.fromkeys(("q1", "median", "q3", "lowerfence", "upperfence", "mean"), np.nan), group
+  q1, median, q3 = np.quantile(group, [0.25, 0.5, 0.75])
+  low, high = q1 - whisker * (q3 - q1), q3 + whisker * (q3 - q1)
+  inside = group[(group >= low) & (group <= high)]
+  stats = {
+    'q1': q1,
+    'median': median,
+    'q3': q3,
+    'lowerfence': inside.min(),
+    'upperfence': inside.max(),
+    'mean': group.mean(),
+  }
+  return stats, np.sort(group[(group < low) | (group > high)])
+
+
+def check(groups):
+  values = np.concatenate([np.asarray(group, dtype=np.float64) for group in groups]) if groups else np.empty(0)
+  offsets = np.concatenate(([0], np.cumsum([len(group) for group in groups]))).astype(np.int64)
+  stats, sorted_values, sorted_offsets, is_outlier = grouped_box_stats(values, offsets)
+
+  assert np.isfinite(sorted_values).all()
+  outliers = box_points(sorted_values, sorted_offsets, is_outlier, "outliers")
+  for i, group in enumerate(groups):
+    expected, expected_outliers = reference(group)
+    for key, value in expected.items():
+      np.testing.assert_allclose(stats[key][i], value, err_msg=f"{key} of group {i}")
+    np.testing.assert_allclose(outliers[i], expected_outliers)
+
+
+def test_matches_numpy_per_group():
+  rng = np.random.default_rng(0)
+  check([rng.normal(size=n) * 10 for n in (1, 2, 5, 40, 333)] + [[3.0, 3.0, 3.0, 100.0]])
+
+
+def test_non_finite_values_are_dropped():
+  check([
+    [1.0, np.nan, 2.0, 3.0, 4.0],
+    [np.nan, 10.0, np.inf, 11.0, -np.inf, 12.0, 50.0],
+    [5.0, 6.0, np.nan],
+  ])
+
+
+def test_matches_pandas_groupby():
+  # Same statistics as pandas' groupby quantile / mean, which skip NaN
+  rng = np.random.default_rng(1)
+  ids = np.sort(rng.integers(0, 12, 500))
+  values = rng.exponential(5.0, len(ids))
+  values[rng.random(len(ids)) < 0.1] = np.nan
+  df = pd.DataFrame({'object_id': ids, 'value': values})
+  offsets = np.concatenate(([0], np.cumsum(df.groupby('object_id').size().to_numpy())))
+
+  stats, _, _, _ = grouped_box_stats(df['value'].to_numpy(), offsets)
+  grouped = df.groupby('object_id')['value']
+  quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+  np.testing.assert_allclose(stats['q1'], quartiles[0.25], equal_nan=True)
+  np.testing.assert_allclose(stats['median'], quartiles[0.5], equal_nan=True)
+  np.testing.assert_allclose(stats['q3'], quartiles[0.75], equal_nan=True)
+  np.testing.assert_allclose(stats['mean'], grouped.mean(), equal_nan=True)
+
+
+@pytest.mark.parametrize("groups", [
+  [[], [1.0, 2.0], []],
+  [[np.nan, np.nan], [4.0, 1.0, 2.0]],
+  [[1.0, 2.0, 3.0], [np.nan]],
+  [[np.nan]],
+  [],
+])
+def test_empty_groups_get_nan(groups):
+  check(groups)
+
+
+def test_sample_points_skip_non_finite_values():
+  values = np.array([np.nan, 1.0, 2.0, np.inf, 3.0, 4.0, np.nan, 5.0])
+  offsets = np.array([0, 4, 8])
+  _, sorted_values, sorted_offsets, is_outlier = grouped_box_stats(values, offsets)
+
+  points = box_points(sorted_values, sorted_offsets, is_outlier, "sample", sample_size=10)
+  assert [sorted(group) for group in points] == [[1.0, 2.0], [3.0, 4.0, 5.0]]
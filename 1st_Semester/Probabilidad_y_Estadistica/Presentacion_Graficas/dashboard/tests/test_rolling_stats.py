@@ -0,0 +1,97 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from rolling_stats import RollingStats, rolling_stats
+
+
+# Reference: the per-timestamp mean followed by pandas' rolling mean / std with
+# min_periods=1, the std of fewer than two samples reported as 0.
+
+METRICS = ["nb_point", "confidence"]
+
+
+def reference(df, window):
+  per_timestamp = df.groupby("timestamp")[METRICS].mean().sort_index()
+  rolling = per_timestamp.rolling(window=window, min_periods=1)
+  return per_timestamp, rolling.mean(), rolling.std(ddof=1).fillna(0.0)
+
+
+def assert_matches(stats, df, window):
+  per_timestamp, mean, std = reference(df, window)
+  np.testing.assert_array_equal(stats.timestamps, per_timestamp.index.to_numpy())
+  for metric in METRICS:
+    np.testing.assert_allclose(stats.values(metric), per_timestamp[metric], equal_nan=True)
+    np.testing.assert_allclose(stats.mean(metric), mean[metric], rtol=1e-9, atol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(stats.std(metric), std[metric], rtol=1e-7, atol=1e-9)
+
+
+@pytest.fixture
+def samples():
+  # Several rows per timestamp, out of order, with NaN samples and one timestamp
+  # where a metric is missing altogether
+  rng = np.random.default_rng(0)
+  timestamps = np.repeat(np.arange(40) * 100_000, 3)
+  df = pd.DataFrame({
+    'timestamp': timestamps,
+    'nb_point': rng.integers(0, 500, len(timestamps)).astype(float),
+    'confidence': rng.random(len(timestamps)),
+  }).sample(frac=1, random_state=1)
+  df.loc[df.index[::7], 'confidence'] = np.nan
+  df.loc[df['timestamp'] == 1_200_000, 'nb_point'] = np.nan
+  return df
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 10, 100])
+def test_extend_matches_pandas(samples, window):
+  assert_matches(rolling_stats(samples, METRICS, window=window), samples, window)
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_batches_and_push_match_one_pass(samples, window):
+  per_timestamp = samples.groupby("timestamp")[METRICS].mean().sort_index()
+  timestamps = per_timestamp.index.to_numpy()
+
+  batched = RollingStats(METRICS, window=window)
+  for first, last in [(0, 5), (5, 6), (6, 25)]:
+    batched.extend(samples[samples['timestamp'].between(timestamps[first], timestamps[last - 1])])
+  for ts, row in per_timestamp.iloc[25:].iterrows():
+    batched.push(ts, row.to_numpy())
+
+  assert_matches(batched, samples, window)
+
+
+def test_window_without_samples():
+  # All-NaN windows: mean NaN and std 0, as rolling(min_periods=1) + fillna(0)
+  df = pd.DataFrame({
+    'timestamp': [1, 2, 3, 4, 5],
+    'nb_point': [1.0, np.nan, np.nan, np.nan, 4.0],
+    'confidence': [np.nan] * 5,
+  })
+  for window in (1, 2, 3):
+    assert_matches(rolling_stats(df, METRICS, window=window), df, window)
+
+  pushed = RollingStats(METRICS, window=2)
+  for _, row in df.iterrows():
+    pushed.push(row['timestamp'], row[METRICS].to_numpy(dtype=float))
+  assert_matches(pushed, df, 2)
+
+
+def test_empty_frame():
+  stats = rolling_stats(pd.DataFrame({'timestamp': [], 'nb_point': [], 'confidence': []}), METRICS)
+  assert len(stats) == 0
+  assert len(stats.timestamps) == 0
+  assert len(stats.mean("nb_point")) == 0
+
+
+def test_timestamps_must_increase():
+  stats = RollingStats(METRICS)
+  stats.push(10, [1.0, 0.5])
+  with pytest.raises(ValueError):
+    stats.push(10, [2.0, 0.5])
+  with pytest.raises(ValueError):
+    stats.extend(pd.DataFrame({'timestamp': [5, 20], 'nb_point': [1.0, 2.0], 'confidence': [0.1, 0.2]}))
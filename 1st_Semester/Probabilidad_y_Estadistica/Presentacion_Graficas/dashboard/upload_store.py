@@ -0,0 +1,259 @@
+import base64
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+try:
+  import pyarrow
+except ImportError:
+  pyarrow = None
+
+# -------------------------------
+# Server-side store for uploaded CSVs
+# -------------------------------
+# dcc.Upload hands the file over as a base64 data URL. It is decoded in slices
+# into a spooled temporary file (memory first, disk once it grows) and parsed
+# from those bytes in one read_csv call, so no full decoded str copy is ever
+# built and every column gets a single dtype for the whole file. The parsed
+# frame stays on the server under the SHA-1 of the file; the browser session
+# only keeps that key (dcc.Store) and every later callback (table pages,
+# re-plot, window/metric changes) reads the cached frame. Uploading the same
+# file again reuses it without parsing. Frames are also written to
+# .upload_cache/ when stored, so a callback served by another worker process
+# loads the upload from there.
+
+DECODE_SLICE = 4 * 1024 * 1024        # base64 chars per slice (multiple of 4)
+SPOOL_BYTES = 32 * 1024 * 1024        # decoded bytes kept in memory before spilling
+
+UPLOAD_CACHE_DIR = str(Path(__file__).resolve().parent / ".upload_cache")
+MEMORY_BUDGET = 512 * 1024 * 1024     # bytes of parsed frames kept in memory
+UPLOAD_MISSING = "The uploaded file is no longer available, please upload it again"
+
+
+class DatasetStore:
+  """
+  In-process LRU of DataFrames bounded by memory size, written through to disk
+  (Parquet when pyarrow is available, pickle otherwise). Frames evicted from
+  memory, or stored by another process, are loaded back from disk on access.
+  """
+
+  def __init__(self, spill_dir, max_bytes=MEMORY_BUDGET):
+    self.spill_dir = Path(spill_dir)
+    self.spill_dir.mkdir(parents=True, exist_ok=True)
+    self.max_bytes = max_bytes
+    self._memory = OrderedDict()
+    self._sizes = {}
+    self._lock = threading.Lock()
+
+  def _spill_paths(self, key):
+    return self.spill_dir / f"{key}.parquet", self.spill_dir / f"{key}.pkl"
+
+  def _write_atomic(self, path, write):
+    # Write then rename; the temp file is unique per call because threads of one
+    # worker can store the same upload at once
+    with tempfile.NamedTemporaryFile(dir=self.spill_dir, prefix=f"{path.name}.", suffix=".tmp",
+                                     delete=False) as f:
+      tmp_path = f.name
+      try:
+        write(f)
+      except BaseException:
+        f.close()
+        os.remove(tmp_path)
+        raise
+    try:
+      os.replace(tmp_path, path)
+    except OSError:
+      # Lost the race to an equivalent copy of the same upload
+      if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+  def _spill(self, key, df):
+    parquet_path, pickle_path = self._spill_paths(key)
+    if parquet_path.exists() or pickle_path.exists():
+      return
+    if pyarrow is not None:
+      try:
+        self._write_atomic(parquet_path, lambda f: df.to_parquet(f, index=False))
+        return
+      except (ValueError, TypeError, pyarrow.ArrowException):
+        # Mixed-type object columns cannot always be written as Parquet
+        pass
+    self._write_atomic(pickle_path, lambda f: pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL))
+
+  def _load_spilled(self, key):
+    parquet_path, pickle_path = self._spill_paths(key)
+    if parquet_path.exists() and pyarrow is not None:
+      return pd.read_parquet(parquet_path)
+    if pickle_path.exists():
+      with open(pickle_path, "rb") as f:
+        return pickle.load(f)
+    return None
+
+  def _remember(self, key, df):
+    with self._lock:
+      self._memory[key] = df
+      self._memory.move_to_end(key)
+      self._sizes[key] = int(df.memory_usage(deep=True).sum())
+      # Evicted frames are already on disk; the most recent one always stays in memory
+      while sum(self._sizes.values()) > self.max_bytes and len(self._memory) > 1:
+        evicted, _ = self._memory.popitem(last=False)
+        self._sizes.pop(evicted)
+
+  def put(self, key, df):
+    # Write-through: the worker serving the next callback may not be this one
+    self._spill(key, df)
+    self._remember(key, df)
+
+  def get(self, key):
+    with self._lock:
+      if key in self._memory:
+        self._memory.move_to_end(key)
+        return self._memory[key]
+    df = self._load_spilled(key)
+    if df is None:
+      raise KeyError(UPLOAD_MISSING)
+    self._remember(key, df)
+    return df
+
+  def __contains__(self, key):
+    with self._lock:
+      if key in self._memory:
+        return True
+    return any(path.exists() for path in self._spill_paths(key))
+
+  def stats(self):
+    with self._lock:
+      return {'in_memory': len(self._memory), 'memory_bytes': sum(self._sizes.values()),
+              'max_bytes': self.max_bytes, 'spilled': len(list(self.spill_dir.glob("*.p*")))}
+
+
+datasets = DatasetStore(UPLOAD_CACHE_DIR)
+
+
+def decode_upload(contents):
+  # Returns (binary file positioned at the start of the decoded upload, SHA-1 of its bytes)
+  _, content_string = contents.split(",", 1)
+  decoded = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+  sha1 = hashlib.sha1()
+  for start in range(0, len(content_string), DECODE_SLICE):
+    data = base64.b64decode(content_string[start:start + DECODE_SLICE])
+    sha1.update(data)
+    decoded.write(data)
+  decoded.seek(0)
+  return decoded, sha1.hexdigest()
+
+
+def parse_upload(decoded):
+  # low_memory=False: dtypes are inferred over the whole column, not per internal block
+  try:
+    return pd.read_csv(decoded, encoding="utf-8", low_memory=False)
+  except pd.errors.EmptyDataError:
+    return pd.DataFrame()
+
+
+def store_upload(contents):
+  # Parses the upload (unless the same file is already stored) and returns its key
+  decoded, key = decode_upload(contents)
+  with decoded:
+    if key not in datasets:
+      datasets.put(key, parse_upload(decoded))
+  return key
+
+
+def get_upload(key):
+  return datasets.get(key)
+
+
+# -------------------------------
+# DataTable queries (page_action/sort_action/filter_action = "custom")
+# -------------------------------
+FILTER_OPERATORS = [
+  ["ge ", ">="],
+  ["le ", "<="],
+  ["lt ", "<"],
+  ["gt ", ">"],
+  ["ne ", "!="],
+  ["eq ", "="],
+  ["contains "],
+  ["datestartswith "],
+]
+
+
+def split_filter_part(filter_part):
+  # "{col} op value" -> (col, op, value), as in the Dash DataTable docs
+  for operator_type in FILTER_OPERATORS:
+    for operator in operator_type:
+      if operator in filter_part:
+        name_part, value_part = filter_part.split(operator, 1)
+        name = name_part[name_part.find("{") + 1: name_part.rfind("}")]
+
+        value_part = value_part.strip()
+        v0 = value_part[0] if value_part else ""
+        if v0 == value_part[-1:] and v0 in ("'", '"', "`"):
+          value = value_part[1:-1].replace("\\" + v0, v0)
+        else:
+          try:
+            value = float(value_part)
+          except ValueError:
+            value = value_part
+
+        return name, operator_type[0].strip(), value
+
+  return None, None, None
+
+
+def filter_text(value):
+  # The value as typed: split_filter_part reads "2021" as 2021.0
+  return str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+
+
+def compare(col, operator, value):
+  # Numeric column or value: compared as numbers, and what is not a number only matches "ne".
+  # Otherwise (dates included, as ISO text) both sides are compared as text, like "contains"
+  numeric = pd.api.types.is_numeric_dtype(col) or isinstance(value, float)
+  if numeric and not pd.api.types.is_datetime64_any_dtype(col):
+    return getattr(pd.to_numeric(col, errors="coerce"), operator)(pd.to_numeric(value, errors="coerce"))
+  return getattr(col.astype(str), operator)(filter_text(value)) & col.notna()
+
+
+def filter_mask(df, filter_query):
+  mask = pd.Series(True, index=df.index)
+  for filter_part in (filter_query or "").split(" && "):
+    col_name, operator, value = split_filter_part(filter_part)
+    if col_name not in df.columns:
+      continue
+    col = df[col_name]
+    if operator in ("eq", "ne", "lt", "le", "gt", "ge"):
+      mask &= compare(col, operator, value)
+    elif operator == "contains":
+      mask &= col.astype(str).str.contains(filter_text(value), regex=False)
+    elif operator == "datestartswith":
+      mask &= col.astype(str).str.startswith(filter_text(value))
+  return mask
+
+
+def query_page(key, page_current, page_size, sort_by=None, filter_query=None):
+  """
+  One page of the stored upload after filtering and sorting.
+  Returns (records, page_count); only these rows are sent to the browser.
+  """
+  df = get_upload(key)
+  if filter_query:
+    df = df[filter_mask(df, filter_query)]
+
+  if sort_by:
+    df = df.sort_values(
+      [col["column_id"] for col in sort_by],
+      ascending=[col["direction"] == "asc" for col in sort_by],
+      kind="stable"
+    )
+
+  page_count = max(-(-len(df) // page_size), 1)
+  start = page_current * page_size
+  return df.iloc[start:start + page_size].to_dict("records"), page_count
@@ -0,0 +1,139 @@
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# -------------------------------
+# Load test for the dashboards
+# -------------------------------
+# Simulates N concurrent users opening pages of a running dashboard. One page
+# view is what the browser does on navigation:
+#   GET <path>, GET /_dash-layout, POST the router callback (page-content)
+# and its latency is the wall time of the three requests. The router callback
+# is read from /_dash-dependencies, so the script works with both apps.
+#
+#   python serve.py lidar --workers 4 &
+#   python load_test.py http://127.0.0.1:8050 --users 16 --views 20 \
+#     --path /bar-charts --path "/line-charts?frame=120"
+
+ROUTER_OUTPUT = "page-content.children"
+
+
+def _request(url, payload=None, timeout=60):
+  data = None
+  headers = {}
+  if payload is not None:
+    data = json.dumps(payload).encode("utf-8")
+    headers['Content-Type'] = "application/json"
+  with urllib.request.urlopen(urllib.request.Request(url, data=data, headers=headers), timeout=timeout) as response:
+    return response.read()
+
+
+def router_callback(base_url, output=ROUTER_OUTPUT):
+  for dependency in json.loads(_request(f"{base_url}/_dash-dependencies")):
+    if dependency['output'] == output:
+      return dependency
+  raise SystemExit(f"No callback with output '{output}' in {base_url}")
+
+
+def router_payload(dependency, path):
+  # Location properties come from the page URL; other inputs are sent empty
+  pathname, _, search = path.partition("?")
+  location = {'pathname': pathname, 'search': f"?{search}" if search else "", 'hash': "", 'href': path}
+  inputs = [dict(item, value=location.get(item['property'])) for item in dependency['inputs']]
+  component_id, prop = dependency['output'].rsplit(".", 1)
+  return {
+    'output': dependency['output'],
+    'outputs': {'id': component_id, 'property': prop},
+    'inputs': inputs,
+    'changedPropIds': [f"{item['id']}.{item['property']}" for item in dependency['inputs']],
+    'state': [dict(item, value=None) for item in dependency.get('state', [])],
+  }
+
+
+def page_view(base_url, path, payload):
+  start = time.perf_counter()
+  _request(f"{base_url}{path}")
+  _request(f"{base_url}/_dash-layout")
+  _request(f"{base_url}/_dash-update-component", payload)
+  return time.perf_counter() - start
+
+
+def percentile(values, q):
+  ordered = sorted(values)
+  if not ordered:
+    return float("nan")
+  rank = (len(ordered) - 1) * q / 100
+  low = int(rank)
+  high = min(low + 1, len(ordered) - 1)
+  return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def run(base_url, paths, users, views, warmup=1):
+  dependency = router_callback(base_url)
+  payloads = {path: router_payload(dependency, path) for path in paths}
+
+  # Warm-up views are not measured (first figure builds, connection setup)
+  for path in paths:
+    for _ in range(warmup):
+      page_view(base_url, path, payloads[path])
+
+  latencies = {path: [] for path in paths}
+  errors = {path: 0 for path in paths}
+  lock = threading.Lock()
+
+  def user(index):
+    for view in range(views):
+      path = paths[(index + view) % len(paths)]
+      try:
+        elapsed = page_view(base_url, path, payloads[path])
+      except (urllib.error.URLError, OSError):
+        with lock:
+          errors[path] += 1
+        continue
+      with lock:
+        latencies[path].append(elapsed)
+
+  start = time.perf_counter()
+  with ThreadPoolExecutor(max_workers=users) as pool:
+    list(pool.map(user, range(users)))
+  wall = time.perf_counter() - start
+  return latencies, errors, wall
+
+
+def report(latencies, errors, wall, users):
+  print(f"{'path':<32}{'views':>7}{'errors':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+  every = []
+  for path, values in latencies.items():
+    every.extend(values)
+    print(f"{path:<32}{len(values):>7}{errors[path]:>8}"
+          f"{percentile(values, 50) * 1000:>10.1f}{percentile(values, 90) * 1000:>10.1f}"
+          f"{percentile(values, 99) * 1000:>10.1f}"
+          f"{(statistics.mean(values) * 1000 if values else float('nan')):>10.1f}")
+  print(f"{'all':<32}{len(every):>7}{sum(errors.values()):>8}"
+        f"{percentile(every, 50) * 1000:>10.1f}{percentile(every, 90) * 1000:>10.1f}"
+        f"{percentile(every, 99) * 1000:>10.1f}"
+        f"{(statistics.mean(every) * 1000 if every else float('nan')):>10.1f}")
+  print(f"\n{users} users, {len(every) / wall:.1f} page views/s over {wall:.1f} s")
+
+
+def main():
+  parser = argparse.ArgumentParser(description="p50/p99 page latency of a running dashboard under N users")
+  parser.add_argument("url", help="base URL, e.g. http://127.0.0.1:8050")
+  parser.add_argument("--path", action="append", help="page to open (repeatable), default /")
+  parser.add_argument("--users", type=int, default=8, help="concurrent users")
+  parser.add_argument("--views", type=int, default=20, help="page views per user")
+  parser.add_argument("--warmup", type=int, default=1, help="unmeasured views per path first")
+  args = parser.parse_args()
+
+  base_url = args.url.rstrip("/")
+  latencies, errors, wall = run(base_url, args.path or ["/"], args.users, args.views, args.warmup)
+  report(latencies, errors, wall, args.users)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,108 @@
+import argparse
+import importlib
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+# -------------------------------
+# Production serving for the dashboards
+# -------------------------------
+# `python app.py` runs Flask's single-process development server, which handles
+# one callback at a time. This launcher serves the same app with several worker
+# processes:
+#   - gunicorn (Linux/macOS): the app is imported and its preload() run in the
+#     master before forking, so the datasets and warmed caches are shared
+#     copy-on-write; every worker runs `threads` threads
+#   - waitress (Windows, or when gunicorn is not installed): one process with
+#     workers * threads threads
+# Figures, parsed datasets and uploads are also written to local disk
+# (.figure_cache, .dataset_cache, .upload_cache), so a callback served by any
+# worker finds what another worker built or parsed.
+#
+#   python serve.py Presentacion_Graficas/dashboard --workers 4
+#   python serve.py Presentacion_Covid_Mex_Phil/dashboard --port 8051
+
+ROOT = Path(__file__).resolve().parent
+APPS = {
+  'lidar': ROOT / "Presentacion_Graficas" / "dashboard",
+  'covid': ROOT / "Presentacion_Covid_Mex_Phil" / "dashboard",
+}
+
+
+def load_server(app_dir, module="app"):
+  """Import <app_dir>/<module>.py, run its preload() and return the Flask server."""
+  app_dir = Path(APPS.get(app_dir, app_dir)).resolve()
+  # The dashboards use flat sibling imports and relative asset paths
+  sys.path.insert(0, str(app_dir))
+  os.chdir(app_dir)
+  app_module = importlib.import_module(module)
+  if hasattr(app_module, "preload"):
+    app_module.preload()
+  return app_module.server
+
+
+def default_workers():
+  return min(2 * (os.cpu_count() or 1) + 1, 8)
+
+
+def serve_gunicorn(server, host, port, workers, threads, timeout):
+  from gunicorn.app.base import BaseApplication
+
+  class DashApplication(BaseApplication):
+
+    def __init__(self, wsgi_app, options):
+      self.wsgi_app = wsgi_app
+      self.options = options
+      super().__init__()
+
+    def load_config(self):
+      for key, value in self.options.items():
+        self.cfg.set(key, value)
+
+    def load(self):
+      return self.wsgi_app
+
+  DashApplication(server, {
+    'bind': f"{host}:{port}",
+    'workers': workers,
+    'threads': threads,
+    'worker_class': "gthread",
+    'preload_app': True,
+    'timeout': timeout,
+  }).run()
+
+
+def serve_waitress(server, host, port, workers, threads):
+  from waitress import serve
+  serve(server, host=host, port=port, threads=workers * threads)
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Serve a dashboard with multiple workers")
+  parser.add_argument("app", help="dashboard folder, or 'lidar' / 'covid'")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=8050)
+  parser.add_argument("--workers", type=int, default=default_workers())
+  parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+  parser.add_argument("--timeout", type=int, default=120, help="seconds before a stuck worker is restarted")
+  parser.add_argument("--server", choices=("auto", "gunicorn", "waitress"), default="auto")
+  args = parser.parse_args()
+
+  backend = args.server
+  if backend == "auto":
+    backend = "waitress" if os.name == "nt" or importlib.util.find_spec("gunicorn") is None else "gunicorn"
+  if importlib.util.find_spec(backend) is None:
+    sys.exit(f"{backend} is not installed: pip install {backend}")
+
+  server = load_server(args.app)
+  print(f"Serving {args.app} with {backend} on http://{args.host}:{args.port} "
+        f"({args.workers} workers x {args.threads} threads)")
+  if backend == "gunicorn":
+    serve_gunicorn(server, args.host, args.port, args.workers, args.threads, args.timeout)
+  else:
+    serve_waitress(server, args.host, args.port, args.workers, args.threads)
+
+
+if __name__ == "__main__":
+  main()